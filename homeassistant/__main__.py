@@ -84,6 +84,12 @@ def get_arguments() -> argparse.Namespace:
         action="store_true",
         help="Skips pip install of required packages on startup",
     )
+    parser.add_argument(
+        "--prewarm-platforms",
+        action="store_true",
+        help="Import config flow and device automation platforms in the "
+        "background once started",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging to file."
     )
@@ -305,6 +311,7 @@ def main() -> int:
         log_no_color=args.log_no_color,
         skip_pip=args.skip_pip,
         safe_mode=args.safe_mode,
+        prewarm_platforms=args.prewarm_platforms,
         debug=args.debug,
         open_ui=args.open_ui,
     )
@@ -16,6 +16,7 @@ import yarl
 from homeassistant import config as conf_util, config_entries, core, loader
 from homeassistant.components import http
 from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
     REQUIRED_NEXT_PYTHON_DATE,
     REQUIRED_NEXT_PYTHON_VER,
@@ -25,6 +26,7 @@ from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
     DATA_SETUP,
     DATA_SETUP_STARTED,
+    async_get_setup_timeline,
     async_set_domains_to_be_loaded,
     async_setup_component,
 )
@@ -90,6 +92,7 @@ async def async_setup_hass(
     )
 
     hass.config.skip_pip = runtime_config.skip_pip
+    hass.config.prewarm_platforms = runtime_config.prewarm_platforms
     if runtime_config.skip_pip:
         _LOGGER.warning(
             "Skipping pip installation of required modules. This may cause issues"
@@ -200,6 +203,7 @@ async def async_from_config_dict(
     This method is a coroutine.
     """
     start = monotonic()
+    timeline = async_get_setup_timeline(hass)
 
     hass.config_entries = config_entries.ConfigEntries(hass, config)
     await hass.config_entries.async_initialize()
@@ -236,8 +240,26 @@ async def async_from_config_dict(
 
     await _async_set_up_integrations(hass, config)
 
+    if hass.config.prewarm_platforms and not hass.config.safe_mode:
+
+        async def _async_prewarm_platforms(event: core.Event) -> None:
+            """Import platforms that are otherwise imported on first use."""
+            await loader.async_prewarm_platforms(hass)
+
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STARTED, _async_prewarm_platforms
+        )
+
     stop = monotonic()
+    timeline.async_finish()
     _LOGGER.info("Home Assistant initialized in %.2fs", stop - start)
+    for item in timeline.async_critical_path():
+        _LOGGER.debug(
+            "Startup critical path: %s from %.2fs to %.2fs",
+            item["domain"],
+            item["start"],
+            item["end"],
+        )
 
     if REQUIRED_NEXT_PYTHON_DATE and sys.version_info[:3] < REQUIRED_NEXT_PYTHON_VER:
         msg = (
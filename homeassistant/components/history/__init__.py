@@ -1,9 +1,11 @@
 """Provide pre-made queries on top of the recorder component."""
+import asyncio
 from collections import defaultdict
 from datetime import timedelta
 from itertools import groupby
 import json
 import logging
+import threading
 import time
 from typing import Optional, cast
 
@@ -15,16 +17,24 @@ import voluptuous as vol
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    STATE_ATTRIBUTES_JOIN,
+    STATES_ATTRIBUTES,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.statistics import (
+    STATISTICS_TABLES,
+    statistics_during_period,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
 from homeassistant.core import Context, State, split_entity_id
@@ -32,7 +42,9 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
+    generate_filter,
 )
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -78,13 +90,18 @@ QUERY_STATES = [
     States.domain,
     States.entity_id,
     States.state,
-    States.attributes,
+    STATES_ATTRIBUTES.label("attributes"),
     States.last_changed,
     States.last_updated,
 ]
 
 HISTORY_BAKERY = "history_bakery"
 
+# Number of rows fetched from the cursor at a time when streaming
+STREAM_ROWS_PER_FETCH = 1000
+# Number of encoded entities waiting to be sent before the query pauses
+STREAM_QUEUE_SIZE = 4
+
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
@@ -112,10 +129,91 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def _iter_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Yield the significant states of one entity at a time.
+
+    Rows are fetched from the cursor in batches while iterating, so only
+    the states of the current entity are kept in memory. Entities are
+    yielded in entity_id order, entities without changes in the period
+    but with a state at start_time come last.
+    """
+    start_time_states = {}
+    if include_start_time_state:
+        start_time_states = _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
+        )
+
+    query = _significant_states_query(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    ).with_post_criteria(lambda q: q.yield_per(STREAM_ROWS_PER_FETCH))
+
+    yield from _entity_state_changes(query, start_time_states, minimal_response)
+    yield from start_time_states.items()
+
+
+def _query_states(session):
+    """Return a query for QUERY_STATES with the shared attributes joined."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, STATE_ATTRIBUTES_JOIN
     )
 
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query for significant states sorted by entity and time."""
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
@@ -141,34 +239,15 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
-
-    return _sorted_states_to_json(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -181,7 +260,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -202,13 +283,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -269,7 +350,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -317,9 +398,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -362,28 +441,58 @@ def _sorted_states_to_json(
             result[ent_id] = []
 
     # Get the states at the start time
-    timer_start = time.perf_counter()
+    start_time_states = {}
     if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            hass, session, start_time, entity_ids, run=run, filters=filters
-        ):
-            state.last_changed = start_time
-            state.last_updated = start_time
-            result[state.entity_id].append(state)
+        start_time_states = _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
+        )
+        result.update(start_time_states)
+
+    # Append all changes to it
+    for ent_id, ent_results in _entity_state_changes(
+        states, start_time_states, minimal_response
+    ):
+        result[ent_id] = ent_results
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _get_start_time_states(hass, session, start_time, entity_ids, filters):
+    """Return the state of each entity at start_time as its first data point."""
+    timer_start = time.perf_counter()
+    start_time_states = {}
+    run = recorder.run_information_from_instance(hass, start_time)
+    for state in _get_states_with_session(
+        hass, session, start_time, entity_ids, run=run, filters=filters
+    ):
+        state.last_changed = start_time
+        state.last_updated = start_time
+        start_time_states[state.entity_id] = [state]
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
+        _LOGGER.debug(
+            "getting %d first datapoints took %fs", len(start_time_states), elapsed
+        )
+
+    return start_time_states
 
+
+def _entity_state_changes(states, start_time_states, minimal_response):
+    """Yield the entity_id and the list of states of each entity.
+
+    States must be sorted by entity_id and last_updated. The lists
+    start with the state from start_time_states, which is removed
+    from it once the entity is yielded.
+    """
     # Called in a tight loop so cache the function
     # here
     _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
 
-    # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
         domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
+        ent_results = start_time_states.pop(ent_id, [])
         if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
             ent_results.extend(LazyState(db_state) for db_state in group)
 
@@ -419,8 +528,29 @@ def _sorted_states_to_json(
             # a full state
             ent_results[-1] = LazyState(prev_state)
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+        yield ent_id, ent_results
+
+
+def _compact_entity_states(entity_id, ent_results):
+    """Return the states of an entity in columnar form.
+
+    Consecutive duplicate states are left out and only the
+    attributes of the last state are included.
+    """
+    states = []
+    last_changed = []
+    for state in ent_results:
+        if states and state.state == states[-1]:
+            continue
+        states.append(state.state)
+        last_changed.append(round(state.last_changed.timestamp(), 3))
+
+    return {
+        "entity_id": entity_id,
+        "state": states,
+        "last_changed": last_changed,
+        "attributes": ent_results[-1].attributes,
+    }
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -498,10 +628,42 @@ class HistoryPeriodView(HomeAssistantView):
             request.query.get("significant_changes_only", "1") != "0"
         )
 
-        minimal_response = "minimal_response" in request.query
+        compact = "compact" in request.query
+        # The compact encoding leaves out attributes itself and needs
+        # the last changed time of every state
+        minimal_response = "minimal_response" in request.query and not compact
 
         hass = request.app["hass"]
 
+        resolution = request.query.get("resolution")
+        if resolution is not None:
+            if resolution not in STATISTICS_TABLES:
+                return self.json_message("Invalid resolution", HTTP_BAD_REQUEST)
+
+            return cast(
+                web.Response,
+                await hass.async_add_executor_job(
+                    self._statistics_json,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    resolution,
+                ),
+            )
+
+        if "stream" in request.query:
+            return await self._async_stream_significant_states(
+                request,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                compact,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -513,9 +675,31 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                compact,
             ),
         )
 
+    def _statistics_json(self, hass, start_time, end_time, entity_ids, resolution):
+        """Fetch the compiled statistics of a resolution from the database as json."""
+        entity_filter = self.filters.entity_id_filter() if self.filters else None
+        if entity_filter and entity_ids:
+            entity_ids = [
+                entity_id for entity_id in entity_ids if entity_filter(entity_id)
+            ]
+            if not entity_ids:
+                return self.json([])
+
+        result = statistics_during_period(
+            hass, start_time, end_time, entity_ids, resolution
+        )
+        return self.json(
+            [
+                stats
+                for entity_id, stats in result.items()
+                if entity_filter is None or entity_filter(entity_id)
+            ]
+        )
+
     def _sorted_significant_states_json(
         self,
         hass,
@@ -525,6 +709,7 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        compact,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
@@ -560,8 +745,113 @@ class HistoryPeriodView(HomeAssistantView):
             sorted_result.extend(result)
             result = sorted_result
 
+        if compact:
+            result = [
+                _compact_entity_states(state_list[0].entity_id, state_list)
+                for state_list in result
+            ]
+
         return self.json(result)
 
+    async def _async_stream_significant_states(
+        self,
+        request,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        compact,
+    ):
+        """Stream significant states as a JSON list, one entity at a time.
+
+        The states are queried and encoded in the executor. The encoded
+        entities are handed to the event loop through a bounded queue so
+        the query pauses when the client reads slower than the database.
+        Entities are sent in entity_id order, use_include_order is not
+        applied as it would need all entities to be read first.
+        """
+        hass = request.app["hass"]
+        chunks = asyncio.Queue(STREAM_QUEUE_SIZE)
+        cancel = threading.Event()
+
+        def put_chunk(chunk):
+            """Put a chunk in the queue from the executor."""
+            # Nothing reads the queue anymore once the stream is cancelled
+            if cancel.is_set():
+                return
+            asyncio.run_coroutine_threadsafe(chunks.put(chunk), hass.loop).result()
+
+        def produce_chunks():
+            """Query the states and queue them encoded per entity."""
+            try:
+                with session_scope(hass=hass) as session:
+                    for ent_id, ent_results in _iter_significant_states(
+                        hass,
+                        session,
+                        start_time,
+                        end_time,
+                        entity_ids,
+                        self.filters,
+                        include_start_time_state,
+                        significant_changes_only,
+                        minimal_response,
+                    ):
+                        if not ent_results:
+                            continue
+                        if compact:
+                            ent_results = _compact_entity_states(ent_id, ent_results)
+                        put_chunk(
+                            json.dumps(
+                                ent_results, cls=JSONEncoder, allow_nan=False
+                            ).encode("UTF-8")
+                        )
+                        if cancel.is_set():
+                            return
+            finally:
+                put_chunk(None)
+
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_JSON
+        response.enable_compression()
+        await response.prepare(request)
+
+        producer = hass.async_add_executor_job(produce_chunks)
+        separator = b"["
+        failed = False
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                await response.write(separator + chunk)
+                separator = b","
+        finally:
+            cancel.set()
+            # Unblock the producer if it waits for room in the queue,
+            # it does not queue anything else once cancelled
+            while not chunks.empty():
+                chunks.get_nowait()
+
+            try:
+                await producer
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error streaming significant states")
+                failed = True
+
+        if failed:
+            # Drop the connection without ending the list, so clients can
+            # tell a failed stream from a complete one
+            response.force_close()
+            if request.transport is not None:
+                request.transport.close()
+            return response
+
+        await response.write(b"]" if separator == b"," else b"[]")
+        await response.write_eof()
+        return response
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
     """Build a sql filter from config."""
@@ -625,6 +915,17 @@ class Filters:
 
         baked_query += lambda q: q.filter(self.entity_filter())
 
+    def entity_id_filter(self):
+        """Return a function that tells if an entity id passes the filters."""
+        return generate_filter(
+            self.included_domains,
+            self.included_entities,
+            self.excluded_domains,
+            self.excluded_entities,
+            self.included_entity_globs,
+            self.excluded_entity_globs,
+        )
+
     def entity_filter(self):
         """Generate the entity filter query."""
         includes = []
@@ -21,7 +21,10 @@ from homeassistant.const import (
 import homeassistant.core as ha
 from homeassistant.exceptions import HomeAssistantError, Unauthorized, UnknownUser
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.service import async_extract_entity_ids
+from homeassistant.setup import async_get_setup_timeline
+from homeassistant.util.json import save_json
 
 _LOGGER = logging.getLogger(__name__)
 DOMAIN = ha.DOMAIN
@@ -29,7 +32,14 @@ SERVICE_RELOAD_CORE_CONFIG = "reload_core_config"
 SERVICE_CHECK_CONFIG = "check_config"
 SERVICE_UPDATE_ENTITY = "update_entity"
 SERVICE_SET_LOCATION = "set_location"
+SERVICE_PROFILE_LISTENERS = "profile_listeners"
+SERVICE_WRITE_STARTUP_TRACE = "write_startup_trace"
 SCHEMA_UPDATE_ENTITY = vol.Schema({ATTR_ENTITY_ID: cv.entity_ids})
+SCHEMA_PROFILE_LISTENERS = vol.Schema(
+    {vol.Optional("duration", default=60): cv.positive_int}
+)
+LISTENER_PROFILE_FILE = "listener_profile.txt"
+STARTUP_TRACE_FILE = "startup_trace.json"
 
 
 async def async_setup(hass: ha.HomeAssistant, config: dict) -> bool:
@@ -194,4 +204,59 @@ async def async_setup(hass: ha.HomeAssistant, config: dict) -> bool:
         vol.Schema({ATTR_LATITUDE: cv.latitude, ATTR_LONGITUDE: cv.longitude}),
     )
 
+    async def async_handle_profile_listeners(call):
+        """Service handler to profile listeners for a while."""
+        profiler = hass.listener_profiler = ha.ListenerProfiler()
+
+        def write_report(report):
+            with open(hass.config.path(LISTENER_PROFILE_FILE), "wt") as fp:
+                fp.write(_format_listener_report(report))
+
+        async def finish_profile(_):
+            """Stop profiling and write the report."""
+            if hass.listener_profiler is profiler:
+                hass.listener_profiler = None
+            report = profiler.async_report()
+            for stats in report[:10]:
+                _LOGGER.info(
+                    "Listener %s of %s was called %s times and ran %.3fs",
+                    stats["listener"],
+                    stats["integration"],
+                    stats["calls"],
+                    stats["total_time"],
+                )
+            await hass.async_add_executor_job(write_report, report)
+
+        async_call_later(hass, call.data["duration"], finish_profile)
+
+    hass.helpers.service.async_register_admin_service(
+        ha.DOMAIN,
+        SERVICE_PROFILE_LISTENERS,
+        async_handle_profile_listeners,
+        SCHEMA_PROFILE_LISTENERS,
+    )
+
+    async def async_handle_write_startup_trace(call):
+        """Service handler to write the startup timeline as a Chrome trace."""
+        await hass.async_add_executor_job(
+            save_json,
+            hass.config.path(STARTUP_TRACE_FILE),
+            async_get_setup_timeline(hass).async_chrome_trace(),
+        )
+
+    hass.helpers.service.async_register_admin_service(
+        ha.DOMAIN, SERVICE_WRITE_STARTUP_TRACE, async_handle_write_startup_trace
+    )
+
     return True
+
+
+def _format_listener_report(report):
+    """Format the stats of a listener profile as a table."""
+    lines = ["calls\ttotal (s)\tmax (s)\tintegration\tlistener"]
+    for stats in report:
+        lines.append(
+            f"{stats['calls']}\t{stats['total_time']:.6f}\t{stats['max_time']:.6f}"
+            f"\t{stats['integration']}\t{stats['listener']}"
+        )
+    return "\n".join(lines) + "\n"
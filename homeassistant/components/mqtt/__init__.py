@@ -8,6 +8,7 @@ import logging
 from operator import attrgetter
 import os
 import ssl
+import threading
 import time
 from typing import Any, Callable, List, Optional, Union
 
@@ -82,6 +83,7 @@ from .discovery import (
 )
 from .models import Message, MessageCallbackType, PublishPayloadType
 from .subscription import async_subscribe_topics, async_unsubscribe_topics
+from .topic_trie import TopicTrie
 from .util import _VALID_QOS_SCHEMA, valid_publish_topic, valid_subscribe_topic
 
 _LOGGER = logging.getLogger(__name__)
@@ -136,6 +138,12 @@ CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
 DISCOVERY_COOLDOWN = 2
 TIMEOUT_ACK = 10
 
+# Received messages are handed to the event loop in batches, at most
+# MESSAGE_BATCH_INTERVAL seconds after the first message of a batch
+# arrived or as soon as MESSAGE_BATCH_SIZE messages are waiting
+MESSAGE_BATCH_INTERVAL = 0.01
+MESSAGE_BATCH_SIZE = 500
+
 PLATFORMS = [
     "alarm_control_panel",
     "binary_sensor",
@@ -630,7 +638,6 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     callback: MessageCallbackType = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str = attr.ib(default="utf-8")
@@ -654,6 +661,7 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
         self.subscriptions: List[Subscription] = []
+        self._subscription_trie: TopicTrie[Subscription] = TopicTrie()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -661,6 +669,10 @@ class MQTT:
         self._paho_lock = asyncio.Lock()
 
         self._pending_operations = {}
+        self._pending_messages: List[Any] = []
+        self._pending_messages_lock = threading.Lock()
+        self._messages_flush_scheduled = False
+        self._messages_flush_handle: Optional[asyncio.Handle] = None
 
         if self.hass.state == CoreState.running:
             self._ha_started.set()
@@ -839,10 +851,9 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), msg_callback, qos, encoding
-        )
+        subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        self._subscription_trie.add(topic, subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -855,8 +866,9 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
+            self._subscription_trie.remove(topic, subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            if self._subscription_trie.has_filter(topic):
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
@@ -942,8 +954,65 @@ class MQTT:
             self.hass.loop.create_task(publish_birth_message(birth_message))
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        Runs in the paho network thread, the message is buffered until the
+        event loop handles the next batch.
+        """
+        with self._pending_messages_lock:
+            self._pending_messages.append(msg)
+            if len(self._pending_messages) == MESSAGE_BATCH_SIZE:
+                immediate = True
+            elif self._messages_flush_scheduled:
+                return
+            else:
+                immediate = False
+            self._messages_flush_scheduled = True
+
+        self.hass.loop.call_soon_threadsafe(
+            self._async_schedule_messages_flush, immediate
+        )
+
+    @callback
+    def _async_schedule_messages_flush(self, immediate: bool) -> None:
+        """Schedule handling the buffered messages, one flush at a time."""
+        if self._messages_flush_handle is not None:
+            if not immediate:
+                return
+            self._messages_flush_handle.cancel()
+
+        if immediate:
+            self._messages_flush_handle = self.hass.loop.call_soon(
+                self._async_flush_messages
+            )
+        else:
+            self._messages_flush_handle = self.hass.loop.call_later(
+                MESSAGE_BATCH_INTERVAL, self._async_flush_messages
+            )
+
+    @callback
+    def _async_flush_messages(self) -> None:
+        """Handle a batch of the buffered messages."""
+        self._messages_flush_handle = None
+
+        with self._pending_messages_lock:
+            messages = self._pending_messages[:MESSAGE_BATCH_SIZE]
+            del self._pending_messages[:MESSAGE_BATCH_SIZE]
+            more_pending = bool(self._pending_messages)
+            if not more_pending:
+                self._messages_flush_scheduled = False
+
+        try:
+            for msg in messages:
+                try:
+                    self._mqtt_handle_message(msg)
+                except Exception:  # pylint: disable=broad-except
+                    # Don't lose the rest of the batch on a failing callback
+                    _LOGGER.exception("Error handling message on %s", msg.topic)
+        finally:
+            if more_pending:
+                # Let other jobs run before handling the next batch
+                self._async_schedule_messages_flush(True)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -955,10 +1024,7 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        for subscription in self.subscriptions:
-            if not subscription.matcher(msg.topic):
-                continue
-
+        for subscription in self._subscription_trie.match(msg.topic):
             payload: SubscribePayloadType = msg.payload
             if subscription.encoding is not None:
                 try:
@@ -1053,16 +1119,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
@@ -0,0 +1,122 @@
+"""Match MQTT topics against many subscribed topic filters at once."""
+from itertools import count
+from typing import Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+_T = TypeVar("_T")
+
+# Number of topics to remember the matching items of
+MAX_CACHED_TOPICS = 8192
+
+
+class _Node(Generic[_T]):
+    """A level of the topic filters."""
+
+    __slots__ = ("children", "items")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: Dict[str, "_Node[_T]"] = {}
+        self.items: Dict[int, _T] = {}
+
+
+class TopicTrie(Generic[_T]):
+    """Items keyed by MQTT topic filter, split into a trie by topic level.
+
+    Looking up a topic only visits the levels of the topic and the
+    wildcards next to them, and the result is cached per topic until
+    an item is added or removed. Matches are returned in the order the
+    items were added.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root: _Node[_T] = _Node()
+        self._order = count()
+        self._keys: Dict[int, int] = {}
+        self._cache: Dict[str, Tuple[_T, ...]] = {}
+
+    def add(self, topic_filter: str, item: _T) -> None:
+        """Add an item for a topic filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            node = node.children.setdefault(level, _Node())
+        key = next(self._order)
+        self._keys[id(item)] = key
+        node.items[key] = item
+        self._cache.clear()
+
+    def remove(self, topic_filter: str, item: _T) -> None:
+        """Remove an item of a topic filter."""
+        key = self._keys.pop(id(item))
+        path: List[Tuple[_Node[_T], str]] = []
+        node = self._root
+        for level in topic_filter.split("/"):
+            path.append((node, level))
+            node = node.children[level]
+        del node.items[key]
+        self._cache.clear()
+
+        # Drop the levels that no other topic filter uses anymore
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.items or child.children:
+                break
+            del parent.children[level]
+
+    def has_filter(self, topic_filter: str) -> bool:
+        """Return if any item was added for a topic filter."""
+        node: Optional[_Node[_T]] = self._root
+        for level in topic_filter.split("/"):
+            node = node.children.get(level)  # type: ignore
+            if node is None:
+                return False
+        return bool(node.items)  # type: ignore
+
+    def match(self, topic: str) -> Tuple[_T, ...]:
+        """Return the items of all topic filters that match a topic."""
+        matches = self._cache.get(topic)
+        if matches is not None:
+            return matches
+
+        found = dict(self._iter_match(topic))
+        matches = tuple(found[key] for key in sorted(found))
+        if len(self._cache) >= MAX_CACHED_TOPICS:
+            self._cache.clear()
+        self._cache[topic] = matches
+        return matches
+
+    def _iter_match(self, topic: str) -> Iterator[Tuple[int, _T]]:
+        """Yield the keys and items of the topic filters that match a topic.
+
+        Wildcards at the first level do not match topics starting with $.
+        """
+        levels = topic.split("/")
+        wildcards_allowed = not topic.startswith("$")
+        nodes = [self._root]
+
+        for idx, level in enumerate(levels):
+            if idx:
+                wildcards_allowed = True
+            next_nodes = []
+            for node in nodes:
+                children = node.children
+                if wildcards_allowed:
+                    multi_level = children.get("#")
+                    if multi_level is not None:
+                        yield from multi_level.items.items()
+                    single_level = children.get("+")
+                    if single_level is not None:
+                        next_nodes.append(single_level)
+                child = children.get(level)
+                if child is not None:
+                    next_nodes.append(child)
+            nodes = next_nodes
+            if not nodes:
+                return
+
+        for node in nodes:
+            yield from node.items.items()
+            # A multi-level wildcard also matches its parent level
+            multi_level = node.children.get("#")
+            if multi_level is not None:
+                yield from multi_level.items.items()
@@ -1,42 +1,43 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import queue
 import threading
 import time
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
+from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     CONF_EXCLUDE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_STATE_CHANGED,
-    EVENT_TIME_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CoreState, Event, HomeAssistant, State, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER,
     convert_include_exclude_filter,
 )
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
-from . import migration, purge
+from . import migration, purge, statistics
+from .backlog import RecorderBacklog
 from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Events, RecorderRuns, StateAttributes, States
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -60,6 +61,19 @@ DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 KEEPALIVE_TIME = 30
 
+# Maximum number of pending rows before a bulk write is flushed
+# even if the commit interval has not passed yet
+BULK_WRITE_MAX_ROWS = 1000
+# Dialects that accept explicit primary keys without desyncing
+# the autoincrement counter of the table
+BULK_WRITE_DIALECTS = ("sqlite", "mysql")
+
+# Seconds to wait between purge batches so they do not hold up recording
+PURGE_BATCH_DELAY = 1
+
+# Number of recently written attributes to remember the shared row id of
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -68,6 +82,17 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_WRITE = "bulk_write"
+CONF_QUEUE_HIGH_WATER_MARK = "queue_high_water_mark"
+CONF_QUEUE_OVERFLOW_POLICY = "queue_overflow_policy"
+
+# Keep only the latest queued state of an entity
+OVERFLOW_POLICY_COALESCE_STATES = "coalesce_states"
+# Queue state changes without their attributes
+OVERFLOW_POLICY_DROP_ATTRIBUTES = "drop_attributes"
+OVERFLOW_POLICIES = [OVERFLOW_POLICY_COALESCE_STATES, OVERFLOW_POLICY_DROP_ATTRIBUTES]
+
+DEFAULT_QUEUE_HIGH_WATER_MARK = 40000
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
     {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
@@ -103,6 +128,15 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_BULK_WRITE, default=False): cv.boolean,
+                    vol.Optional(
+                        CONF_QUEUE_HIGH_WATER_MARK,
+                        default=DEFAULT_QUEUE_HIGH_WATER_MARK,
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_QUEUE_OVERFLOW_POLICY,
+                        default=OVERFLOW_POLICY_COALESCE_STATES,
+                    ): vol.In(OVERFLOW_POLICIES),
                 }
             ),
         )
@@ -161,6 +195,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_integrity_check = conf[CONF_DB_INTEGRITY_CHECK]
+    bulk_write = conf[CONF_BULK_WRITE]
+    queue_high_water_mark = conf[CONF_QUEUE_HIGH_WATER_MARK]
+    queue_overflow_policy = conf[CONF_QUEUE_OVERFLOW_POLICY]
 
     db_url = conf.get(CONF_DB_URL)
     if not db_url:
@@ -178,6 +215,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         db_integrity_check=db_integrity_check,
+        bulk_write=bulk_write,
+        queue_high_water_mark=queue_high_water_mark,
+        queue_overflow_policy=queue_overflow_policy,
     )
     instance.async_initialize()
     instance.start()
@@ -190,16 +230,40 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         DOMAIN, SERVICE_PURGE, async_handle_purge_service, schema=SERVICE_PURGE_SCHEMA
     )
 
+    websocket_api.async_register_command(hass, websocket_recorder_info)
+
     return await instance.async_db_ready
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({"type": "recorder/info"})
+@callback
+def websocket_recorder_info(hass, connection, msg):
+    """Return statistics about the recorder backlog."""
+    connection.send_result(msg["id"], hass.data[DATA_INSTANCE].async_backlog_info())
+
+
 PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
 
+# Compile the statistics of the periods that ended before now
+StatisticsTask = namedtuple("StatisticsTask", ["now"])
+
+# Placeholder for the latest state of an entity while the queue is coalesced
+CoalescedStateTask = namedtuple("CoalescedStateTask", ["entity_id"])
+
 
 class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+class CommitTask:
+    """An object to insert into the recorder queue to commit the event session."""
+
+
+class KeepAliveTask:
+    """An object to insert into the recorder queue to keep the connection alive."""
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -215,6 +279,9 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: List[str],
         db_integrity_check: bool,
+        bulk_write: bool = False,
+        queue_high_water_mark: int = 0,
+        queue_overflow_policy: str = OVERFLOW_POLICY_COALESCE_STATES,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -229,6 +296,12 @@ class Recorder(threading.Thread):
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
         self.db_integrity_check = db_integrity_check
+        self.bulk_write = bulk_write
+        self.queue_high_water_mark = queue_high_water_mark
+        self.queue_overflow_policy = queue_overflow_policy
+        self.backlog = RecorderBacklog()
+        self.purge_progress: Optional[purge.PurgeProgress] = None
+        self.statistics = statistics.StatisticsCompiler()
         self.async_db_ready = asyncio.Future()
         self._queue_watch = threading.Event()
         self.engine: Any = None
@@ -237,9 +310,19 @@ class Recorder(threading.Thread):
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
 
-        self._timechanges_seen = 0
-        self._keepalive_count = 0
+        self._commit_handle: Optional[asyncio.TimerHandle] = None
         self._old_states = {}
+        self._pending_events: List[dict] = []
+        self._pending_states: List[dict] = []
+        self._next_event_id: Optional[int] = None
+        self._next_state_id: Optional[int] = None
+        self._next_attributes_id: Optional[int] = None
+        self._pending_attributes: List[dict] = []
+        self._pending_state_attributes: Dict[str, StateAttributes] = {}
+        self._state_attributes_ids: OrderedDict = OrderedDict()
+        self._uncommitted_events = 0
+        self._coalesced_states: Dict[str, Event] = {}
+        self._coalesced_lock = threading.Lock()
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -247,7 +330,9 @@ class Recorder(threading.Thread):
     @callback
     def async_initialize(self):
         """Initialize the recorder."""
-        self.hass.bus.async_listen(MATCH_ALL, self.event_listener)
+        self.hass.bus.async_listen(
+            MATCH_ALL, self.event_listener, event_filter=self._async_event_filter
+        )
 
     def do_adhoc_purge(self, **kwargs):
         """Trigger an adhoc purge retaining keep_days worth of data."""
@@ -323,6 +408,14 @@ class Recorder(threading.Thread):
                     EVENT_HOMEASSISTANT_START, notify_hass_started
                 )
 
+        if self.bulk_write and self.engine.dialect.name not in BULK_WRITE_DIALECTS:
+            _LOGGER.warning(
+                "Bulk write is not supported for %s databases, "
+                "falling back to writing events one by one",
+                self.engine.dialect.name,
+            )
+            self.bulk_write = False
+
         self.hass.add_job(register)
         result = hass_started.result()
 
@@ -343,80 +436,285 @@ class Recorder(threading.Thread):
                 async_purge, hour=4, minute=12, second=0
             )
 
+        self.hass.helpers.event.track_time_interval(
+            self._async_queue_keep_alive, timedelta(seconds=KEEPALIVE_TIME)
+        )
+        # Short term statistics periods end every five minutes
+        self.hass.helpers.event.track_utc_time_change(
+            self._async_queue_statistics, minute="/5", second=0
+        )
+
         self.event_session = self.get_session()
         # Use a session for the event read loop
-        # with a commit every time the event time
-        # has changed. This reduces the disk io.
+        # with a commit every commit interval
+        # after the first pending event. This reduces the disk io.
         while True:
             event = self.queue.get()
+            if isinstance(event, CoalescedStateTask):
+                with self._coalesced_lock:
+                    event = self._coalesced_states.pop(event.entity_id)
             if event is None:
                 self._close_run()
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
-                # Schedule a new purge task if this one didn't finish
+                # Pending states may point to shared attributes that the
+                # purge would consider unused, so write them out first
+                self._commit_event_session_or_retry()
+                # Schedule the next batch if this one didn't finish
                 if not purge.purge_old_data(self, event.keep_days, event.repack):
-                    self.queue.put(PurgeTask(event.keep_days, event.repack))
+                    self.hass.add_job(self._async_schedule_purge_batch, event)
                 continue
             if isinstance(event, WaitTask):
                 self._queue_watch.set()
                 continue
-            if event.event_type == EVENT_TIME_CHANGED:
-                self._keepalive_count += 1
-                if self._keepalive_count >= KEEPALIVE_TIME:
-                    self._keepalive_count = 0
-                    self._send_keep_alive()
-                if self.commit_interval:
-                    self._timechanges_seen += 1
-                    if self._timechanges_seen >= self.commit_interval:
-                        self._timechanges_seen = 0
-                        self._commit_event_session_or_retry()
+            if isinstance(event, CommitTask):
+                self._commit_event_session_or_retry()
                 continue
-            if event.event_type in self.exclude_t:
+            if isinstance(event, KeepAliveTask):
+                self._send_keep_alive()
                 continue
-
-            entity_id = event.data.get(ATTR_ENTITY_ID)
-            if entity_id is not None:
-                if not self.entity_filter(entity_id):
+            if isinstance(event, StatisticsTask):
+                try:
+                    rows = self.statistics.compile(event.now)
+                except Exception as err:  # pylint: disable=broad-except
+                    # Must catch the exception to prevent the loop from collapsing
+                    _LOGGER.exception("Error compiling statistics: %s", err)
                     continue
+                if rows:
+                    self._add_statistics(rows)
+                    self._commit_event_session_or_retry()
+                continue
 
-            try:
-                dbevent = Events.from_event(event)
-                if event.event_type == EVENT_STATE_CHANGED:
-                    dbevent.event_data = "{}"
-                self.event_session.add(dbevent)
-            except (TypeError, ValueError):
-                _LOGGER.warning("Event is not JSON serializable: %s", event)
-            except Exception as err:  # pylint: disable=broad-except
-                # Must catch the exception to prevent the loop from collapsing
-                _LOGGER.exception("Error adding event: %s", err)
+            self.backlog.last_dequeued_fired = event.time_fired
+            self._uncommitted_events += 1
+
+            if self.bulk_write:
+                self._queue_bulk_rows(event)
+            else:
+                self._add_to_event_session(event)
 
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
+            if event.event_type == EVENT_STATE_CHANGED:
                 try:
-                    dbstate = States.from_event(event)
-                    has_new_state = event.data.get("new_state")
-                    if dbstate.entity_id in self._old_states:
-                        dbstate.old_state = self._old_states.pop(dbstate.entity_id)
-                    if not has_new_state:
-                        dbstate.state = None
-                    dbstate.event = dbevent
-                    self.event_session.add(dbstate)
-                    if has_new_state:
-                        self._old_states[dbstate.entity_id] = dbstate
-                except (TypeError, ValueError):
-                    _LOGGER.warning(
-                        "State is not JSON serializable: %s",
+                    rows = self.statistics.add_state(
+                        event.data[ATTR_ENTITY_ID],
                         event.data.get("new_state"),
+                        event.time_fired,
                     )
                 except Exception as err:  # pylint: disable=broad-except
                     # Must catch the exception to prevent the loop from collapsing
-                    _LOGGER.exception("Error adding state change: %s", err)
+                    _LOGGER.exception("Error adding state to statistics: %s", err)
+                else:
+                    self._add_statistics(rows)
 
             # If they do not have a commit interval
             # than we commit right away
             if not self.commit_interval:
                 self._commit_event_session_or_retry()
 
+    def _add_statistics(self, rows):
+        """Add the rows of compiled statistics to the event session."""
+        for row in rows:
+            self.event_session.add(row)
+
+    def _add_to_event_session(self, event):
+        """Add ORM objects for an event to the event session."""
+        dbevent = None
+        try:
+            dbevent = Events.from_event(event)
+            if event.event_type == EVENT_STATE_CHANGED:
+                dbevent.event_data = "{}"
+            self.event_session.add(dbevent)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding event: %s", err)
+
+        if event.event_type == EVENT_STATE_CHANGED:
+            try:
+                dbstate = States.from_event(event)
+                has_new_state = event.data.get("new_state")
+                if dbstate.entity_id in self._old_states:
+                    dbstate.old_state = self._old_states.pop(dbstate.entity_id)
+                if not has_new_state:
+                    dbstate.state = None
+                self._set_state_attributes(dbstate)
+                dbstate.event = dbevent
+                self.event_session.add(dbstate)
+                if has_new_state:
+                    self._old_states[dbstate.entity_id] = dbstate
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s",
+                    event.data.get("new_state"),
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                # Must catch the exception to prevent the loop from collapsing
+                _LOGGER.exception("Error adding state change: %s", err)
+
+    def _queue_bulk_rows(self, event):
+        """Serialize an event into pending rows for the next bulk write.
+
+        Primary keys are assigned here so states can reference their
+        event and old state inside the same executemany batch.
+        """
+        dbstate = None
+        try:
+            if self._next_event_id is None:
+                self._setup_bulk_write_ids()
+            if event.event_type == EVENT_STATE_CHANGED:
+                dbstate = States.values_from_event(event)
+                dbevent = Events.values_from_event(event, event_data="{}")
+                attributes_id = self._bulk_attributes_id(dbstate.pop("attributes"))
+            else:
+                dbevent = Events.values_from_event(event)
+        except (TypeError, ValueError):
+            if event.event_type == EVENT_STATE_CHANGED:
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s", event.data.get("new_state")
+                )
+            else:
+                _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding event: %s", err)
+            return
+
+        dbevent["event_id"] = self._next_event_id
+        self._next_event_id += 1
+        self._pending_events.append(dbevent)
+
+        if dbstate is not None:
+            entity_id = dbstate["entity_id"]
+            dbstate["state_id"] = self._next_state_id
+            self._next_state_id += 1
+            dbstate["event_id"] = dbevent["event_id"]
+            dbstate["attributes_id"] = attributes_id
+            dbstate["attributes"] = None
+            dbstate["old_state_id"] = self._old_states.pop(entity_id, None)
+            if event.data.get("new_state"):
+                self._old_states[entity_id] = dbstate["state_id"]
+            else:
+                dbstate["state"] = None
+            self._pending_states.append(dbstate)
+
+        if len(self._pending_events) >= BULK_WRITE_MAX_ROWS:
+            self._commit_event_session_or_retry()
+
+    def _set_state_attributes(self, dbstate):
+        """Move the attributes of a state object to a shared row."""
+        shared_attrs = dbstate.attributes
+        dbstate.attributes = None
+
+        attributes_id = self._cached_attributes_id(shared_attrs)
+        if attributes_id is not None:
+            dbstate.attributes_id = attributes_id
+            return
+
+        pending = self._pending_state_attributes.get(shared_attrs)
+        if pending is None:
+            attrs_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+            attributes_id = self._find_attributes_id(shared_attrs, attrs_hash)
+            if attributes_id is not None:
+                dbstate.attributes_id = attributes_id
+                return
+
+            pending = StateAttributes(hash=attrs_hash, shared_attrs=shared_attrs)
+            self._pending_state_attributes[shared_attrs] = pending
+
+        dbstate.state_attributes = pending
+
+    def _bulk_attributes_id(self, shared_attrs):
+        """Return the id of the shared row for attributes, adding it if needed."""
+        attributes_id = self._cached_attributes_id(shared_attrs)
+        if attributes_id is not None:
+            return attributes_id
+
+        attrs_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        attributes_id = self._find_attributes_id(shared_attrs, attrs_hash)
+        if attributes_id is None:
+            attributes_id = self._next_attributes_id
+            self._next_attributes_id += 1
+            self._pending_attributes.append(
+                {
+                    "attributes_id": attributes_id,
+                    "hash": attrs_hash,
+                    "shared_attrs": shared_attrs,
+                }
+            )
+
+        self._cache_attributes_id(shared_attrs, attributes_id)
+        return attributes_id
+
+    def _find_attributes_id(self, shared_attrs, attrs_hash):
+        """Look up the id of stored attributes in the database."""
+        with self.event_session.no_autoflush:
+            row = (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(StateAttributes.hash == attrs_hash)
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .first()
+            )
+
+        if row is None:
+            return None
+
+        self._cache_attributes_id(shared_attrs, row[0])
+        return row[0]
+
+    def clear_state_attributes_cache(self):
+        """Forget the ids of written attributes, called after a purge."""
+        self._state_attributes_ids.clear()
+
+    def _cached_attributes_id(self, shared_attrs):
+        """Return the id of recently written attributes."""
+        attributes_id = self._state_attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._state_attributes_ids.move_to_end(shared_attrs)
+        return attributes_id
+
+    def _cache_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of written attributes."""
+        self._state_attributes_ids[shared_attrs] = attributes_id
+        if len(self._state_attributes_ids) > STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            self._state_attributes_ids.popitem(last=False)
+
+    def _setup_bulk_write_ids(self):
+        """Continue primary keys from the highest ids in the database."""
+        query = self.event_session.query
+        max_event_id = query(func.max(Events.event_id)).scalar()
+        max_state_id = query(func.max(States.state_id)).scalar()
+        max_attributes_id = query(func.max(StateAttributes.attributes_id)).scalar()
+        # Only set once all queries succeeded, unset ids are set up again
+        self._next_event_id = (max_event_id or 0) + 1
+        self._next_state_id = (max_state_id or 0) + 1
+        self._next_attributes_id = (max_attributes_id or 0) + 1
+
+    def _flush_bulk_rows(self):
+        """Insert the pending rows with one executemany per table."""
+        if self._pending_attributes:
+            self.event_session.execute(
+                StateAttributes.__table__.insert(), self._pending_attributes
+            )
+        if self._pending_events:
+            self.event_session.execute(Events.__table__.insert(), self._pending_events)
+        if self._pending_states:
+            self.event_session.execute(States.__table__.insert(), self._pending_states)
+
+    def _clear_bulk_rows(self):
+        """Drop the pending rows and the ids they were assigned."""
+        self._pending_events = []
+        self._pending_states = []
+        self._pending_attributes = []
+        self._next_event_id = None
+        self._next_state_id = None
+        self._next_attributes_id = None
+        self._old_states = {}
+        # Cached ids may belong to attributes that were never written
+        self._state_attributes_ids.clear()
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -468,6 +766,11 @@ class Recorder(threading.Thread):
         self._reopen_event_session()
 
     def _reopen_event_session(self):
+        self._uncommitted_events = 0
+        self._pending_state_attributes = {}
+        if self.bulk_write:
+            self._clear_bulk_rows()
+
         try:
             self.event_session.rollback()
         except Exception as err:  # pylint: disable=broad-except
@@ -487,18 +790,132 @@ class Recorder(threading.Thread):
             _LOGGER.exception("Error while creating new event session: %s", err)
 
     def _commit_event_session(self):
+        start = time.perf_counter()
         try:
+            if self.bulk_write:
+                self._flush_bulk_rows()
             self.event_session.commit()
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
             raise
 
+        self.backlog.record_commit(
+            self._uncommitted_events, time.perf_counter() - start
+        )
+        self._uncommitted_events = 0
+
+        for shared_attrs, dbattrs in self._pending_state_attributes.items():
+            self._cache_attributes_id(shared_attrs, dbattrs.attributes_id)
+        self._pending_state_attributes = {}
+
+        if self.bulk_write:
+            self._pending_events = []
+            self._pending_states = []
+            self._pending_attributes = []
+
+    @callback
+    def _async_schedule_purge_batch(self, task):
+        """Queue the next purge batch after a pause for live events."""
+
+        @callback
+        def async_queue_purge_batch(now):
+            """Queue the purge batch."""
+            self.queue.put(task)
+
+        async_call_later(self.hass, PURGE_BATCH_DELAY, async_queue_purge_batch)
+
+    @callback
+    def _async_event_filter(self, event):
+        """Filter out events the recorder is not going to store."""
+        if event.event_type in self.exclude_t:
+            return False
+
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        return entity_id is None or self.entity_filter(entity_id)
+
+    @callback
+    def _async_queue_commit(self):
+        """Queue a commit of the events received since the last commit."""
+        self._commit_handle = None
+        self.queue.put(CommitTask())
+
+    @callback
+    def _async_queue_keep_alive(self, now):
+        """Queue a keepalive of the database connection."""
+        self.queue.put(KeepAliveTask())
+
+    @callback
+    def _async_queue_statistics(self, now):
+        """Queue compiling the statistics of the periods that ended."""
+        self.queue.put(StatisticsTask(now))
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
+        if self.commit_interval and self._commit_handle is None:
+            self._commit_handle = self.hass.loop.call_later(
+                self.commit_interval, self._async_queue_commit
+            )
+
+        if (
+            self.queue_high_water_mark
+            and event.event_type == EVENT_STATE_CHANGED
+            and self.queue.qsize() >= self.queue_high_water_mark
+        ):
+            self._async_queue_overflowed_state(event)
+            return
+
         self.queue.put(event)
 
+    @callback
+    def _async_queue_overflowed_state(self, event):
+        """Queue a state change while the backlog is above the high-water mark."""
+        if self.queue_overflow_policy == OVERFLOW_POLICY_DROP_ATTRIBUTES:
+            new_state = event.data.get("new_state")
+            if new_state is not None and new_state.attributes:
+                self.backlog.dropped_attributes += 1
+                event = Event(
+                    event.event_type,
+                    {
+                        **event.data,
+                        "new_state": State(
+                            new_state.entity_id,
+                            new_state.state,
+                            None,
+                            new_state.last_changed,
+                            new_state.last_updated,
+                            new_state.context,
+                            validate_entity_id=False,
+                        ),
+                    },
+                    event.origin,
+                    event.time_fired,
+                    event.context,
+                )
+            self.queue.put(event)
+            return
+
+        entity_id = event.data["entity_id"]
+        with self._coalesced_lock:
+            if entity_id in self._coalesced_states:
+                self.backlog.coalesced_states += 1
+                self._coalesced_states[entity_id] = event
+                return
+            self._coalesced_states[entity_id] = event
+        self.queue.put(CoalescedStateTask(entity_id))
+
+    @callback
+    def async_backlog_info(self):
+        """Return statistics about the queue and database writes."""
+        purge_progress = self.purge_progress
+        return {
+            **self.backlog.as_dict(self.queue.qsize()),
+            "queue_high_water_mark": self.queue_high_water_mark,
+            "queue_overflow_policy": self.queue_overflow_policy,
+            "purge": purge_progress.as_dict() if purge_progress else None,
+        }
+
     def block_till_done(self):
         """Block till all events processed.
 
@@ -0,0 +1,103 @@
+"""Track the backlog of the recorder queue and the write throughput."""
+from collections import deque
+from datetime import datetime
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import homeassistant.util.dt as dt_util
+
+# Upper bounds in seconds of the commit latency histogram buckets
+COMMIT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Number of seconds the events per second rate is averaged over
+EVENTS_PER_SECOND_WINDOW = 60
+
+
+class RecorderBacklog:
+    """Statistics about the recorder queue and database writes.
+
+    Writes are recorded from the recorder thread while the event loop
+    reads the statistics, so the samples are guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the backlog statistics."""
+        self.events_written = 0
+        self.coalesced_states = 0
+        self.dropped_attributes = 0
+        self.last_dequeued_fired: Optional[datetime] = None
+        self._commit_latency: List[int] = [0] * (len(COMMIT_LATENCY_BUCKETS) + 1)
+        self._written_samples: Deque[Tuple[float, int]] = deque()
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_commit(self, events: int, duration: float) -> None:
+        """Record a successful commit of events taking duration seconds."""
+        now = time.monotonic()
+        bucket = len(COMMIT_LATENCY_BUCKETS)
+        for idx, upper_bound in enumerate(COMMIT_LATENCY_BUCKETS):
+            if duration <= upper_bound:
+                bucket = idx
+                break
+
+        with self._lock:
+            self.events_written += events
+            self._commit_latency[bucket] += 1
+            if events:
+                self._written_samples.append((now, events))
+            self._prune_samples(now)
+
+    def events_per_second(self) -> float:
+        """Return the average number of events written per second."""
+        now = time.monotonic()
+        with self._lock:
+            self._prune_samples(now)
+            written = sum(events for _, events in self._written_samples)
+
+        elapsed = min(EVENTS_PER_SECOND_WINDOW, max(now - self._started, 1))
+        return round(written / elapsed, 2)
+
+    def commit_latency(self) -> Dict[str, int]:
+        """Return the commit latency histogram keyed by bucket upper bound."""
+        with self._lock:
+            counts = list(self._commit_latency)
+
+        histogram = {
+            str(upper_bound): count
+            for upper_bound, count in zip(COMMIT_LATENCY_BUCKETS, counts)
+        }
+        histogram["inf"] = counts[-1]
+        return histogram
+
+    def oldest_event_age(self, queue_size: int) -> float:
+        """Return the age in seconds of the oldest event waiting to be written.
+
+        The event that was dequeued last is the oldest one not yet written,
+        so its age is used for as long as there are items waiting.
+        """
+        fired = self.last_dequeued_fired
+        if not queue_size or fired is None:
+            return 0
+
+        return round(max((dt_util.utcnow() - fired).total_seconds(), 0), 3)
+
+    def as_dict(self, queue_size: int) -> Dict[str, Any]:
+        """Return the statistics as a JSON serializable dict."""
+        return {
+            "backlog": queue_size,
+            "oldest_event_age": self.oldest_event_age(queue_size),
+            "events_written": self.events_written,
+            "events_per_second": self.events_per_second(),
+            "commit_latency": self.commit_latency(),
+            "coalesced_states": self.coalesced_states,
+            "dropped_attributes": self.dropped_attributes,
+        }
+
+    def _prune_samples(self, now: float) -> None:
+        """Remove samples that fell out of the averaging window."""
+        while (
+            self._written_samples
+            and now - self._written_samples[0][0] > EVENTS_PER_SECOND_WINDOW
+        ):
+            self._written_samples.popleft()
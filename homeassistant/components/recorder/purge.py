@@ -1,67 +1,106 @@
 """Purge old data helper."""
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 import time
+from typing import Any, Dict
 
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    StatisticsShortTerm,
+)
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# Maximum number of states and of events deleted in one batch, the state ids
+# are bound as parameters and SQLite before 3.32 allows at most 999 of them
+MAX_ROWS_TO_PURGE = 998
+
+
+class PurgeProgress:
+    """Progress of a purge that runs in several batches."""
+
+    def __init__(self, purge_before: datetime) -> None:
+        """Initialize the purge progress."""
+        self.purge_before = purge_before
+        self.batches = 0
+        self.states_purged = 0
+        self.events_purged = 0
+        self.statistics_purged = 0
+        self._started = time.monotonic()
+
+    @property
+    def duration(self) -> float:
+        """Return the number of seconds since the purge started."""
+        return round(time.monotonic() - self._started, 3)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the progress as a JSON serializable dict."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "batches": self.batches,
+            "states_purged": self.states_purged,
+            "events_purged": self.events_purged,
+            "statistics_purged": self.statistics_purged,
+            "duration": self.duration,
+        }
+
+
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Deletes at most MAX_ROWS_TO_PURGE states and events per call, in
+    primary key order, to keep transactions small. Returns False while
+    there are more rows to purge.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
+    progress = instance.purge_progress
+    if progress is None:
+        progress = instance.purge_progress = PurgeProgress(purge_before)
     _LOGGER.debug("Purging states and events before target %s", purge_before)
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            # Purge a max of 1 hour, based on the oldest states or events record
-            batch_purge_before = purge_before
-
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    states[0].last_updated + timedelta(hours=1),
-                )
-
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    events[0].time_fired + timedelta(hours=1),
+            states_purged = _purge_states(session, purge_before)
+            _LOGGER.debug("Deleted %s states", states_purged)
+
+            events_purged = _purge_events(session, purge_before)
+            _LOGGER.debug("Deleted %s events", events_purged)
+
+            # Hourly statistics are kept, they replace the purged states
+            statistics_purged = _purge_short_term_statistics(session, purge_before)
+            _LOGGER.debug("Deleted %s short term statistics", statistics_purged)
+
+            progress.batches += 1
+            progress.states_purged += states_purged
+            progress.events_purged += events_purged
+            progress.statistics_purged += statistics_purged
+
+            # A full batch means there may be more rows to purge
+            if MAX_ROWS_TO_PURGE in (states_purged, events_purged, statistics_purged):
+                _LOGGER.debug(
+                    "Purging hasn't fully completed yet, %s states and %s events "
+                    "deleted in %s batches",
+                    progress.states_purged,
+                    progress.events_purged,
+                    progress.batches,
                 )
+                return False
 
-            _LOGGER.debug("Purging states and events before %s", batch_purge_before)
-
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
-
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            # Shared attributes are only removed once no state uses them
+            attributes_purged = _purge_unused_attributes(session)
+            _LOGGER.debug("Deleted %s state_attributes", attributes_purged)
 
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
-            if batch_purge_before != purge_before:
-                _LOGGER.debug("Purging hasn't fully completed yet")
+            if attributes_purged == MAX_ROWS_TO_PURGE:
+                instance.clear_state_attributes_cache()
                 return False
 
             # Recorder runs is small, no need to batch run it
@@ -72,6 +111,16 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             )
             _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
+        # Ids of removed attributes must not be handed out from the cache
+        instance.clear_state_attributes_cache()
+        _LOGGER.info(
+            "Purged %s states and %s events in %s batches and %s seconds",
+            progress.states_purged,
+            progress.events_purged,
+            progress.batches,
+            progress.duration,
+        )
+
         if repack:
             # Execute sqlite or postgresql vacuum command to free up space on disk
             if instance.engine.driver in ("pysqlite", "postgresql"):
@@ -80,7 +129,10 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             # Optimize mysql / mariadb tables to free up space on disk
             elif instance.engine.driver in ("mysqldb", "pymysql"):
                 _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+                instance.engine.execute(
+                    "OPTIMIZE TABLE states, state_attributes, events, recorder_runs, "
+                    "statistics_short_term"
+                )
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -99,4 +151,89 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
         _LOGGER.warning("Error purging history: %s", err)
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
+    instance.purge_progress = None
     return True
+
+
+def _purge_states(session, purge_before: datetime) -> int:
+    """Delete the next batch of states last updated before purge_before."""
+    state_ids = [
+        state_id
+        for (state_id,) in session.query(States.state_id)
+        .filter(States.last_updated < purge_before)
+        .order_by(States.state_id)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+    if not state_ids:
+        return 0
+
+    # Newer states may point to the states in this batch
+    session.query(States).filter(States.old_state_id.in_(state_ids)).update(
+        {"old_state_id": None}, synchronize_session=False
+    )
+    return (
+        session.query(States)
+        .filter(States.state_id.between(state_ids[0], state_ids[-1]))
+        .filter(States.last_updated < purge_before)
+        .delete(synchronize_session=False)
+    )
+
+
+def _purge_events(session, purge_before: datetime) -> int:
+    """Delete the next batch of events fired before purge_before."""
+    event_ids = [
+        event_id
+        for (event_id,) in session.query(Events.event_id)
+        .filter(Events.time_fired < purge_before)
+        .order_by(Events.event_id)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+    if not event_ids:
+        return 0
+
+    return (
+        session.query(Events)
+        .filter(Events.event_id.between(event_ids[0], event_ids[-1]))
+        .filter(Events.time_fired < purge_before)
+        .delete(synchronize_session=False)
+    )
+
+
+def _purge_unused_attributes(session) -> int:
+    """Delete the next batch of shared attributes no state uses anymore."""
+    attributes_ids = [
+        attributes_id
+        for (attributes_id,) in session.query(StateAttributes.attributes_id)
+        .outerjoin(States, States.attributes_id == StateAttributes.attributes_id)
+        .filter(States.state_id.is_(None))
+        .order_by(StateAttributes.attributes_id)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+    if not attributes_ids:
+        return 0
+
+    return (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(attributes_ids))
+        .delete(synchronize_session=False)
+    )
+
+
+def _purge_short_term_statistics(session, purge_before: datetime) -> int:
+    """Delete the next batch of five minute statistics before purge_before."""
+    statistics_ids = [
+        statistics_id
+        for (statistics_id,) in session.query(StatisticsShortTerm.id)
+        .filter(StatisticsShortTerm.start < purge_before)
+        .order_by(StatisticsShortTerm.id)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+    if not statistics_ids:
+        return 0
+
+    return (
+        session.query(StatisticsShortTerm)
+        .filter(StatisticsShortTerm.id.between(statistics_ids[0], statistics_ids[-1]))
+        .filter(StatisticsShortTerm.start < purge_before)
+        .delete(synchronize_session=False)
+    )
@@ -0,0 +1,58 @@
+"""Sensor to track the backlog of the recorder."""
+from datetime import timedelta
+
+from homeassistant.helpers.entity import Entity
+
+from .const import DATA_INSTANCE
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Set up the recorder backlog sensor."""
+    if DATA_INSTANCE not in hass.data:
+        return
+
+    async_add_entities([RecorderBacklogSensor(hass.data[DATA_INSTANCE])], True)
+
+
+class RecorderBacklogSensor(Entity):
+    """Entity to represent the number of events waiting to be recorded."""
+
+    def __init__(self, instance):
+        """Initialize the backlog sensor."""
+        self._instance = instance
+        self._info = {}
+
+    @property
+    def name(self):
+        """Return name of entity."""
+        return "Recorder backlog"
+
+    @property
+    def state(self):
+        """Return the number of queued events."""
+        return self._info.get("backlog")
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return "events"
+
+    @property
+    def icon(self):
+        """Return the icon."""
+        return "mdi:database-clock"
+
+    @property
+    def device_state_attributes(self):
+        """Return the write statistics of the recorder."""
+        return {
+            key: value
+            for key, value in self._info.items()
+            if key not in ("backlog", "commit_latency")
+        }
+
+    async def async_update(self):
+        """Update the backlog statistics."""
+        self._info = self._instance.async_backlog_info()
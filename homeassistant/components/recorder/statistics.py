@@ -0,0 +1,265 @@
+"""Roll up numeric states into five minute and hourly statistics."""
+from datetime import datetime, timedelta
+from itertools import groupby
+import math
+from typing import Dict, Iterable, List, Optional
+
+from homeassistant.core import State
+
+from .models import Statistics, StatisticsBase, StatisticsShortTerm
+from .util import execute, session_scope
+
+PERIOD_5MINUTE = "5minute"
+PERIOD_HOUR = "hour"
+
+SHORT_TERM_PERIOD = timedelta(minutes=5)
+LONG_TERM_PERIOD = timedelta(hours=1)
+
+STATISTICS_TABLES = {PERIOD_5MINUTE: StatisticsShortTerm, PERIOD_HOUR: Statistics}
+
+
+def period_start(timestamp: datetime, period: timedelta) -> datetime:
+    """Return the start of the period a timestamp falls in."""
+    seconds = period.total_seconds()
+    return datetime.fromtimestamp(
+        timestamp.timestamp() // seconds * seconds, tz=timestamp.tzinfo
+    )
+
+
+def _numeric_value(state: Optional[State]) -> Optional[float]:
+    """Return the state as a float, None if it is not numeric."""
+    if state is None:
+        return None
+
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+
+    return value if math.isfinite(value) else None
+
+
+class _PeriodAccumulator:
+    """Statistics of one entity for the period that is being compiled.
+
+    The mean is weighted by the time each value was held.
+    """
+
+    __slots__ = ("start", "end", "min", "max", "last", "_area", "_duration", "_since")
+
+    def __init__(self, start: datetime, end: datetime, value: float) -> None:
+        """Initialize the period with the value held at its start."""
+        self.start = start
+        self.end = end
+        self.min = value
+        self.max = value
+        self.last = value
+        self._area = 0.0
+        self._duration = 0.0
+        self._since: Optional[datetime] = None
+
+    @property
+    def holds_value(self) -> bool:
+        """Return if the entity still has a numeric value."""
+        return self._since is not None
+
+    def add(self, value: float, timestamp: datetime) -> None:
+        """Add a value that was set at timestamp."""
+        self.hold_until(timestamp)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.last = value
+        self._since = max(timestamp, self.start)
+
+    def add_period(
+        self, mean: float, min_: float, max_: float, last: float, duration: float
+    ) -> None:
+        """Add the statistics of a shorter period within this period."""
+        self.min = min(self.min, min_)
+        self.max = max(self.max, max_)
+        self.last = last
+        self._area += mean * duration
+        self._duration += duration
+
+    def hold_until(self, timestamp: datetime) -> None:
+        """Account for the last value being held until timestamp."""
+        if self._since is None:
+            return
+
+        timestamp = min(timestamp, self.end)
+        elapsed = (timestamp - self._since).total_seconds()
+        if elapsed > 0:
+            self._area += self.last * elapsed
+            self._duration += elapsed
+            self._since = timestamp
+
+    def release(self, timestamp: datetime) -> None:
+        """Stop holding the last value, the entity is no longer numeric."""
+        self.hold_until(timestamp)
+        self._since = None
+
+    @property
+    def duration(self) -> float:
+        """Return the number of seconds a value was held."""
+        return self._duration
+
+    @property
+    def mean(self) -> float:
+        """Return the time weighted mean."""
+        if not self._duration:
+            return self.last
+        return self._area / self._duration
+
+    def to_row(self, entity_id: str, table) -> StatisticsBase:
+        """Return the statistics as a row of table."""
+        return table(
+            entity_id=entity_id,
+            start=self.start,
+            mean=self.mean,
+            min=self.min,
+            max=self.max,
+            last=self.last,
+        )
+
+
+class StatisticsCompiler:
+    """Compile statistics of numeric entities as their states are recorded.
+
+    This runs in the recorder thread. Five minute periods are compiled
+    from the states, hourly periods from the five minute periods. A
+    period is written once a later state is recorded or the period has
+    passed. Periods that are still open are lost when the recorder stops.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the compiler."""
+        self._short_term: Dict[str, _PeriodAccumulator] = {}
+        self._long_term: Dict[str, _PeriodAccumulator] = {}
+        self._next_period_end: Optional[datetime] = None
+
+    def add_state(
+        self, entity_id: str, state: Optional[State], timestamp: datetime
+    ) -> List[StatisticsBase]:
+        """Add a state of an entity and return the rows of closed periods."""
+        rows: List[StatisticsBase] = []
+        value = _numeric_value(state)
+        accumulator = self._short_term.get(entity_id)
+
+        if accumulator is not None and timestamp >= accumulator.end:
+            self._close_short_term(entity_id, timestamp, rows)
+            accumulator = self._short_term.get(entity_id)
+
+        if value is None:
+            if accumulator is not None:
+                accumulator.release(timestamp)
+            return rows
+
+        if accumulator is None:
+            start = period_start(timestamp, SHORT_TERM_PERIOD)
+            accumulator = self._short_term[entity_id] = _PeriodAccumulator(
+                start, start + SHORT_TERM_PERIOD, value
+            )
+            if self._next_period_end is None:
+                self._next_period_end = accumulator.end
+
+        accumulator.add(value, timestamp)
+        return rows
+
+    def compile(self, now: datetime) -> List[StatisticsBase]:
+        """Return the rows of all periods that ended before now."""
+        rows: List[StatisticsBase] = []
+        if self._next_period_end is None or now < self._next_period_end:
+            return rows
+
+        for entity_id in list(self._short_term):
+            self._close_short_term(entity_id, now, rows)
+
+        # Hours of entities that stopped being numeric before the hour ended
+        for entity_id, accumulator in list(self._long_term.items()):
+            if now >= accumulator.end:
+                rows.append(accumulator.to_row(entity_id, Statistics))
+                del self._long_term[entity_id]
+
+        next_period_start = period_start(now, SHORT_TERM_PERIOD)
+        self._next_period_end = next_period_start + SHORT_TERM_PERIOD
+        return rows
+
+    def _close_short_term(
+        self, entity_id: str, now: datetime, rows: List[StatisticsBase]
+    ) -> None:
+        """Close the periods of an entity that ended before now."""
+        accumulator = self._short_term[entity_id]
+        while now >= accumulator.end:
+            accumulator.hold_until(accumulator.end)
+            rows.append(accumulator.to_row(entity_id, StatisticsShortTerm))
+            self._add_to_long_term(entity_id, accumulator, rows)
+
+            if not accumulator.holds_value:
+                del self._short_term[entity_id]
+                return
+
+            # The last value is carried over into the next period
+            start = accumulator.end
+            next_accumulator = _PeriodAccumulator(
+                start, start + SHORT_TERM_PERIOD, accumulator.last
+            )
+            next_accumulator.add(accumulator.last, start)
+            accumulator = self._short_term[entity_id] = next_accumulator
+
+    def _add_to_long_term(
+        self,
+        entity_id: str,
+        short_term: _PeriodAccumulator,
+        rows: List[StatisticsBase],
+    ) -> None:
+        """Add a closed five minute period to the hourly period."""
+        accumulator = self._long_term.get(entity_id)
+        if accumulator is not None and short_term.start >= accumulator.end:
+            # The end of the hour was missed, the entity was not numeric
+            rows.append(accumulator.to_row(entity_id, Statistics))
+            accumulator = None
+
+        if accumulator is None:
+            start = period_start(short_term.start, LONG_TERM_PERIOD)
+            accumulator = self._long_term[entity_id] = _PeriodAccumulator(
+                start, start + LONG_TERM_PERIOD, short_term.min
+            )
+
+        accumulator.add_period(
+            short_term.mean,
+            short_term.min,
+            short_term.max,
+            short_term.last,
+            short_term.duration,
+        )
+
+        if short_term.end >= accumulator.end:
+            rows.append(accumulator.to_row(entity_id, Statistics))
+            del self._long_term[entity_id]
+
+
+def statistics_during_period(
+    hass,
+    start_time: datetime,
+    end_time: Optional[datetime] = None,
+    entity_ids: Optional[Iterable[str]] = None,
+    period: str = PERIOD_HOUR,
+) -> Dict[str, List[dict]]:
+    """Return the statistics of periods starting during start_time - end_time."""
+    table = STATISTICS_TABLES[period]
+
+    with session_scope(hass=hass) as session:
+        query = session.query(table).filter(table.start >= start_time)
+
+        if end_time is not None:
+            query = query.filter(table.start < end_time)
+
+        if entity_ids is not None:
+            query = query.filter(table.entity_id.in_(list(entity_ids)))
+
+        query = query.order_by(table.entity_id, table.start)
+
+        return {
+            entity_id: [row.to_dict() for row in rows]
+            for entity_id, rows in groupby(execute(query), lambda row: row.entity_id)
+        }
@@ -1,4 +1,5 @@
 """Constants for the Template Platform Components."""
+from datetime import timedelta
 
 CONF_AVAILABILITY_TEMPLATE = "availability_template"
 
@@ -8,6 +9,10 @@ PLATFORM_STORAGE_KEY = "template_platforms"
 
 EVENT_TEMPLATE_RELOADED = "event_template_reloaded"
 
+# Minimum time between renders of templates that iterate all states or a domain
+ALL_STATES_RATE_LIMIT = timedelta(minutes=1)
+DOMAIN_STATES_RATE_LIMIT = timedelta(seconds=1)
+
 PLATFORMS = [
     "alarm_control_panel",
     "binary_sensor",
@@ -18,6 +18,8 @@ from homeassistant.helpers.event import (
 )
 from homeassistant.helpers.template import Template, result_as_boolean
 
+from .const import ALL_STATES_RATE_LIMIT, DOMAIN_STATES_RATE_LIMIT
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -256,7 +258,14 @@ class TemplateEntity(Entity):
     async def _async_template_startup(self, *_) -> None:
         template_var_tups = []
         for template, attributes in self._template_attrs.items():
-            template_var_tups.append(TrackTemplate(template, None))
+            template_var_tups.append(
+                TrackTemplate(
+                    template,
+                    None,
+                    all_states_rate_limit=ALL_STATES_RATE_LIMIT,
+                    domains_rate_limit=DOMAIN_STATES_RATE_LIMIT,
+                )
+            )
             for attribute in attributes:
                 attribute.async_setup()
 
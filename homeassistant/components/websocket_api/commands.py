@@ -1,13 +1,16 @@
 """Commands part of Websocket API."""
 import asyncio
+import fnmatch
 import logging
+import re
+import time
 
 import voluptuous as vol
 
 from homeassistant.auth.permissions.const import CAT_ENTITIES, POLICY_READ
 from homeassistant.components.websocket_api.const import ERR_NOT_FOUND
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
-from homeassistant.core import DOMAIN as HASS_DOMAIN, callback
+from homeassistant.core import DOMAIN as HASS_DOMAIN, callback, split_entity_id
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
@@ -15,10 +18,19 @@ from homeassistant.exceptions import (
     Unauthorized,
 )
 from homeassistant.helpers import config_validation as cv, entity
-from homeassistant.helpers.event import TrackTemplate, async_track_template_result
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    async_track_state_change_event,
+    async_track_template_result,
+)
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.template import Template
-from homeassistant.loader import IntegrationNotFound, async_get_integration
+from homeassistant.loader import (
+    IntegrationNotFound,
+    async_get_integration,
+    get_import_times,
+)
+from homeassistant.setup import async_get_setup_timeline
 
 from . import const, decorators, messages
 
@@ -34,15 +46,19 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_unsubscribe_events)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_get_services)
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_ping)
+    async_reg(hass, handle_supported_features)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_manifest_get)
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_listener_profile)
+    async_reg(hass, handle_startup_timeline)
 
 
 def pong_message(iden):
@@ -78,7 +94,11 @@ def handle_subscribe_events(hass, connection, msg):
             ):
                 return
 
-            connection.send_message(messages.cached_event_message(msg["id"], event))
+            connection.send_state_message(
+                event.data["entity_id"],
+                msg["id"],
+                messages.cached_event_message(msg["id"], event),
+            )
 
     else:
 
@@ -187,6 +207,147 @@ def handle_get_states(hass, connection, msg):
     connection.send_message(messages.result_message(msg["id"], states))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("domains"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("globs"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("compact", default=False): cv.boolean,
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Only the changes of the matching entities are forwarded, in full or
+    as the fields that changed. The result holds their current states.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+    domains = {domain.lower() for domain in msg.get("domains", [])}
+    globs = [re.compile(fnmatch.translate(glob)) for glob in msg.get("globs", [])]
+
+    if not entity_ids and not domains and not globs:
+        connection.send_error(
+            msg["id"],
+            const.ERR_INVALID_FORMAT,
+            "At least one of entity_ids, domains or globs is required",
+        )
+        return
+
+    entity_perm = connection.user.permissions.check_entity
+
+    @callback
+    def _matches(entity_id):
+        """Return if an entity is matched by the domains or globs."""
+        return split_entity_id(entity_id)[0] in domains or any(
+            glob.match(entity_id) for glob in globs
+        )
+
+    @callback
+    def _filter_state_changed(event):
+        """Filter state changes not already tracked by entity id."""
+        entity_id = event.data["entity_id"]
+        return entity_id not in entity_ids and _matches(entity_id)
+
+    @callback
+    def forward_state_changes(event):
+        """Forward state changes of the matching entities to websocket."""
+        if not entity_perm(event.data["entity_id"], POLICY_READ):
+            return
+
+        if msg["compact"]:
+            # Compact messages only describe what changed, they can't replace
+            # each other
+            connection.send_message(
+                messages.event_message(msg["id"], _compact_state_changed(event))
+            )
+            return
+
+        connection.send_state_message(
+            event.data["entity_id"],
+            msg["id"],
+            messages.event_message(msg["id"], event.data),
+        )
+
+    unsubs = []
+    if entity_ids:
+        unsubs.append(
+            async_track_state_change_event(hass, entity_ids, forward_state_changes)
+        )
+    if domains or globs:
+        unsubs.append(
+            hass.bus.async_listen(
+                EVENT_STATE_CHANGED, forward_state_changes, _filter_state_changed
+            )
+        )
+
+    @callback
+    def unsubscribe():
+        """Stop forwarding state changes."""
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+
+    if globs:
+        states = [
+            state
+            for state in hass.states.async_all()
+            if state.entity_id in entity_ids or _matches(state.entity_id)
+        ]
+    else:
+        states = hass.states.async_all(domains)
+        states.extend(
+            state
+            for state in map(hass.states.get, entity_ids)
+            if state is not None and state.domain not in domains
+        )
+
+    connection.send_result(
+        msg["id"],
+        [state for state in states if entity_perm(state.entity_id, POLICY_READ)],
+    )
+
+
+def _compact_state_changed(event):
+    """Return the fields of a state that changed with an event."""
+    entity_id = event.data["entity_id"]
+    old_state = event.data["old_state"]
+    new_state = event.data["new_state"]
+
+    if new_state is None:
+        return {"entity_id": entity_id, "removed": True}
+
+    if old_state is None:
+        return {"entity_id": entity_id, "added": new_state}
+
+    changes = {"last_updated": new_state.last_updated}
+
+    if new_state.state != old_state.state:
+        changes["state"] = new_state.state
+    if new_state.last_changed != old_state.last_changed:
+        changes["last_changed"] = new_state.last_changed
+    if new_state.context is not old_state.context:
+        changes["context"] = new_state.context
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if new_attributes is not old_attributes:
+        attributes = {
+            key: value
+            for key, value in new_attributes.items()
+            if key not in old_attributes or old_attributes[key] != value
+        }
+        if attributes:
+            changes["attributes"] = attributes
+        removed = [key for key in old_attributes if key not in new_attributes]
+        if removed:
+            changes["removed_attributes"] = removed
+
+    return {"entity_id": entity_id, "changed": changes}
+
+
 @decorators.websocket_command({vol.Required("type"): "get_services"})
 @decorators.async_response
 async def handle_get_services(hass, connection, msg):
@@ -239,6 +400,16 @@ def handle_ping(hass, connection, msg):
     connection.send_message(pong_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {vol.Required("type"): "supported_features", vol.Required("features"): {str: int}}
+)
+def handle_supported_features(hass, connection, msg):
+    """Handle setting supported features."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "render_template",
@@ -405,3 +576,42 @@ async def handle_test_condition(hass, connection, msg):
     connection.send_result(
         msg["id"], {"result": check_condition(hass, msg.get("variables"))}
     )
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "listener_profile"})
+@decorators.require_admin
+def handle_listener_profile(hass, connection, msg):
+    """Handle listener profile command."""
+    profiler = hass.listener_profiler
+
+    if profiler is None:
+        connection.send_result(msg["id"], {"enabled": False, "listeners": []})
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            "enabled": True,
+            "duration": time.monotonic() - profiler.started,
+            "listeners": profiler.async_report(),
+        },
+    )
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "startup_timeline"})
+@decorators.require_admin
+def handle_startup_timeline(hass, connection, msg):
+    """Handle startup timeline command."""
+    timeline = async_get_setup_timeline(hass)
+
+    connection.send_result(
+        msg["id"],
+        {
+            "finished": timeline.finished,
+            "integrations": timeline.async_integrations(),
+            "critical_path": timeline.async_critical_path(),
+            "imports": get_import_times(hass),
+        },
+    )
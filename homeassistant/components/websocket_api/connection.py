@@ -27,6 +27,7 @@ class ActiveConnection:
             self.refresh_token_id = None
 
         self.subscriptions: Dict[Hashable, Callable[[], Any]] = {}
+        self.supported_features: Dict[str, int] = {}
         self.last_id = 0
 
     def context(self, msg):
@@ -41,6 +42,19 @@ class ActiveConnection:
         """Send a result message."""
         self.send_message(messages.result_message(msg_id, result))
 
+    @callback
+    def send_state_message(self, entity_id: str, msg_id: int, message: Any) -> None:
+        """Send a message with the latest state of an entity.
+
+        If the client enabled coalescing states, a message that is still
+        waiting to be written for the same entity and subscription is
+        replaced instead of queueing another one.
+        """
+        if self.supported_features.get(const.FEATURE_COALESCE_STATES):
+            self.send_message(message, coalesce_key=(msg_id, entity_id))
+        else:
+            self.send_message(message)
+
     async def send_big_result(self, msg_id, result):
         """Send a result message that would be expensive to JSON serialize."""
         content = await self.hass.async_add_executor_job(
@@ -20,6 +20,12 @@ PENDING_MSG_PEAK = 512
 PENDING_MSG_PEAK_TIME = 5
 MAX_PENDING_MSG = 2048
 
+# Features a client can enable with the supported_features command
+# Send the messages that are waiting to be written as one array
+FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+# Only send the latest pending state of an entity per subscription
+FEATURE_COALESCE_STATES = "coalesce_states"
+
 ERR_ID_REUSE = "id_reuse"
 ERR_INVALID_FORMAT = "invalid_format"
 ERR_NOT_FOUND = "not_found"
@@ -2,7 +2,7 @@
 import asyncio
 from contextlib import suppress
 import logging
-from typing import Optional
+from typing import Any, Dict, Hashable, Optional
 
 from aiohttp import WSMsgType, web
 import async_timeout
@@ -16,6 +16,7 @@ from .auth import AuthPhase, auth_required_message
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -41,6 +42,16 @@ class WebsocketAPIView(HomeAssistantView):
         return await WebSocketHandler(request.app["hass"], request).async_handle()
 
 
+class _CoalescedMessage:
+    """Placeholder in the write queue for the latest message of a key."""
+
+    __slots__ = ["key"]
+
+    def __init__(self, key: Hashable) -> None:
+        """Initialize the placeholder."""
+        self.key = key
+
+
 class WebSocketHandler:
     """Handle an active websocket client connection."""
 
@@ -50,6 +61,9 @@ class WebSocketHandler:
         self.request = request
         self.wsock: Optional[web.WebSocketResponse] = None
         self._to_write: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MSG)
+        # Latest message of each coalesce key that is waiting in the queue
+        self._coalesced: Dict[Hashable, Any] = {}
+        self._connection = None
         self._handle_task = None
         self._writer_task = None
         self._logger = logging.getLogger("{}.connection.{}".format(__name__, id(self)))
@@ -59,31 +73,69 @@ class WebSocketHandler:
         """Write outgoing messages."""
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
-            while not self.wsock.closed:
+            stop = False
+            while not self.wsock.closed and not stop:
                 message = await self._to_write.get()
                 if message is None:
                     break
 
-                self._logger.debug("Sending %s", message)
+                to_send = [message]
+
+                if (
+                    self._connection is not None
+                    and self._connection.supported_features.get(
+                        FEATURE_COALESCE_MESSAGES
+                    )
+                ):
+                    while not self._to_write.empty():
+                        message = self._to_write.get_nowait()
+                        if message is None:
+                            stop = True
+                            break
+                        to_send.append(message)
 
-                if not isinstance(message, str):
-                    message = message_to_json(message)
+                serialized = [self._serialize(message) for message in to_send]
 
-                await self.wsock.send_str(message)
+                if len(serialized) == 1:
+                    await self.wsock.send_str(serialized[0])
+                else:
+                    await self.wsock.send_str(f"[{','.join(serialized)}]")
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub:
             self._peak_checker_unsub()
             self._peak_checker_unsub = None
 
+    def _serialize(self, message):
+        """Return a message from the write queue as JSON."""
+        if isinstance(message, _CoalescedMessage):
+            message = self._coalesced.pop(message.key)
+
+        self._logger.debug("Sending %s", message)
+
+        if not isinstance(message, str):
+            message = message_to_json(message)
+
+        return message
+
     @callback
-    def _send_message(self, message):
+    def _send_message(self, message, coalesce_key=None):
         """Send a message to the client.
 
         Closes connection if the client is not reading the messages.
 
+        A message with a coalesce_key replaces the message with the same
+        key that is still waiting to be written.
+
         Async friendly.
         """
+        if coalesce_key is not None:
+            pending = coalesce_key in self._coalesced
+            self._coalesced[coalesce_key] = message
+            if pending:
+                return
+            message = _CoalescedMessage(coalesce_key)
+
         try:
             self._to_write.put_nowait(message)
         except asyncio.QueueFull:
@@ -175,7 +227,7 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
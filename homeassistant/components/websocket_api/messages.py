@@ -2,7 +2,7 @@
 
 from functools import lru_cache
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Union
 
 import voluptuous as vol
 
@@ -27,6 +27,11 @@ MINIMAL_MESSAGE_SCHEMA = vol.Schema(
 # Base schema to extend by message handlers
 BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 
+# The id is the first key of a message, so the first occurrence of the
+# serialized placeholder is where the id of the subscription goes
+IDEN_TEMPLATE = "__IDEN__"
+IDEN_JSON_TEMPLATE = f'"{IDEN_TEMPLATE}"'
+
 
 def result_message(iden: int, result: Any = None) -> Dict:
     """Return a success result message."""
@@ -43,22 +48,28 @@ def error_message(iden: int, code: str, message: str) -> Dict:
     }
 
 
-def event_message(iden: int, event: Any) -> Dict:
+def event_message(iden: Union[int, str], event: Any) -> Dict:
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
 
 
-@lru_cache(maxsize=128)
 def cached_event_message(iden: int, event: Event) -> str:
     """Return an event message.
 
-    Serialize to json once per message.
+    Serialize to json once per event.
 
     Since we can have many clients connected that are
     all getting many of the same events (mostly state changed)
-    we can avoid serializing the same data for each connection.
+    we can avoid serializing the same data for each connection
+    and only splice in the id of the subscription.
     """
-    return message_to_json(event_message(iden, event))
+    return _cached_event_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_event_message(event: Event) -> str:
+    """Return an event message with a placeholder for the id."""
+    return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
 def message_to_json(message: Any) -> str:
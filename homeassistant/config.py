@@ -57,7 +57,7 @@ from homeassistant.requirements import (
 )
 from homeassistant.util.package import is_docker_env
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
-from homeassistant.util.yaml import SECRET_YAML, load_yaml
+from homeassistant.util.yaml import SECRET_YAML, load_yaml, prune_parsed_cache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -312,6 +312,8 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> Dict:
     config = await hass.loop.run_in_executor(
         None, load_yaml_config_file, hass.config.path(YAML_CONFIG_FILE)
     )
+    # Forget parsed files that are no longer part of the configuration
+    prune_parsed_cache()
     core_config = config.get(CONF_CORE, {})
     await merge_packages_config(hass, config, core_config.get(CONF_PACKAGES, {}))
     return config
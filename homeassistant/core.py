@@ -14,7 +14,7 @@ import os
 import pathlib
 import re
 import threading
-from time import monotonic
+from time import monotonic, perf_counter
 from types import MappingProxyType
 from typing import (
     TYPE_CHECKING,
@@ -28,6 +28,7 @@ from typing import (
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -72,6 +73,7 @@ from homeassistant.exceptions import (
 from homeassistant.util import location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
+from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.thread import fix_threading_exception_logging
 from homeassistant.util.timeout import TimeoutManager
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
@@ -93,6 +95,7 @@ _UNDEF: dict = {}
 CALLABLE_T = TypeVar("CALLABLE_T", bound=Callable)
 CALLBACK_TYPE = Callable[[], None]
 # pylint: enable=invalid-name
+_FilterableListener = Tuple[Callable, Optional[Callable[["Event"], bool]]]
 
 CORE_STORAGE_KEY = "core.config"
 CORE_STORAGE_VERSION = 1
@@ -189,6 +192,8 @@ class HomeAssistant:
         self._stopped: Optional[asyncio.Event] = None
         # Timeout handler for Core/Helper namespace
         self.timeout: TimeoutManager = TimeoutManager()
+        # Records listener calls while listener profiling is enabled
+        self.listener_profiler: Optional[ListenerProfiler] = None
 
     @property
     def is_running(self) -> bool:
@@ -586,13 +591,149 @@ class Event:
         )
 
 
+def _listener_name(listener: Callable) -> str:
+    """Return the dotted name of a listener."""
+    while isinstance(listener, functools.partial):
+        listener = listener.func
+    module = getattr(listener, "__module__", None) or "unknown"
+    name = getattr(listener, "__qualname__", None) or repr(listener)
+    return f"{module}.{name}"
+
+
+def _listener_module_integration(listener: Callable) -> Optional[str]:
+    """Return the integration of the module a listener was defined in."""
+    while isinstance(listener, functools.partial):
+        listener = listener.func
+    parts = (getattr(listener, "__module__", None) or "").split(".")
+    if parts[:2] == ["homeassistant", "components"] and len(parts) > 2:
+        return parts[2]
+    if parts[0] == "custom_components" and len(parts) > 1:
+        return parts[1]
+    return None
+
+
+@attr.s(slots=True)
+class ListenerStats:
+    """Calls and execution time of a listener."""
+
+    listener: str = attr.ib()
+    integration: Optional[str] = attr.ib()
+    calls: int = attr.ib(default=0)
+    total_time: float = attr.ib(default=0.0)
+    max_time: float = attr.ib(default=0.0)
+
+    def record(self, duration: float) -> None:
+        """Record a call that took duration seconds."""
+        self.calls += 1
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the stats."""
+        return {
+            "listener": self.listener,
+            "integration": self.integration,
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "max_time": self.max_time,
+        }
+
+
+class ListenerProfiler:
+    """Record how often listeners are called and how long they run.
+
+    Profiling is enabled by assigning a profiler to
+    ``hass.listener_profiler``. Listeners are attributed to the
+    integration that registered them while profiling was enabled and
+    otherwise to the integration they were defined in. The time of
+    coroutine listeners is the time until they finish, including the
+    time they spend waiting.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self.started = monotonic()
+        self._stats: Dict[Callable, ListenerStats] = {}
+        self._integrations: Dict[Callable, str] = {}
+
+    @callback
+    def async_register(self, listener: Callable) -> None:
+        """Remember the integration that is registering a listener."""
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.helpers.frame import (
+            MissingIntegrationFrame,
+            get_integration_frame,
+        )
+
+        try:
+            _, integration, _ = get_integration_frame()
+        except MissingIntegrationFrame:
+            return
+
+        self._integrations[listener] = integration
+
+    @callback
+    def async_wrap(self, listener: Callable) -> Callable:
+        """Return a listener that records its calls in the profile.
+
+        The returned listener is scheduled the same way as listener.
+        """
+        stats = self._stats.get(listener)
+        if stats is None:
+            stats = self._stats[listener] = ListenerStats(
+                _listener_name(listener),
+                self._integrations.get(listener)
+                or _listener_module_integration(listener),
+            )
+
+        check_listener = listener
+        while isinstance(check_listener, functools.partial):
+            check_listener = check_listener.func
+
+        if asyncio.iscoroutinefunction(check_listener):
+
+            async def profiled_coroutine(*args: Any) -> Any:
+                """Run the coroutine listener and record its duration."""
+                start = perf_counter()
+                try:
+                    return await listener(*args)
+                finally:
+                    stats.record(perf_counter() - start)  # type: ignore
+
+            return profiled_coroutine
+
+        def profiled(*args: Any) -> Any:
+            """Run the listener and record its duration."""
+            start = perf_counter()
+            try:
+                return listener(*args)
+            finally:
+                stats.record(perf_counter() - start)  # type: ignore
+
+        if is_callback(check_listener):
+            return callback(profiled)
+        return profiled
+
+    @callback
+    def async_report(self) -> List[Dict[str, Any]]:
+        """Return the stats of all listeners, slowest in total first."""
+        return [
+            stats.as_dict()
+            for stats in sorted(
+                self._stats.values(), key=lambda stats: stats.total_time, reverse=True
+            )
+        ]
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: Dict[str, List[Callable]] = {}
+        self._listeners: Dict[str, List[_FilterableListener]] = {}
         self._hass = hass
+        self._first_listener_actions: Dict[str, List[CALLBACK_TYPE]] = {}
 
     @callback
     def async_listeners(self) -> Dict[str, int]:
@@ -602,6 +743,34 @@ class EventBus:
         """
         return {key: len(self._listeners[key]) for key in self._listeners}
 
+    @callback
+    def async_has_listeners(self, event_type: str) -> bool:
+        """Return if there are listeners for a specific event type.
+
+        This method must be run in the event loop.
+        """
+        return event_type in self._listeners
+
+    @callback
+    def async_on_first_listener(
+        self, event_type: str, action: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call an action whenever an event type gets its first listener.
+
+        Returns function to remove the action.
+
+        This method must be run in the event loop.
+        """
+        actions = self._first_listener_actions.setdefault(event_type, [])
+        actions.append(action)
+
+        @callback
+        def remove_action() -> None:
+            """Remove the action."""
+            actions.remove(action)
+
+        return remove_action
+
     @property
     def listeners(self) -> Dict[str, int]:
         """Return dictionary with events and the number of listeners."""
@@ -631,22 +800,46 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
-
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        listeners = self._listeners.get(event_type)
+
+        # EVENT_HOMEASSISTANT_CLOSE and EVENT_TIME_CHANGED should go only
+        # to their own listeners
+        match_all_listeners = (
+            self._listeners.get(MATCH_ALL)
+            if event_type not in (EVENT_HOMEASSISTANT_CLOSE, EVENT_TIME_CHANGED)
+            else None
+        )
 
         event = Event(event_type, event_data, origin, None, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
-            return
+        if match_all_listeners:
+            self._async_dispatch(match_all_listeners, event)
+
+        if listeners:
+            self._async_dispatch(listeners, event)
 
-        for func in listeners:
+    @callback
+    def _async_dispatch(
+        self, listeners: List[_FilterableListener], event: Event
+    ) -> None:
+        """Schedule the listeners whose filter accepts the event.
+
+        This method must be run in the event loop.
+        """
+        profiler = self._hass.listener_profiler
+        for func, event_filter in listeners:
+            if event_filter is not None:
+                try:
+                    if not event_filter(event):
+                        continue
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error in event filter")
+                    continue
+            if profiler is not None:
+                func = profiler.async_wrap(func)
             self._hass.async_add_job(func, event)
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
@@ -666,22 +859,50 @@ class EventBus:
         return remove_listener
 
     @callback
-    def async_listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
+    def async_listen(
+        self,
+        event_type: str,
+        listener: Callable,
+        event_filter: Optional[Callable[[Event], bool]] = None,
+    ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
         To listen to all events specify the constant ``MATCH_ALL``
-        as event_type.
+        as event_type. Time changed events are only sent to listeners
+        that listen for EVENT_TIME_CHANGED.
+
+        An optional event_filter, which must be a callable decorated with
+        @callback that returns a boolean, is run inline when the event
+        fires and determines if the listener should be scheduled.
 
         This method must be run in the event loop.
         """
-        if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
-        else:
-            self._listeners[event_type] = [listener]
+        if event_filter is not None and not is_callback(event_filter):
+            raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+
+        if self._hass.listener_profiler is not None:
+            self._hass.listener_profiler.async_register(listener)
+
+        return self._async_listen_filterable(event_type, (listener, event_filter))
+
+    @callback
+    def _async_listen_filterable(
+        self, event_type: str, filterable_listener: _FilterableListener
+    ) -> CALLBACK_TYPE:
+        """Register a listener/filter pair for an event type.
+
+        This method must be run in the event loop.
+        """
+        listeners = self._listeners.setdefault(event_type, [])
+        listeners.append(filterable_listener)
+
+        if len(listeners) == 1:
+            for action in self._first_listener_actions.get(event_type, ()):
+                action()
 
         def remove_listener() -> None:
             """Remove the listener."""
-            self._async_remove_listener(event_type, listener)
+            self._async_remove_listener(event_type, filterable_listener)
 
         return remove_listener
 
@@ -726,19 +947,23 @@ class EventBus:
             # multiple times as well.
             # This will make sure the second time it does nothing.
             setattr(onetime_listener, "run", True)
-            self._async_remove_listener(event_type, onetime_listener)
+            self._async_remove_listener(event_type, filterable_listener)
             self._hass.async_run_job(listener, event)
 
-        return self.async_listen(event_type, onetime_listener)
+        filterable_listener: _FilterableListener = (onetime_listener, None)
+
+        return self._async_listen_filterable(event_type, filterable_listener)
 
     @callback
-    def _async_remove_listener(self, event_type: str, listener: Callable) -> None:
+    def _async_remove_listener(
+        self, event_type: str, filterable_listener: _FilterableListener
+    ) -> None:
         """Remove a listener of a specific event_type.
 
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            self._listeners[event_type].remove(filterable_listener)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
@@ -746,7 +971,9 @@ class EventBus:
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
-            _LOGGER.warning("Unable to remove unknown listener %s", listener)
+            _LOGGER.warning(
+                "Unable to remove unknown listener %s", filterable_listener[0]
+            )
 
 
 class State:
@@ -800,7 +1027,11 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        if isinstance(attributes, ReadOnlyDict):
+            # Already read-only, share it with the state it came from
+            self.attributes = attributes
+        else:
+            self.attributes = ReadOnlyDict(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
@@ -884,12 +1115,19 @@ class State:
         )
 
 
+def _unique_domains(domain_filter: Iterable[str]) -> Iterable[str]:
+    """Return the lowercase domains of a filter without duplicates, in order."""
+    return dict.fromkeys(domain.lower() for domain in domain_filter)
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: Dict[str, State] = {}
+        # Domain -> entity_id -> state, kept in sync with _states
+        self._domain_index: Dict[str, Dict[str, State]] = {}
         self._bus = bus
         self._loop = loop
 
@@ -906,18 +1144,21 @@ class StateMachine:
     ) -> List[str]:
         """List of entity ids that are being tracked.
 
+        With several domains, the entity ids are grouped per domain in the
+        order the domains are given.
+
         This method must be run in the event loop.
         """
         if domain_filter is None:
             return list(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), ()))
 
         return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
+            entity_id
+            for domain in _unique_domains(domain_filter)
+            for entity_id in self._domain_index.get(domain, ())
         ]
 
     @callback
@@ -932,10 +1173,11 @@ class StateMachine:
             return len(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return len(self._domain_index.get(domain_filter.lower(), ()))
 
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
+        return sum(
+            len(self._domain_index.get(domain, ()))
+            for domain in _unique_domains(domain_filter)
         )
 
     def all(self, domain_filter: Optional[Union[str, Iterable]] = None) -> List[State]:
@@ -950,16 +1192,21 @@ class StateMachine:
     ) -> List[State]:
         """Create a list of all states matching the filter.
 
+        With several domains, the states are grouped per domain in the
+        order the domains are given.
+
         This method must be run in the event loop.
         """
         if domain_filter is None:
             return list(self._states.values())
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), {}).values())
 
         return [
-            state for state in self._states.values() if state.domain in domain_filter
+            state
+            for domain in _unique_domains(domain_filter)
+            for state in self._domain_index.get(domain, {}).values()
         ]
 
     def get(self, entity_id: str) -> Optional[State]:
@@ -1000,6 +1247,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._domain_index[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domain_index[old_state.domain]
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1038,7 +1290,7 @@ class StateMachine:
         self,
         entity_id: str,
         new_state: str,
-        attributes: Optional[Dict] = None,
+        attributes: Optional[Mapping] = None,
         force_update: bool = False,
         context: Optional[Context] = None,
     ) -> None:
@@ -1061,7 +1313,9 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            same_attr = (
+                attributes is old_state.attributes or old_state.attributes == attributes
+            )
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
@@ -1072,6 +1326,7 @@ class StateMachine:
 
         state = State(entity_id, new_state, attributes, last_changed, None, context)
         self._states[entity_id] = state
+        self._domain_index.setdefault(state.domain, {})[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -1395,6 +1650,9 @@ class Config:
         # If True, pip install is skipped for requirements on startup
         self.skip_pip: bool = False
 
+        # If True, platforms imported on first use are imported once started
+        self.prewarm_platforms: bool = False
+
         # List of loaded components
         self.components: Set[str] = set()
 
@@ -1626,8 +1884,12 @@ class Config:
 
 
 def _async_create_timer(hass: HomeAssistant) -> None:
-    """Create a timer that will start on HOMEASSISTANT_START."""
+    """Create a timer that will start on HOMEASSISTANT_START.
+
+    The timer only ticks while something listens for time changed events.
+    """
     handle = None
+    stopped = False
     timer_context = Context()
 
     def schedule_tick(now: datetime.datetime) -> None:
@@ -1641,6 +1903,8 @@ def _async_create_timer(hass: HomeAssistant) -> None:
     @callback
     def fire_time_event(target: float) -> None:
         """Fire next time event."""
+        nonlocal handle
+
         now = dt_util.utcnow()
 
         hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: now}, context=timer_context)
@@ -1652,15 +1916,29 @@ def _async_create_timer(hass: HomeAssistant) -> None:
                 EVENT_TIMER_OUT_OF_SYNC, {ATTR_SECONDS: late}, context=timer_context
             )
 
-        schedule_tick(now)
+        if hass.bus.async_has_listeners(EVENT_TIME_CHANGED):
+            schedule_tick(now)
+        else:
+            handle = None
+
+    @callback
+    def start_timer() -> None:
+        """Start ticking when time changed events are listened for again."""
+        if handle is None and not stopped:
+            schedule_tick(dt_util.utcnow())
 
     @callback
     def stop_timer(_: Event) -> None:
         """Stop the timer."""
+        nonlocal stopped
+
+        stopped = True
         if handle is not None:
             handle.cancel()
 
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, stop_timer)
+    hass.bus.async_on_first_listener(EVENT_TIME_CHANGED, start_timer)
 
     _LOGGER.info("Timer:starting")
-    schedule_tick(dt_util.utcnow())
+    if hass.bus.async_has_listeners(EVENT_TIME_CHANGED):
+        start_timer()
@@ -32,6 +32,7 @@ from homeassistant.helpers.event import Event, async_track_entity_registry_updat
 from homeassistant.helpers.typing import StateType
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util, ensure_unique_string, slugify
+from homeassistant.util.read_only_dict import ReadOnlyDict
 
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
@@ -123,6 +124,13 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _added = False
 
+    # Attributes of the last write, shared with the state it created
+    _last_attributes: Optional[ReadOnlyDict] = None
+
+    # Registry and customize overrides of the state attributes
+    _static_overrides: Optional[Dict[str, Any]] = None
+    _static_overrides_customize: Optional[Any] = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -326,13 +334,11 @@ class Entity(ABC):
         if unit_of_measurement is not None:
             attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
 
-        entry = self.registry_entry
-        # pylint: disable=consider-using-ternary
-        name = (entry and entry.name) or self.name
+        name = self.name
         if name is not None:
             attr[ATTR_FRIENDLY_NAME] = name
 
-        icon = (entry and entry.icon) or self.icon
+        icon = self.icon
         if icon is not None:
             attr[ATTR_ICON] = icon
 
@@ -377,10 +383,9 @@ class Entity(ABC):
                 extra,
             )
 
-        # Overwrite properties that have been set in the config file.
-        assert self.hass is not None
-        if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+        # Overwrite properties that have been set in the registry or the
+        # config file.
+        attr.update(self._async_static_overrides())
 
         # Convert temperature if we detect one
         try:
@@ -405,10 +410,50 @@ class Entity(ABC):
             self._context = None
             self._context_set = None
 
+        # Hand over the previous attributes when only the state changed,
+        # so the state machine can compare them by identity.
+        if attr != self._last_attributes:
+            self._last_attributes = ReadOnlyDict(attr)
+
         self.hass.states.async_set(
-            self.entity_id, state, attr, self.force_update, self._context
+            self.entity_id,
+            state,
+            self._last_attributes,
+            self.force_update,
+            self._context,
         )
 
+    @callback
+    def _async_static_overrides(self) -> Dict[str, Any]:
+        """Return the attributes overridden by the registry and customize.
+
+        They are cached until the registry entry is updated or customize is
+        reloaded. Name, icon, unit, device class and supported features of
+        the entity itself are read on every write, since many integrations
+        compute them from the device state.
+        """
+        assert self.hass is not None
+        customize = self.hass.data.get(DATA_CUSTOMIZE)
+
+        if (
+            self._static_overrides is not None
+            and self._static_overrides_customize is customize
+        ):
+            return self._static_overrides
+
+        overrides: Dict[str, Any] = {}
+        entry = self.registry_entry
+        if entry is not None and entry.name:
+            overrides[ATTR_FRIENDLY_NAME] = entry.name
+        if entry is not None and entry.icon:
+            overrides[ATTR_ICON] = entry.icon
+        if customize is not None:
+            overrides.update(customize.get(self.entity_id))
+
+        self._static_overrides = overrides
+        self._static_overrides_customize = customize
+        return overrides
+
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
 
@@ -559,6 +604,7 @@ class Entity(ABC):
         Not to be extended by integrations.
         """
         assert self.hass is not None
+        self._static_overrides = None
 
         if self.platform:
             info = {"domain": self.platform.platform_name}
@@ -606,6 +652,7 @@ class Entity(ABC):
         ent_reg = await self.hass.helpers.entity_registry.async_get_registry()
         old = self.registry_entry
         self.registry_entry = ent_reg.async_get(data["entity_id"])
+        self._static_overrides = None
         assert self.registry_entry is not None
 
         if self.registry_entry.disabled_by is not None:
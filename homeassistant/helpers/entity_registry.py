@@ -125,6 +125,8 @@ class EntityRegistry:
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
         self._index: Dict[Tuple[str, str, str], str] = {}
+        self._device_index: Dict[str, Dict[str, RegistryEntry]] = {}
+        self._config_entry_index: Dict[str, Dict[str, RegistryEntry]] = {}
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_removed
@@ -134,9 +136,11 @@ class EntityRegistry:
     def async_get_device_class_lookup(self, domain_device_classes: set) -> dict:
         """Return a lookup for the device class by domain."""
         lookup: Dict[str, Dict[Tuple[Any, Any], str]] = {}
-        for entity in self.entities.values():
-            if not entity.device_id:
-                continue
+        for entity in (
+            entity
+            for entries in self._device_index.values()
+            for entity in entries.values()
+        ):
             domain_device_class = (entity.domain, entity.device_class)
             if domain_device_class not in domain_device_classes:
                 continue
@@ -477,11 +481,7 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
+        for entity_id in list(self._config_entry_index.get(config_entry, ())):
             self.async_remove(entity_id)
 
     def _register_entry(self, entry: RegistryEntry) -> None:
@@ -490,6 +490,12 @@ class EntityRegistry:
 
     def _add_index(self, entry: RegistryEntry) -> None:
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        if entry.device_id:
+            self._device_index.setdefault(entry.device_id, {})[entry.entity_id] = entry
+        if entry.config_entry_id:
+            self._config_entry_index.setdefault(entry.config_entry_id, {})[
+                entry.entity_id
+            ] = entry
 
     def _unregister_entry(self, entry: RegistryEntry) -> None:
         self._remove_index(entry)
@@ -497,13 +503,29 @@ class EntityRegistry:
 
     def _remove_index(self, entry: RegistryEntry) -> None:
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
+        if entry.device_id:
+            _remove_from_lookup(self._device_index, entry.device_id, entry)
+        if entry.config_entry_id:
+            _remove_from_lookup(self._config_entry_index, entry.config_entry_id, entry)
 
     def _rebuild_index(self) -> None:
         self._index = {}
+        self._device_index = {}
+        self._config_entry_index = {}
         for entry in self.entities.values():
             self._add_index(entry)
 
 
+def _remove_from_lookup(
+    lookup: Dict[str, Dict[str, RegistryEntry]], key: str, entry: RegistryEntry
+) -> None:
+    """Remove an entry from a reverse index."""
+    entries = lookup[key]
+    del entries[entry.entity_id]
+    if not entries:
+        del lookup[key]
+
+
 @singleton(DATA_REGISTRY)
 async def async_get_registry(hass: HomeAssistantType) -> EntityRegistry:
     """Create entity registry."""
@@ -517,9 +539,8 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
-    return [
-        entry for entry in registry.entities.values() if entry.device_id == device_id
-    ]
+    # pylint: disable=protected-access
+    return list(registry._device_index.get(device_id, {}).values())
 
 
 @callback
@@ -527,11 +548,8 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    # pylint: disable=protected-access
+    return list(registry._config_entry_index.get(config_entry_id, {}).values())
 
 
 async def _async_migrate(entities: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
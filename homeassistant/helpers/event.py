@@ -61,6 +61,8 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TIME_WHEEL = "track_time_wheel"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -88,10 +90,15 @@ class TrackTemplate:
 
     The template is template to calculate.
     The variables are variables to pass to the template.
+    The all_states_rate_limit and domains_rate_limit are the minimum
+    time between re-renders caused by changes to states the template
+    only tracks because it iterates all states or a whole domain.
     """
 
     template: Template
     variables: TemplateVarsType
+    all_states_rate_limit: Optional[timedelta] = None
+    domains_rate_limit: Optional[timedelta] = None
 
 
 @dataclass
@@ -137,6 +144,21 @@ def threaded_listener_factory(async_factory: Callable[..., Any]) -> CALLBACK_TYP
     return factory
 
 
+@callback
+def _async_register_listener(hass: HomeAssistant, action: Callable) -> None:
+    """Attribute a listener to its integration while profiling listeners."""
+    if hass.listener_profiler is not None:
+        hass.listener_profiler.async_register(action)
+
+
+@callback
+def _async_run_listener(hass: HomeAssistant, action: Callable, *args: Any) -> None:
+    """Run a listener, recording the call while profiling listeners."""
+    if hass.listener_profiler is not None:
+        action = hass.listener_profiler.async_wrap(action)
+    hass.async_run_job(action, *args)
+
+
 @callback
 @bind_hass
 def async_track_state_change(
@@ -232,10 +254,16 @@ def async_track_state_change_event(
     do a fast dict lookup to route events.
     """
 
+    _async_register_listener(hass, action)
     entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
 
     if TRACK_STATE_CHANGE_LISTENER not in hass.data:
 
+        @callback
+        def _async_state_change_filter(event: Event) -> bool:
+            """Filter state changes by entity_id."""
+            return event.data.get("entity_id") in entity_callbacks
+
         @callback
         def _async_state_change_dispatcher(event: Event) -> None:
             """Dispatch state changes by entity_id."""
@@ -246,14 +274,16 @@ def async_track_state_change_event(
 
             for action in entity_callbacks[entity_id][:]:
                 try:
-                    hass.async_run_job(action, event)
+                    _async_run_listener(hass, action, event)
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception(
                         "Error while processing state changed for %s", entity_id
                     )
 
         hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED, _async_state_change_dispatcher
+            EVENT_STATE_CHANGED,
+            _async_state_change_dispatcher,
+            event_filter=_async_state_change_filter,
         )
 
     entity_ids = _async_string_to_lower_list(entity_ids)
@@ -308,10 +338,17 @@ def async_track_entity_registry_updated_event(
     Similar to async_track_state_change_event.
     """
 
+    _async_register_listener(hass, action)
     entity_callbacks = hass.data.setdefault(TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS, {})
 
     if TRACK_ENTITY_REGISTRY_UPDATED_LISTENER not in hass.data:
 
+        @callback
+        def _async_entity_registry_updated_filter(event: Event) -> bool:
+            """Filter entity registry updates by entity_id."""
+            entity_id = event.data.get("old_entity_id", event.data["entity_id"])
+            return entity_id in entity_callbacks
+
         @callback
         def _async_entity_registry_updated_dispatcher(event: Event) -> None:
             """Dispatch entity registry updates by entity_id."""
@@ -322,7 +359,7 @@ def async_track_entity_registry_updated_event(
 
             for action in entity_callbacks[entity_id][:]:
                 try:
-                    hass.async_run_job(action, event)
+                    _async_run_listener(hass, action, event)
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception(
                         "Error while processing entity registry update for %s",
@@ -330,7 +367,9 @@ def async_track_entity_registry_updated_event(
                     )
 
         hass.data[TRACK_ENTITY_REGISTRY_UPDATED_LISTENER] = hass.bus.async_listen(
-            EVENT_ENTITY_REGISTRY_UPDATED, _async_entity_registry_updated_dispatcher
+            EVENT_ENTITY_REGISTRY_UPDATED,
+            _async_entity_registry_updated_dispatcher,
+            event_filter=_async_entity_registry_updated_filter,
         )
 
     entity_ids = _async_string_to_lower_list(entity_ids)
@@ -352,6 +391,15 @@ def async_track_entity_registry_updated_event(
     return remove_listener
 
 
+@callback
+def _async_domain_has_listeners(event: Event, callbacks: Dict[str, List]) -> bool:
+    """Return if an event's entity domain has listeners."""
+    return (
+        MATCH_ALL in callbacks
+        or split_entity_id(event.data["entity_id"])[0] in callbacks
+    )
+
+
 @callback
 def _async_dispatch_domain_event(
     hass: HomeAssistant, event: Event, callbacks: Dict[str, List]
@@ -365,7 +413,7 @@ def _async_dispatch_domain_event(
 
     for action in listeners:
         try:
-            hass.async_run_job(action, event)
+            _async_run_listener(hass, action, event)
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception(
                 "Error while processing event %s for domain %s", event, domain
@@ -380,10 +428,18 @@ def async_track_state_added_domain(
 ) -> Callable[[], None]:
     """Track state change events when an entity is added to domains."""
 
+    _async_register_listener(hass, action)
     domain_callbacks = hass.data.setdefault(TRACK_STATE_ADDED_DOMAIN_CALLBACKS, {})
 
     if TRACK_STATE_ADDED_DOMAIN_LISTENER not in hass.data:
 
+        @callback
+        def _async_state_change_filter(event: Event) -> bool:
+            """Filter state changes of entities added to tracked domains."""
+            return event.data.get("old_state") is None and _async_domain_has_listeners(
+                event, domain_callbacks
+            )
+
         @callback
         def _async_state_change_dispatcher(event: Event) -> None:
             """Dispatch state changes by entity_id."""
@@ -393,7 +449,9 @@ def async_track_state_added_domain(
             _async_dispatch_domain_event(hass, event, domain_callbacks)
 
         hass.data[TRACK_STATE_ADDED_DOMAIN_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED, _async_state_change_dispatcher
+            EVENT_STATE_CHANGED,
+            _async_state_change_dispatcher,
+            event_filter=_async_state_change_filter,
         )
 
     domains = _async_string_to_lower_list(domains)
@@ -423,10 +481,18 @@ def async_track_state_removed_domain(
 ) -> Callable[[], None]:
     """Track state change events when an entity is removed from domains."""
 
+    _async_register_listener(hass, action)
     domain_callbacks = hass.data.setdefault(TRACK_STATE_REMOVED_DOMAIN_CALLBACKS, {})
 
     if TRACK_STATE_REMOVED_DOMAIN_LISTENER not in hass.data:
 
+        @callback
+        def _async_state_change_filter(event: Event) -> bool:
+            """Filter state changes of entities removed from tracked domains."""
+            return event.data.get("new_state") is None and _async_domain_has_listeners(
+                event, domain_callbacks
+            )
+
         @callback
         def _async_state_change_dispatcher(event: Event) -> None:
             """Dispatch state changes by entity_id."""
@@ -436,7 +502,9 @@ def async_track_state_removed_domain(
             _async_dispatch_domain_event(hass, event, domain_callbacks)
 
         hass.data[TRACK_STATE_REMOVED_DOMAIN_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED, _async_state_change_dispatcher
+            EVENT_STATE_CHANGED,
+            _async_state_change_dispatcher,
+            event_filter=_async_state_change_filter,
         )
 
     domains = _async_string_to_lower_list(domains)
@@ -726,6 +794,8 @@ class _TrackTemplateResultInfo:
         self._last_result: Dict[Template, Union[str, TemplateError]] = {}
         self._info: Dict[Template, RenderInfo] = {}
         self._track_state_changes: Optional[_TrackStateChangeFiltered] = None
+        self._last_render: Dict[Template, datetime] = {}
+        self._pending_render: Dict[Template, CALLBACK_TYPE] = {}
 
     def async_setup(self, raise_on_template_error: bool) -> None:
         """Activation of template tracking."""
@@ -763,6 +833,9 @@ class _TrackTemplateResultInfo:
         """Cancel the listener."""
         assert self._track_state_changes
         self._track_state_changes.async_remove()
+        for cancel in self._pending_render.values():
+            cancel()
+        self._pending_render.clear()
 
     @callback
     def async_refresh(self) -> None:
@@ -781,22 +854,110 @@ class _TrackTemplateResultInfo:
         )
 
     @callback
-    def _refresh(self, event: Optional[Event]) -> None:
+    def _rate_limit_for_event(
+        self, track_template_: TrackTemplate, event: Event
+    ) -> Optional[timedelta]:
+        """Return the rate limit of a re-render caused by an event."""
+        info = self._info[track_template_.template]
+        entity_id = event.data[ATTR_ENTITY_ID]
+
+        if entity_id in info.entities:
+            # Changes to entities referenced by id are never delayed
+            return None
+
+        domain = split_entity_id(entity_id)[0]
+
+        if info.all_states or info.all_states_lifecycle:
+            rate_limit = track_template_.all_states_rate_limit
+        elif domain in info.domains or domain in info.domains_lifecycle:
+            rate_limit = track_template_.domains_rate_limit
+        else:
+            return None
+
+        if info.rate_limit is not None:
+            return info.rate_limit
+        return rate_limit
+
+    @callback
+    def _async_render_is_delayed(
+        self, track_template_: TrackTemplate, event: Event
+    ) -> bool:
+        """Delay a re-render that falls inside the rate limit of the template.
+
+        Events arriving while a re-render is pending are coalesced into the
+        pending re-render at the end of the rate limit window, unless they
+        are never rate limited.
+        """
+        template = track_template_.template
+        rate_limit = self._rate_limit_for_event(track_template_, event)
+
+        if not rate_limit:
+            return False
+
+        if template in self._pending_render:
+            return True
+
+        last_render = self._last_render.get(template)
+
+        if last_render is None:
+            return False
+
+        next_render = last_render + rate_limit
+        if next_render <= dt_util.utcnow():
+            return False
+
+        @callback
+        def _render_delayed(_now: datetime) -> None:
+            """Re-render the template at the end of the rate limit window."""
+            del self._pending_render[template]
+            self._refresh(event, [track_template_])
+
+        self._pending_render[template] = async_track_point_in_utc_time(
+            self.hass, _render_delayed, next_render
+        )
+        _LOGGER.debug(
+            "Template update %s delayed until %s by rate limit %s",
+            template.template,
+            next_render,
+            rate_limit,
+        )
+        return True
+
+    @callback
+    def _refresh(
+        self,
+        event: Optional[Event],
+        track_templates: Optional[Iterable[TrackTemplate]] = None,
+    ) -> None:
+        """Re-render the templates affected by an event.
+
+        When track_templates is passed, those templates are re-rendered
+        without checking the event or the rate limit.
+        """
         updates = []
         info_changed = False
+        forced = track_templates is not None
 
-        for track_template_ in self._track_templates:
+        for track_template_ in track_templates or self._track_templates:
             template = track_template_.template
-            if event:
+            if event and not forced:
                 if not self._event_triggers_template(template, event):
                     continue
 
+                if self._async_render_is_delayed(track_template_, event):
+                    continue
+
                 _LOGGER.debug(
                     "Template update %s triggered by event: %s",
                     template.template,
                     event,
                 )
 
+            cancel_pending = self._pending_render.pop(template, None)
+            if cancel_pending is not None:
+                cancel_pending()
+
+            self._last_render[template] = dt_util.utcnow()
             self._info[template] = template.async_render_to_info(
                 track_template_.variables
             )
@@ -1041,6 +1202,7 @@ def async_track_time_interval(
 ) -> CALLBACK_TYPE:
     """Add a listener that fires repetitively at every timedelta interval."""
     remove = None
+    _async_register_listener(hass, action)
 
     def next_interval() -> datetime:
         """Return the next interval."""
@@ -1051,7 +1213,7 @@ def async_track_time_interval(
         """Handle elapsed intervals."""
         nonlocal remove
         remove = async_track_point_in_utc_time(hass, interval_listener, next_interval())
-        hass.async_run_job(action, now)
+        _async_run_listener(hass, action, now)
 
     remove = async_track_point_in_utc_time(hass, interval_listener, next_interval())
 
@@ -1167,6 +1329,8 @@ def async_track_utc_time_change(
     local: bool = False,
 ) -> CALLBACK_TYPE:
     """Add a listener that will fire if time matches a pattern."""
+    _async_register_listener(hass, action)
+
     # We do not have to wrap the function with time pattern matching logic
     # if no pattern given
     if all(val is None for val in (hour, minute, second)):
@@ -1174,7 +1338,7 @@ def async_track_utc_time_change(
         @callback
         def time_change_listener(event: Event) -> None:
             """Fire every time event that comes in."""
-            hass.async_run_job(action, event.data[ATTR_NOW])
+            _async_run_listener(hass, action, event.data[ATTR_NOW])
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
@@ -1195,7 +1359,8 @@ def async_track_utc_time_change(
 
     # Make sure rolling back the clock doesn't prevent the timer from
     # triggering.
-    cancel_callback: Optional[asyncio.TimerHandle] = None
+    cancel_callback: Optional[CALLBACK_TYPE] = None
+    cancelled = False
     calculate_next(next_time)
 
     @callback
@@ -1204,57 +1369,117 @@ def async_track_utc_time_change(
         nonlocal next_time, cancel_callback
 
         now = pattern_utc_now()
-        hass.async_run_job(action, dt_util.as_local(now) if local else now)
+        _async_run_listener(hass, action, dt_util.as_local(now) if local else now)
+
+        if cancelled:
+            # The action removed the listener
+            return
 
         calculate_next(now + timedelta(seconds=1))
 
-        cancel_callback = hass.loop.call_at(
-            -time.time()
-            + hass.loop.time()
-            + next_time.timestamp()
-            + MAX_TIME_TRACKING_ERROR,
-            pattern_time_change_listener,
+        cancel_callback = _async_schedule_second(
+            hass, next_time, pattern_time_change_listener
         )
 
-    # We always get time.time() first to avoid time.time()
-    # ticking forward after fetching hass.loop.time()
-    # and callback being scheduled a few microseconds early.
-    #
-    # Since we loose additional time calling `hass.loop.time()`
-    # we add MAX_TIME_TRACKING_ERROR to ensure
-    # we always schedule the call within the time window between
-    # second and the next second.
-    #
-    # For example:
-    # If the clock ticks forward 30 microseconds when fectching
-    # `hass.loop.time()` and we want the event to fire at exactly
-    # 03:00:00.000000, the event would actually fire around
-    # 02:59:59.999970. To ensure we always fire sometime between
-    # 03:00:00.000000 and 03:00:00.999999 we add
-    # MAX_TIME_TRACKING_ERROR to make up for the time
-    # lost fetching the time. This ensures we do not fire the
-    # event before the next time pattern match which would result
-    # in the event being fired again since we would otherwise
-    # potentially fire early.
-    #
-    cancel_callback = hass.loop.call_at(
-        -time.time()
-        + hass.loop.time()
-        + next_time.timestamp()
-        + MAX_TIME_TRACKING_ERROR,
-        pattern_time_change_listener,
+    cancel_callback = _async_schedule_second(
+        hass, next_time, pattern_time_change_listener
     )
 
     @callback
     def unsub_pattern_time_change_listener() -> None:
-        """Cancel the call_later."""
-        nonlocal cancel_callback
+        """Cancel the scheduled call."""
+        nonlocal cancelled
+
         assert cancel_callback is not None
-        cancel_callback.cancel()
+        cancelled = True
+        cancel_callback()
 
     return unsub_pattern_time_change_listener
 
 
+@callback
+def _async_schedule_second(
+    hass: HomeAssistant, point_in_time: datetime, action: Callable[[], None]
+) -> CALLBACK_TYPE:
+    """Schedule a callback at a whole second.
+
+    Callbacks that are due at the same second share a single timer, so
+    time patterns that match the same second wake up the loop only once.
+    """
+    wheel: Dict[
+        float, Tuple[asyncio.TimerHandle, List[Callable[[], None]]]
+    ] = hass.data.setdefault(TRACK_TIME_WHEEL, {})
+    target = point_in_time.timestamp()
+    bucket = wheel.get(target)
+
+    if bucket is None:
+        # We always get time.time() first to avoid time.time()
+        # ticking forward after fetching hass.loop.time()
+        # and callback being scheduled a few microseconds early.
+        #
+        # Since we loose additional time calling `hass.loop.time()`
+        # we add MAX_TIME_TRACKING_ERROR to ensure
+        # we always schedule the call within the time window between
+        # second and the next second.
+        #
+        # For example:
+        # If the clock ticks forward 30 microseconds when fectching
+        # `hass.loop.time()` and we want the event to fire at exactly
+        # 03:00:00.000000, the event would actually fire around
+        # 02:59:59.999970. To ensure we always fire sometime between
+        # 03:00:00.000000 and 03:00:00.999999 we add
+        # MAX_TIME_TRACKING_ERROR to make up for the time
+        # lost fetching the time. This ensures we do not fire the
+        # event before the next time pattern match which would result
+        # in the event being fired again since we would otherwise
+        # potentially fire early.
+        #
+        handle = hass.loop.call_at(
+            -time.time() + hass.loop.time() + target + MAX_TIME_TRACKING_ERROR,
+            _async_run_second,
+            hass,
+            target,
+        )
+        bucket = wheel[target] = (handle, [])
+
+    bucket[1].append(action)
+
+    @callback
+    def unschedule() -> None:
+        """Remove the callback from the second it was scheduled for."""
+        if action not in bucket[1]:
+            return
+
+        # The bucket is no longer in the wheel while its callbacks run
+        bucket[1].remove(action)
+
+        if not bucket[1] and wheel.get(target) is bucket:
+            bucket[0].cancel()
+            del wheel[target]
+
+    return unschedule
+
+
+@callback
+def _async_run_second(hass: HomeAssistant, target: float) -> None:
+    """Run the callbacks that were scheduled for a second."""
+    bucket = hass.data[TRACK_TIME_WHEEL].pop(target, None)
+
+    if bucket is None:
+        return
+
+    actions = bucket[1]
+    for action in list(actions):
+        # Skip callbacks unscheduled by a callback that ran before them
+        if action not in actions:
+            continue
+
+        try:
+            action()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error running scheduled time callback %s", action)
+
+
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
 
 
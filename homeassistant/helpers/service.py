@@ -339,6 +339,19 @@ def async_set_service_schema(
     hass.data[SERVICE_DESCRIPTION_CACHE][f"{domain}.{service}"] = description
 
 
+@ha.callback
+def _async_get_platform_entities(
+    platform: "EntityPlatform", entity_ids: Set[str]
+) -> List["Entity"]:
+    """Return the entities of a platform that are targeted, in platform order."""
+    entities = platform.entities
+    if len(entity_ids) < len(entities):
+        found = [entity_id for entity_id in entity_ids if entity_id in entities]
+        if len(found) < 2:
+            return [entities[entity_id] for entity_id in found]
+    return [entity for entity in entities.values() if entity.entity_id in entity_ids]
+
+
 @bind_hass
 async def entity_service_call(
     hass: HomeAssistantType,
@@ -389,11 +402,7 @@ async def entity_service_call(
                 entity_candidates.extend(platform.entities.values())
             else:
                 entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in entity_ids
-                    ]
+                    _async_get_platform_entities(platform, entity_ids)
                 )
 
     elif target_all_entities:
@@ -410,12 +419,9 @@ async def entity_service_call(
 
     else:
         for platform in platforms:
-            platform_entities = []
-            for entity in platform.entities.values():
-
-                if entity.entity_id not in entity_ids:
-                    continue
+            platform_entities = _async_get_platform_entities(platform, entity_ids)
 
+            for entity in platform_entities:
                 if not entity_perms(entity.entity_id, POLICY_CONTROL):
                     raise Unauthorized(
                         context=call.context,
@@ -423,8 +429,6 @@ async def entity_service_call(
                         permission=POLICY_CONTROL,
                     )
 
-                platform_entities.append(entity)
-
             entity_candidates.extend(platform_entities)
 
     if not target_all_entities:
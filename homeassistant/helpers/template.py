@@ -1,6 +1,7 @@
 """Template helper methods for rendering strings with Home Assistant data."""
 import asyncio
 import base64
+from collections import OrderedDict
 import collections.abc
 from datetime import datetime, timedelta
 from functools import wraps
@@ -10,7 +11,9 @@ import math
 from operator import attrgetter
 import random
 import re
-from typing import Any, Generator, Iterable, List, Optional, Union
+import threading
+from types import CodeType
+from typing import Any, Generator, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
@@ -49,6 +52,11 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 
+# Compiled code of the most recently used template sources, shared process-wide
+COMPILED_CODE_CACHE_SIZE = 2048
+_COMPILED_CODE_CACHE: "OrderedDict[Tuple[str, bool], CodeType]" = OrderedDict()
+_COMPILED_CODE_CACHE_LOCK = threading.Lock()
+
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
 _RE_GET_ENTITIES = re.compile(
     r"(?:(?:(?:states\.|(?P<func>is_state|is_state_attr|state_attr|states|expand)\((?:[\ \'\"]?))(?P<entity_id>[\w]+\.[\w]+)|states\.(?P<domain_outer>[a-z]+)|states\[(?:[\'\"]?)(?P<domain_inner>[\w]+))|(?P<variable>[\w]+))",
@@ -198,10 +206,11 @@ class RenderInfo:
         self.domains = set()
         self.domains_lifecycle = set()
         self.entities = set()
+        self.rate_limit = None
 
     def __repr__(self) -> str:
         """Representation of RenderInfo."""
-        return f"<RenderInfo {self.template} all_states={self.all_states} all_states_lifecycle={self.all_states_lifecycle} domains={self.domains} domains_lifecycle={self.domains_lifecycle} entities={self.entities}>"
+        return f"<RenderInfo {self.template} all_states={self.all_states} all_states_lifecycle={self.all_states_lifecycle} domains={self.domains} domains_lifecycle={self.domains_lifecycle} entities={self.entities} rate_limit={self.rate_limit}>"
 
     def _filter_domains_and_entities(self, entity_id: str) -> bool:
         """Template should re-render if the entity state changes when we match specific domains or entities."""
@@ -274,7 +283,7 @@ class Template:
 
     def ensure_valid(self):
         """Return if template is valid."""
-        if self._compiled_code is not None:
+        if self.is_static or self._compiled_code is not None:
             return
 
         try:
@@ -455,10 +464,14 @@ class Template:
 
         env = self._env
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
-        )
+        # Templates with the same source share the bound jinja2 template
+        compiled = env.template_cache.get(self.template)
+        if compiled is None:
+            compiled = env.template_cache[self.template] = jinja2.Template.from_code(
+                env, self._compiled_code, env.globals, None
+            )
 
+        self._compiled = compiled
         return self._compiled
 
     def __eq__(self, other):
@@ -896,6 +909,14 @@ def distance(hass, *args):
     )
 
 
+def rate_limit(hass: HomeAssistantType, **kwargs: Any) -> str:
+    """Set the minimum time between re-renders caused by all or domain states."""
+    render_info = hass.data.get(_RENDER_INFO)
+    if render_info is not None:
+        render_info.rate_limit = timedelta(**kwargs)
+    return ""
+
+
 def is_state(hass: HomeAssistantType, entity_id: str, state: State) -> bool:
     """Test if a state is a specific value."""
     state_obj = _get_state(hass, entity_id)
@@ -1278,6 +1299,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         self.globals["is_state"] = hassfunction(is_state)
         self.globals["is_state_attr"] = hassfunction(is_state_attr)
         self.globals["state_attr"] = hassfunction(state_attr)
+        self.globals["rate_limit"] = hassfunction(rate_limit)
         self.globals["states"] = AllStates(hass)
 
     def is_safe_callable(self, obj):
@@ -1307,10 +1329,22 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             # any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        cached = self.template_cache.get(source)
+        # Environments with hass register extra filters, so code compiled
+        # with them is kept apart from code compiled without hass.
+        key = (source, self.hass is not None)
+
+        with _COMPILED_CODE_CACHE_LOCK:
+            cached = _COMPILED_CODE_CACHE.get(key)
+            if cached is not None:
+                _COMPILED_CODE_CACHE.move_to_end(key)
+                return cached
+
+        cached = super().compile(source)
 
-        if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
+        with _COMPILED_CODE_CACHE_LOCK:
+            _COMPILED_CODE_CACHE[key] = cached
+            while len(_COMPILED_CODE_CACHE) > COMPILED_CODE_CACHE_SIZE:
+                _COMPILED_CODE_CACHE.popitem(last=False)
 
         return cached
 
@@ -6,11 +6,14 @@ documentation as possible to keep it understandable.
 """
 import asyncio
 import functools as ft
+import hashlib
 import importlib
 import json
 import logging
+import os
 import pathlib
 import sys
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import (
     TYPE_CHECKING,
@@ -25,12 +28,15 @@ from typing import (
     cast,
 )
 
+from homeassistant.const import __version__
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.generated.ssdp import SSDP
 from homeassistant.generated.zeroconf import HOMEKIT, ZEROCONF
 
 # Typing imports that create a circular dependency
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
 
 CALLABLE_T = TypeVar("CALLABLE_T", bound=Callable)  # pylint: disable=invalid-name
 
@@ -39,6 +45,10 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_MANIFEST_INDEX = "manifest_index"
+DATA_IMPORT_TIMES = "integration_import_times"
+MANIFEST_INDEX_STORAGE_KEY = "core.manifest_index"
+MANIFEST_INDEX_STORAGE_VERSION = 1
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -49,6 +59,15 @@ CUSTOM_WARNING = (
 )
 _UNDEF = object()
 
+# Platforms that are only imported when they are first used. When enabled,
+# they are imported in the background once Home Assistant has started.
+PREWARM_PLATFORMS = (
+    "config_flow",
+    "device_action",
+    "device_condition",
+    "device_trigger",
+)
+
 
 def manifest_from_legacy_module(domain: str, module: ModuleType) -> Dict:
     """Generate a manifest from a legacy module."""
@@ -125,6 +144,114 @@ async def async_get_custom_components(
     return cast(Dict[str, "Integration"], reg_or_evt)
 
 
+def _get_manifest_index_key(paths: List[str]) -> str:
+    """Return a key that changes when the built-in integrations change."""
+    key = hashlib.sha1(__version__.encode())
+    for path in paths:
+        with os.scandir(path) as entries:
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                if not entry.is_dir():
+                    continue
+                try:
+                    manifest_mtime = os.stat(
+                        os.path.join(entry.path, "manifest.json")
+                    ).st_mtime_ns
+                except OSError:
+                    manifest_mtime = None
+                key.update(
+                    f"{entry.name}:{entry.stat().st_mtime_ns}:{manifest_mtime}".encode()
+                )
+    return key.hexdigest()
+
+
+def _build_manifest_index(paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Read the manifests of all built-in integrations."""
+    index: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        for manifest_path in sorted(pathlib.Path(path).glob("*/manifest.json")):
+            domain = manifest_path.parent.name
+            if domain in index:
+                continue
+
+            try:
+                manifest = json.loads(manifest_path.read_text())
+            except ValueError as err:
+                _LOGGER.error(
+                    "Error parsing manifest.json file at %s: %s", manifest_path, err
+                )
+                continue
+
+            index[domain] = {"path": str(manifest_path.parent), "manifest": manifest}
+    return index
+
+
+async def _async_get_manifest_index(
+    hass: "HomeAssistant",
+) -> Dict[str, Dict[str, Any]]:
+    """Return the manifests of the built-in integrations.
+
+    The index is stored after it is built, so following starts only have
+    to load a single file instead of probing every integration directory.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant import components
+    from homeassistant.helpers.storage import Store
+
+    store = Store(hass, MANIFEST_INDEX_STORAGE_VERSION, MANIFEST_INDEX_STORAGE_KEY)
+    paths = list(components.__path__)  # type: ignore
+
+    key, data = await asyncio.gather(
+        hass.async_add_executor_job(_get_manifest_index_key, paths),
+        _async_load_manifest_index(store),
+    )
+
+    if (
+        isinstance(data, dict)
+        and data.get("key") == key
+        and isinstance(data.get("manifests"), dict)
+    ):
+        return cast(Dict[str, Dict[str, Any]], data["manifests"])
+
+    index = await hass.async_add_executor_job(_build_manifest_index, paths)
+    hass.async_create_task(store.async_save({"key": key, "manifests": index}))
+    return index
+
+
+async def _async_load_manifest_index(store: "Store") -> Any:
+    """Load the stored manifest index, None if it can't be read."""
+    try:
+        return await store.async_load()
+    except HomeAssistantError as err:
+        _LOGGER.warning("Unable to load the manifest index, rebuilding it: %s", err)
+        return None
+
+
+async def async_get_manifest_index(
+    hass: "HomeAssistant",
+) -> Dict[str, Dict[str, Any]]:
+    """Return cached index of the built-in integration manifests."""
+    index_or_evt = hass.data.get(DATA_MANIFEST_INDEX)
+
+    if index_or_evt is None:
+        evt = hass.data[DATA_MANIFEST_INDEX] = asyncio.Event()
+
+        try:
+            index = await _async_get_manifest_index(hass)
+            hass.data[DATA_MANIFEST_INDEX] = index
+        finally:
+            if hass.data.get(DATA_MANIFEST_INDEX) is evt:
+                # Let the next caller try again
+                hass.data.pop(DATA_MANIFEST_INDEX)
+            evt.set()
+        return index
+
+    if isinstance(index_or_evt, asyncio.Event):
+        await index_or_evt.wait()
+        return await async_get_manifest_index(hass)
+
+    return cast(Dict[str, Dict[str, Any]], index_or_evt)
+
+
 async def async_get_config_flows(hass: "HomeAssistant") -> Set[str]:
     """Return cached list of config flows."""
     # pylint: disable=import-outside-toplevel
@@ -230,6 +357,23 @@ class Integration:
 
         return None
 
+    @classmethod
+    def resolve_from_index(
+        cls, hass: "HomeAssistant", index: Dict[str, Dict[str, Any]], domain: str
+    ) -> "Optional[Integration]":
+        """Resolve a built-in integration from the manifest index."""
+        entry = index.get(domain)
+
+        if entry is None:
+            return None
+
+        return cls(
+            hass,
+            f"{PACKAGE_BUILTIN}.{domain}",
+            pathlib.Path(entry["path"]),
+            dict(entry["manifest"]),
+        )
+
     @classmethod
     def resolve_legacy(
         cls, hass: "HomeAssistant", domain: str
@@ -390,7 +534,7 @@ class Integration:
         """Return the component."""
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         if self.domain not in cache:
-            cache[self.domain] = importlib.import_module(self.pkg_path)
+            cache[self.domain] = self._import(self.pkg_path)
         return cache[self.domain]  # type: ignore
 
     def get_platform(self, platform_name: str) -> ModuleType:
@@ -398,16 +542,70 @@ class Integration:
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         full_name = f"{self.domain}.{platform_name}"
         if full_name not in cache:
-            cache[full_name] = importlib.import_module(
-                f"{self.pkg_path}.{platform_name}"
-            )
+            cache[full_name] = self._import(f"{self.pkg_path}.{platform_name}")
         return cache[full_name]  # type: ignore
 
+    def has_platform(self, platform_name: str) -> bool:
+        """Return if the integration has a platform, without importing it."""
+        return (self.file_path / f"{platform_name}.py").is_file() or (
+            self.file_path / platform_name / "__init__.py"
+        ).is_file()
+
+    def _import(self, name: str) -> ModuleType:
+        """Import a module and record how long the import took."""
+        start = timer()
+        module = importlib.import_module(name)
+        self.hass.data.setdefault(DATA_IMPORT_TIMES, {})[name] = timer() - start
+        return module
+
     def __repr__(self) -> str:
         """Text representation of class."""
         return f"<Integration {self.domain}: {self.pkg_path}>"
 
 
+def get_import_times(hass: "HomeAssistant") -> Dict[str, float]:
+    """Return the seconds it took to import each integration module.
+
+    Modules that were already imported elsewhere take close to no time.
+    """
+    return dict(hass.data.get(DATA_IMPORT_TIMES, {}))
+
+
+async def async_prewarm_platforms(hass: "HomeAssistant") -> None:
+    """Import the platforms of loaded integrations that are imported on use.
+
+    Imports run one at a time in the executor, so they don't hold up
+    anything that happens in the meantime.
+    """
+    integrations: Dict[str, Union[Integration, asyncio.Event]] = hass.data.get(
+        DATA_INTEGRATIONS, {}
+    )
+
+    for domain in list(hass.config.components):
+        integration = integrations.get(domain)
+        if not isinstance(integration, Integration):
+            continue
+
+        for platform_name in PREWARM_PLATFORMS:
+            if f"{domain}.{platform_name}" in hass.data.get(DATA_COMPONENTS, {}):
+                continue
+
+            try:
+                await hass.async_add_executor_job(
+                    _prewarm_platform, integration, platform_name
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.debug(
+                    "Unable to import %s.%s", integration.pkg_path, platform_name
+                )
+
+
+def _prewarm_platform(integration: Integration, platform_name: str) -> None:
+    """Import a platform if the integration has it."""
+    if integration.has_platform(platform_name):
+        integration.get_platform(platform_name)
+
+
 async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integration:
     """Get an integration."""
     cache = hass.data.get(DATA_INTEGRATIONS)
@@ -442,12 +640,18 @@ async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integrati
         event.set()
         return integration
 
-    from homeassistant import components  # pylint: disable=import-outside-toplevel
-
-    integration = await hass.async_add_executor_job(
-        Integration.resolve_from_root, hass, components, domain
+    integration = Integration.resolve_from_index(
+        hass, await async_get_manifest_index(hass), domain
     )
 
+    if integration is None:
+        # Integrations added after the index was built
+        from homeassistant import components  # pylint: disable=import-outside-toplevel
+
+        integration = await hass.async_add_executor_job(
+            Integration.resolve_from_root, hass, components, domain
+        )
+
     if integration is not None:
         cache[domain] = integration
         event.set()
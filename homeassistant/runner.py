@@ -31,6 +31,7 @@ class RuntimeConfig:
     config_dir: str
     skip_pip: bool = False
     safe_mode: bool = False
+    prewarm_platforms: bool = False
 
     verbose: bool = False
 
@@ -195,10 +195,6 @@ def check(config_dir, secrets=False):
     for pat in PATCHES.values():
         pat.start()
 
-    if secrets:
-        # Ensure !secrets point to the patched function
-        yaml_loader.yaml.SafeLoader.add_constructor("!secret", yaml_loader.secret_yaml)
-
     try:
         res["components"] = asyncio.run(async_check_config(config_dir))
         res["secret_cache"] = OrderedDict(yaml_loader.__SECRET_CACHE)
@@ -215,11 +211,6 @@ def check(config_dir, secrets=False):
         # Stop all patches
         for pat in PATCHES.values():
             pat.stop()
-        if secrets:
-            # Ensure !secrets point to the original function
-            yaml_loader.yaml.SafeLoader.add_constructor(
-                "!secret", yaml_loader.secret_yaml
-            )
         bootstrap.clear_secret_cache()
 
     return res
@@ -1,9 +1,22 @@
 """All methods needed to bootstrap a Home Assistant instance."""
 import asyncio
+import contextlib
 import logging.handlers
 from timeit import default_timer as timer
 from types import ModuleType
-from typing import Awaitable, Callable, Optional, Set
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from homeassistant import config as conf_util, core, loader, requirements
 from homeassistant.config import async_notify_setup_error
@@ -20,11 +33,168 @@ DATA_SETUP_DONE = "setup_done"
 DATA_SETUP_STARTED = "setup_started"
 DATA_SETUP = "setup_tasks"
 DATA_DEPS_REQS = "deps_reqs_processed"
+DATA_SETUP_TIMELINE = "setup_timeline"
 
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 300
 
 
+class SetupSpan(NamedTuple):
+    """A phase of setting up an integration."""
+
+    domain: str
+    phase: str
+    start: float
+    end: float
+    waits: Tuple[str, ...]
+
+
+class SetupTimeline:
+    """Record the phases integrations go through while they are set up.
+
+    Times are in seconds since the timeline was created. Recording stops
+    when the timeline is finished, once startup has wrapped up.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the timeline."""
+        self.started = timer()
+        self.finished: Optional[float] = None
+        self.spans: List[SetupSpan] = []
+
+    @core.callback
+    def async_record(
+        self, domain: str, phase: str, start: float, waits: Iterable[str] = ()
+    ) -> None:
+        """Record a phase of domain that started at start and ends now."""
+        if self.finished is None:
+            self.spans.append(
+                SetupSpan(
+                    domain,
+                    phase,
+                    start - self.started,
+                    timer() - self.started,
+                    tuple(waits),
+                )
+            )
+
+    @contextlib.contextmanager
+    def phase(
+        self, domain: str, phase: str, waits: Iterable[str] = ()
+    ) -> Iterator[None]:
+        """Record the time spent in the body as a phase of domain."""
+        start = timer()
+        try:
+            yield
+        finally:
+            self.async_record(domain, phase, start, waits)
+
+    @core.callback
+    def async_finish(self) -> None:
+        """Stop recording."""
+        if self.finished is None:
+            self.finished = timer() - self.started
+
+    @core.callback
+    def async_integrations(self) -> Dict[str, Dict[str, float]]:
+        """Return the time spent in each phase by integration."""
+        integrations: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            phases = integrations.setdefault(span.domain, {})
+            phases[span.phase] = phases.get(span.phase, 0) + span.end - span.start
+        return integrations
+
+    @core.callback
+    def async_critical_path(self) -> List[Dict[str, Any]]:
+        """Return the chain of integrations that determined the setup time.
+
+        The chain ends with the integration that finished last and follows
+        for every integration the dependency it waited on longest.
+        """
+        spans_by_domain: Dict[str, List[SetupSpan]] = {}
+        for span in self.spans:
+            spans_by_domain.setdefault(span.domain, []).append(span)
+
+        if not spans_by_domain:
+            return []
+
+        integrations = self.async_integrations()
+        path = []
+        domain: Optional[str] = max(
+            spans_by_domain, key=lambda dom: spans_by_domain[dom][-1].end
+        )
+
+        while domain is not None and all(item["domain"] != domain for item in path):
+            spans = spans_by_domain[domain]
+            path.append(
+                {
+                    "domain": domain,
+                    "start": min(span.start for span in spans),
+                    "end": max(span.end for span in spans),
+                    "phases": integrations[domain],
+                }
+            )
+
+            # The dependency that finished last before the wait ended
+            released_by: Dict[str, float] = {}
+            for wait in (span for span in spans if span.waits):
+                for dep in wait.waits:
+                    for dep_span in spans_by_domain.get(dep, ()):
+                        if dep_span.end <= wait.end:
+                            released_by[dep] = max(
+                                released_by.get(dep, dep_span.end), dep_span.end
+                            )
+
+            domain = (
+                max(released_by, key=released_by.__getitem__) if released_by else None
+            )
+
+        path.reverse()
+        return path
+
+    @core.callback
+    def async_chrome_trace(self) -> Dict[str, Any]:
+        """Return the timeline in the Chrome trace event format."""
+        threads: Dict[str, int] = {}
+        events: List[Dict[str, Any]] = []
+
+        for span in self.spans:
+            event = {
+                "name": span.phase,
+                "cat": "setup",
+                "ph": "X",
+                "pid": 1,
+                "tid": threads.setdefault(span.domain, len(threads) + 1),
+                "ts": round(span.start * 1000000),
+                "dur": round((span.end - span.start) * 1000000),
+            }
+            if span.waits:
+                event["args"] = {"waits": list(span.waits)}
+            events.append(event)
+
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": tid,
+                "args": {"name": domain},
+            }
+            for domain, tid in threads.items()
+        )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+@core.callback
+def async_get_setup_timeline(hass: core.HomeAssistant) -> SetupTimeline:
+    """Return the setup timeline."""
+    timeline: Optional[SetupTimeline] = hass.data.get(DATA_SETUP_TIMELINE)
+    if timeline is None:
+        timeline = hass.data[DATA_SETUP_TIMELINE] = SetupTimeline()
+    return timeline
+
+
 @core.callback
 def async_set_domains_to_be_loaded(hass: core.HomeAssistant, domains: Set[str]) -> None:
     """Set domains that are going to be loaded from the config.
@@ -105,10 +275,15 @@ async def _async_process_dependencies(
             list(after_dependencies_tasks),
         )
 
-    async with hass.timeout.async_freeze(integration.domain):
-        results = await asyncio.gather(
-            *dependencies_tasks.values(), *after_dependencies_tasks.values()
-        )
+    with async_get_setup_timeline(hass).phase(
+        integration.domain,
+        "dependencies",
+        [*dependencies_tasks, *after_dependencies_tasks],
+    ):
+        async with hass.timeout.async_freeze(integration.domain):
+            results = await asyncio.gather(
+                *dependencies_tasks.values(), *after_dependencies_tasks.values()
+            )
 
     failed = [
         domain for idx, domain in enumerate(dependencies_tasks) if not results[idx]
@@ -160,10 +335,13 @@ async def _async_setup_component(
         log_error(str(err), integration.documentation)
         return False
 
+    timeline = async_get_setup_timeline(hass)
+
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        with timeline.phase(domain, "import"):
+            component = integration.get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", integration.documentation)
         return False
@@ -171,9 +349,10 @@ async def _async_setup_component(
         _LOGGER.exception("Setup failed for %s: unknown error", domain)
         return False
 
-    processed_config = await conf_util.async_process_component_config(
-        hass, config, integration
-    )
+    with timeline.phase(domain, "config"):
+        processed_config = await conf_util.async_process_component_config(
+            hass, config, integration
+        )
 
     if processed_config is None:
         log_error("Invalid config.", integration.documentation)
@@ -209,8 +388,9 @@ async def _async_setup_component(
             hass.data[DATA_SETUP_STARTED].pop(domain)
             return False
 
-        async with hass.timeout.async_timeout(SLOW_SETUP_MAX_WAIT, domain):
-            result = await task
+        with timeline.phase(domain, "setup"):
+            async with hass.timeout.async_timeout(SLOW_SETUP_MAX_WAIT, domain):
+                result = await task
     except asyncio.TimeoutError:
         _LOGGER.error(
             "Setup of %s is taking longer than %s seconds."
@@ -247,12 +427,12 @@ async def _async_setup_component(
     await asyncio.sleep(0)
     await hass.config_entries.flow.async_wait_init_flow_finish(domain)
 
-    await asyncio.gather(
-        *[
-            entry.async_setup(hass, integration=integration)
-            for entry in hass.config_entries.async_entries(domain)
-        ]
-    )
+    entries = hass.config_entries.async_entries(domain)
+    if entries:
+        with timeline.phase(domain, "config_entries"):
+            await asyncio.gather(
+                *[entry.async_setup(hass, integration=integration) for entry in entries]
+            )
 
     hass.config.components.add(domain)
     hass.data[DATA_SETUP_STARTED].pop(domain)
@@ -295,7 +475,10 @@ async def async_prepare_setup_platform(
         return None
 
     try:
-        platform = integration.get_platform(domain)
+        with async_get_setup_timeline(hass).phase(
+            integration.domain, f"import {domain} platform"
+        ):
+            platform = integration.get_platform(domain)
     except ImportError as exc:
         log_error(f"Platform not found ({exc}).")
         return None
@@ -339,10 +522,11 @@ async def async_process_deps_reqs(
         raise HomeAssistantError("Could not set up all dependencies.")
 
     if not hass.config.skip_pip and integration.requirements:
-        async with hass.timeout.async_freeze(integration.domain):
-            await requirements.async_get_integration_with_requirements(
-                hass, integration.domain
-            )
+        with async_get_setup_timeline(hass).phase(integration.domain, "requirements"):
+            async with hass.timeout.async_freeze(integration.domain):
+                await requirements.async_get_integration_with_requirements(
+                    hass, integration.domain
+                )
 
     processed.add(integration.domain)
 
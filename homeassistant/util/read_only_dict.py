@@ -0,0 +1,56 @@
+"""Read only dictionary."""
+from typing import Any, Callable, Dict, Optional
+
+
+def _readonly(*args: Any, **kwargs: Any) -> Any:
+    """Raise an exception when a read only dict is modified."""
+    raise RuntimeError("Cannot modify ReadOnlyDict")
+
+
+class ReadOnlyDict(dict):
+    """Read only version of dict that is compatible with dict types.
+
+    As the content can not change, the hash and the serialized forms are
+    computed once and can be shared by everyone holding the same object.
+    """
+
+    __slots__ = ("_hash", "_serialized")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    pop = _readonly
+    popitem = _readonly
+    clear = _readonly
+    update = _readonly
+    setdefault = _readonly
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the read only dict."""
+        super().__init__(*args, **kwargs)
+        self._hash: Optional[int] = None
+        self._serialized: Optional[Dict[Callable[[Any], str], str]] = None
+
+    def __hash__(self) -> int:  # type: ignore
+        """Return the hash of the content."""
+        if self._hash is None:
+            try:
+                self._hash = hash(frozenset(self.items()))
+            except TypeError:
+                # Values like lists are not hashable, equal dicts
+                # still share their keys
+                self._hash = hash(frozenset(self))
+        return self._hash
+
+    def __reduce__(self) -> Any:
+        """Return the state for copying and pickling."""
+        return (self.__class__, (dict(self),))
+
+    def serialize(self, dumps: Callable[[Any], str]) -> str:
+        """Return the content serialized with dumps, serializing it only once."""
+        if self._serialized is None:
+            self._serialized = {}
+        serialized = self._serialized.get(dumps)
+        if serialized is None:
+            serialized = self._serialized[dumps] = dumps(self)
+        return serialized
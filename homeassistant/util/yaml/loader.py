@@ -4,7 +4,20 @@ import fnmatch
 import logging
 import os
 import sys
-from typing import Dict, Iterator, List, TypeVar, Union, overload
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import yaml
 
@@ -23,6 +36,14 @@ try:
 except ImportError:
     credstash = None
 
+try:
+    from yaml import CSafeLoader as FastestAvailableSafeLoader
+
+    HAS_C_LOADER = True
+except ImportError:
+    HAS_C_LOADER = False
+    from yaml import SafeLoader as FastestAvailableSafeLoader  # type: ignore
+
 
 # mypy: allow-untyped-calls, no-warn-return-any
 
@@ -31,6 +52,12 @@ DICT_T = TypeVar("DICT_T", bound=Dict)  # pylint: disable=invalid-name
 
 _LOGGER = logging.getLogger(__name__)
 __SECRET_CACHE: Dict[str, JSON_TYPE] = {}
+# Parsed files by path, with the stat key they were parsed at
+__PARSED_CACHE: Dict[str, Tuple[Tuple[int, ...], Any]] = {}
+# Files loaded since the parsed cache was last pruned
+__PARSED_USED: Set[str] = set()
+# Files modified this recently can change again without a new mtime
+RACY_MTIME_NS = 2 * 10 ** 9
 
 
 def clear_secret_cache() -> None:
@@ -41,7 +68,36 @@ def clear_secret_cache() -> None:
     __SECRET_CACHE.clear()
 
 
-class SafeLineLoader(yaml.SafeLoader):
+def clear_parsed_cache() -> None:
+    """Clear the cache of parsed YAML files.
+
+    Async friendly.
+    """
+    __PARSED_CACHE.clear()
+    __PARSED_USED.clear()
+
+
+def prune_parsed_cache() -> None:
+    """Drop the parsed files that were not loaded since the last prune.
+
+    Async friendly.
+    """
+    for fname in list(__PARSED_CACHE):
+        if fname not in __PARSED_USED:
+            __PARSED_CACHE.pop(fname, None)
+    __PARSED_USED.clear()
+
+
+class _LoaderMixin:
+    """Attributes shared by the loaders."""
+
+    name: str
+    # Content that depends on other files or the environment is not cached
+    cacheable = True
+    has_secrets = False
+
+
+class SafeLineLoader(yaml.SafeLoader, _LoaderMixin):
     """Loader class that keeps track of line numbers."""
 
     def compose_node(self, parent: yaml.nodes.Node, index: int) -> yaml.nodes.Node:
@@ -52,13 +108,88 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
+class FastSafeLoader(FastestAvailableSafeLoader, _LoaderMixin):
+    """The fastest available safe loader.
+
+    Line numbers are taken from the start mark of the nodes, which libyaml
+    provides as well.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize the loader."""
+        super().__init__(stream)
+        self.name = getattr(stream, "name", "<file>")
+        self.stream = stream
+
+
+class _SecretReference:
+    """A !secret that is resolved every time the file is loaded."""
+
+    __slots__ = ["name", "node"]
+
+    def __init__(self, name: str, node: yaml.nodes.Node) -> None:
+        """Initialize the secret reference."""
+        self.name = name
+        self.node = node
+
+
+def _cache_key(conf_file: TextIO) -> Optional[Tuple[int, ...]]:
+    """Return the key the parsed content of a file is cached under.
+
+    Files modified within the timestamp granularity of the file system are
+    not cached, a rewrite of the same size could keep the same mtime.
+    """
+    try:
+        stat = os.fstat(conf_file.fileno())
+    except (AttributeError, OSError):
+        return None
+    if time.time_ns() - stat.st_mtime_ns < RACY_MTIME_NS:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+
+
+def _resolve_secrets(obj: Any) -> Any:
+    """Return a copy of the parsed content with the secrets resolved."""
+    if isinstance(obj, _SecretReference):
+        return secret_yaml(obj, obj.node)  # type: ignore
+
+    if isinstance(obj, dict):
+        resolved: Any = obj.__class__(
+            (_resolve_secrets(key), _resolve_secrets(value))
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, list):
+        resolved = obj.__class__(_resolve_secrets(value) for value in obj)
+    else:
+        # Strings and other scalars are immutable and can be shared
+        return obj
+
+    if hasattr(obj, "__dict__"):
+        resolved.__dict__.update(obj.__dict__)
+    return resolved
+
+
 def load_yaml(fname: str) -> JSON_TYPE:
-    """Load a YAML file."""
+    """Load a YAML file.
+
+    The parsed content of a file is cached until the file changes, secrets
+    are resolved again on every load.
+    """
+    __PARSED_USED.add(fname)
     try:
         with open(fname, encoding="utf-8") as conf_file:
-            # If configuration file is empty YAML returns None
-            # We convert that to an empty dict
-            return yaml.load(conf_file, Loader=SafeLineLoader) or OrderedDict()
+            key = _cache_key(conf_file)
+            cached = __PARSED_CACHE.get(fname)
+            if key is not None and cached is not None and cached[0] == key:
+                return _resolve_secrets(cached[1])
+
+            loader = FastSafeLoader(conf_file)
+            try:
+                # If configuration file is empty YAML returns None
+                # We convert that to an empty dict
+                content = loader.get_single_data() or OrderedDict()
+            finally:
+                loader.dispose()
     except yaml.YAMLError as exc:
         _LOGGER.error(str(exc))
         raise HomeAssistantError(exc) from exc
@@ -66,6 +197,13 @@ def load_yaml(fname: str) -> JSON_TYPE:
         _LOGGER.error("Unable to read file %s: %s", fname, exc)
         raise HomeAssistantError(exc) from exc
 
+    if key is not None and loader.cacheable:
+        __PARSED_CACHE[fname] = (key, content)
+    elif not loader.has_secrets:
+        return content
+
+    return _resolve_secrets(content)
+
 
 @overload
 def _add_reference(
@@ -106,6 +244,7 @@ def _include_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
         device_tracker: !include device_tracker.yaml
 
     """
+    loader.cacheable = False
     fname = os.path.join(os.path.dirname(loader.name), node.value)
     try:
         return _add_reference(load_yaml(fname), loader, node)
@@ -134,6 +273,7 @@ def _include_dir_named_yaml(
     loader: SafeLineLoader, node: yaml.nodes.Node
 ) -> OrderedDict:
     """Load multiple files from directory as a dictionary."""
+    loader.cacheable = False
     mapping: OrderedDict = OrderedDict()
     loc = os.path.join(os.path.dirname(loader.name), node.value)
     for fname in _find_files(loc, "*.yaml"):
@@ -148,6 +288,7 @@ def _include_dir_merge_named_yaml(
     loader: SafeLineLoader, node: yaml.nodes.Node
 ) -> OrderedDict:
     """Load multiple files from directory as a merged dictionary."""
+    loader.cacheable = False
     mapping: OrderedDict = OrderedDict()
     loc = os.path.join(os.path.dirname(loader.name), node.value)
     for fname in _find_files(loc, "*.yaml"):
@@ -163,6 +304,7 @@ def _include_dir_list_yaml(
     loader: SafeLineLoader, node: yaml.nodes.Node
 ) -> List[JSON_TYPE]:
     """Load multiple files from directory as a list."""
+    loader.cacheable = False
     loc = os.path.join(os.path.dirname(loader.name), node.value)
     return [
         load_yaml(f)
@@ -175,6 +317,7 @@ def _include_dir_merge_list_yaml(
     loader: SafeLineLoader, node: yaml.nodes.Node
 ) -> JSON_TYPE:
     """Load multiple files from directory as a merged list."""
+    loader.cacheable = False
     loc: str = os.path.join(os.path.dirname(loader.name), node.value)
     merged_list: List[JSON_TYPE] = []
     for fname in _find_files(loc, "*.yaml"):
@@ -226,6 +369,7 @@ def _construct_seq(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
 
 def _env_var_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> str:
     """Load environment variables and embed it into the configuration YAML."""
+    loader.cacheable = False
     args = node.value.split()
 
     # Check for a default value
@@ -310,18 +454,28 @@ def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
     raise HomeAssistantError(f"Secret {node.value} not defined")
 
 
-yaml.SafeLoader.add_constructor("!include", _include_yaml)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict
-)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq
-)
-yaml.SafeLoader.add_constructor("!env_var", _env_var_yaml)
+def _secret_reference_yaml(
+    loader: FastSafeLoader, node: yaml.nodes.Node
+) -> _SecretReference:
+    """Defer loading a secret until the parsed content is resolved."""
+    loader.has_secrets = True
+    return _SecretReference(loader.name, node)
+
+
+for _loader in (yaml.SafeLoader, FastSafeLoader):
+    _loader.add_constructor("!include", _include_yaml)
+    _loader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict
+    )
+    _loader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq
+    )
+    _loader.add_constructor("!env_var", _env_var_yaml)
+    _loader.add_constructor("!include_dir_list", _include_dir_list_yaml)
+    _loader.add_constructor("!include_dir_merge_list", _include_dir_merge_list_yaml)
+    _loader.add_constructor("!include_dir_named", _include_dir_named_yaml)
+    _loader.add_constructor("!include_dir_merge_named", _include_dir_merge_named_yaml)
+
 yaml.SafeLoader.add_constructor("!secret", secret_yaml)
-yaml.SafeLoader.add_constructor("!include_dir_list", _include_dir_list_yaml)
-yaml.SafeLoader.add_constructor("!include_dir_merge_list", _include_dir_merge_list_yaml)
-yaml.SafeLoader.add_constructor("!include_dir_named", _include_dir_named_yaml)
-yaml.SafeLoader.add_constructor(
-    "!include_dir_merge_named", _include_dir_merge_named_yaml
-)
+# Secrets are resolved after the parsed content is taken from the cache
+FastSafeLoader.add_constructor("!secret", _secret_reference_yaml)
@@ -16,7 +16,7 @@ import uuid
 
 from aiohttp.test_utils import unused_port as get_test_instance_port  # noqa
 
-from homeassistant import auth, config_entries, core as ha, loader
+from homeassistant import auth, components, config_entries, core as ha, loader
 from homeassistant.auth import (
     auth_store,
     models as auth_models,
@@ -107,6 +107,13 @@ def get_test_config_dir(*add_path):
     return os.path.join(os.path.dirname(__file__), "testing_config", *add_path)
 
 
+@ft.lru_cache(maxsize=None)
+def _get_manifest_index():
+    """Return the index of the built-in integration manifests."""
+    # pylint: disable=protected-access
+    return loader._build_manifest_index(list(components.__path__))
+
+
 def get_test_home_assistant():
     """Return a Home Assistant object pointing at test config directory."""
     if sys.platform == "win32":
@@ -116,6 +123,8 @@ def get_test_home_assistant():
 
     asyncio.set_event_loop(loop)
     hass = loop.run_until_complete(async_test_home_assistant(loop))
+    # Don't store the manifest index in the shared test config dir
+    hass.data[loader.DATA_MANIFEST_INDEX] = dict(_get_manifest_index())
 
     stop_event = threading.Event()
 
@@ -5,6 +5,9 @@ from datetime import timedelta
 import json
 import unittest
 
+from aiohttp import ClientPayloadError
+import pytest
+
 from homeassistant.components import history, recorder
 from homeassistant.components.recorder.models import process_timestamp
 import homeassistant.core as ha
@@ -14,6 +17,7 @@ import homeassistant.util.dt as dt_util
 
 from tests.async_mock import patch, sentinel
 from tests.common import (
+    async_fire_time_changed,
     get_test_home_assistant,
     init_recorder_component,
     mock_state_change_event,
@@ -970,3 +974,170 @@ async def test_entity_ids_limit_via_api(hass, hass_client):
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def _async_record_light_states(hass, config=None):
+    """Record a few light states for the history api tests."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": config or {}})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("light.cow", "on")
+    hass.states.async_set("light.kitchen", "off", {"brightness": 0})
+    hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    return start
+
+
+async def test_fetch_period_api_stream(hass, hass_client):
+    """Test streaming the history returns the same states as a single response."""
+    start = await _async_record_light_states(hass)
+    client = await hass_client()
+    url = f"/api/history/period/{start.isoformat()}?significant_changes_only=0"
+
+    response = await client.get(url)
+    assert response.status == 200
+    expected = await response.json()
+
+    with patch("homeassistant.components.history.STREAM_QUEUE_SIZE", 1):
+        response = await client.get(f"{url}&stream")
+    assert response.status == 200
+    assert response.content_type == "application/json"
+    response_json = await response.json()
+
+    assert sorted(response_json, key=lambda states: states[0]["entity_id"]) == sorted(
+        expected, key=lambda states: states[0]["entity_id"]
+    )
+    assert [states[0]["entity_id"] for states in response_json] == [
+        "light.cow",
+        "light.kitchen",
+    ]
+
+
+async def test_fetch_period_api_stream_without_states(hass, hass_client):
+    """Test streaming the history of a period without states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}"
+        "?stream&filter_entity_id=light.missing"
+    )
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_fetch_period_api_stream_error(hass, hass_client, caplog):
+    """Test a failing query aborts the stream without ending the list."""
+    start = await _async_record_light_states(hass)
+    client = await hass_client()
+
+    def _iter_failing_states(*args):
+        yield "light.cow", [{"entity_id": "light.cow", "state": "on"}]
+        raise ValueError("Query failed")
+
+    with patch(
+        "homeassistant.components.history._iter_significant_states",
+        _iter_failing_states,
+    ):
+        response = await client.get(f"/api/history/period/{start.isoformat()}?stream")
+
+        assert response.status == 200
+        with pytest.raises(ClientPayloadError):
+            await response.read()
+
+    assert "Error streaming significant states" in caplog.text
+
+
+async def test_fetch_period_api_compact(hass, hass_client):
+    """Test the columnar encoding of the history with and without streaming."""
+    start = await _async_record_light_states(hass)
+    client = await hass_client()
+    url = (
+        f"/api/history/period/{start.isoformat()}"
+        "?filter_entity_id=light.kitchen&significant_changes_only=0&compact"
+    )
+
+    for query in ("", "&stream"):
+        response = await client.get(f"{url}{query}")
+        assert response.status == 200
+        response_json = await response.json()
+
+        assert len(response_json) == 1
+        kitchen = response_json[0]
+        assert kitchen["entity_id"] == "light.kitchen"
+        assert kitchen["state"] == ["on", "off"]
+        assert len(kitchen["last_changed"]) == 2
+        assert kitchen["last_changed"][0] <= kitchen["last_changed"][1]
+        assert kitchen["last_changed"][0] >= round(start.timestamp(), 3)
+        assert kitchen["attributes"] == {"brightness": 10}
+
+
+async def test_fetch_period_api_with_resolution(hass, hass_client):
+    """Test the fetch period view returns compiled statistics for a resolution."""
+    start = await _async_record_light_states(hass)
+    hass.states.async_set("sensor.temperature", "20")
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, start + timedelta(hours=2))
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+
+    response = await client.get(
+        f"/api/history/period/{(start - timedelta(hours=1)).isoformat()}"
+        "?resolution=hour"
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert len(response_json) == 1
+    assert response_json[0][0]["entity_id"] == "sensor.temperature"
+    assert response_json[0][0]["last"] == 20.0
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?resolution=5minute"
+        "&filter_entity_id=light.kitchen"
+    )
+    assert response.status == 200
+    assert await response.json() == []
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?resolution=day"
+    )
+    assert response.status == 400
+
+
+async def test_fetch_period_api_with_resolution_and_filters(hass, hass_client):
+    """Test the compiled statistics leave out the excluded entities."""
+    start = await _async_record_light_states(
+        hass, {history.CONF_EXCLUDE: {history.CONF_ENTITIES: ["sensor.temperature"]}}
+    )
+    hass.states.async_set("sensor.temperature", "20")
+    hass.states.async_set("sensor.humidity", "50")
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, start + timedelta(hours=2))
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    url = f"/api/history/period/{(start - timedelta(hours=1)).isoformat()}"
+
+    response = await client.get(f"{url}?resolution=hour")
+    assert response.status == 200
+    response_json = await response.json()
+    assert [stats[0]["entity_id"] for stats in response_json] == ["sensor.humidity"]
+
+    response = await client.get(
+        f"{url}?resolution=hour&filter_entity_id=sensor.temperature"
+    )
+    assert response.status == 200
+    assert await response.json() == []
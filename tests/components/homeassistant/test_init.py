@@ -1,6 +1,8 @@
 """The tests for Core components."""
 # pylint: disable=protected-access
 import asyncio
+from datetime import timedelta
+import json
 import unittest
 
 import pytest
@@ -11,8 +13,10 @@ from homeassistant import config
 import homeassistant.components as comps
 from homeassistant.components.homeassistant import (
     SERVICE_CHECK_CONFIG,
+    SERVICE_PROFILE_LISTENERS,
     SERVICE_RELOAD_CORE_CONFIG,
     SERVICE_SET_LOCATION,
+    SERVICE_WRITE_STARTUP_TRACE,
 )
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -31,10 +35,12 @@ import homeassistant.core as ha
 from homeassistant.exceptions import HomeAssistantError, Unauthorized
 from homeassistant.helpers import entity
 from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 
 from tests.async_mock import Mock, patch
 from tests.common import (
     async_capture_events,
+    async_fire_time_changed,
     async_mock_service,
     get_test_home_assistant,
     mock_service,
@@ -323,6 +329,54 @@ async def test_setting_location(hass):
     assert hass.config.longitude == 40
 
 
+async def test_profile_listeners(hass, tmpdir):
+    """Test profiling listeners writes a report."""
+    hass.config.config_dir = str(tmpdir)
+    await async_setup_component(hass, "homeassistant", {})
+
+    @ha.callback
+    def _listener(event):
+        pass
+
+    hass.bus.async_listen("test_event", _listener)
+
+    await hass.services.async_call(
+        "homeassistant", SERVICE_PROFILE_LISTENERS, {"duration": 5}, blocking=True
+    )
+    assert hass.listener_profiler is not None
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+
+    assert hass.listener_profiler is None
+    report = tmpdir.join("listener_profile.txt").read().splitlines()
+    assert report[0] == "calls\ttotal (s)\tmax (s)\tintegration\tlistener"
+    assert any(
+        line.startswith("1\t") and line.endswith("._listener") for line in report[1:]
+    )
+
+
+async def test_write_startup_trace(hass, tmpdir):
+    """Test writing the startup timeline as a Chrome trace."""
+    hass.config.config_dir = str(tmpdir)
+    await async_setup_component(hass, "homeassistant", {})
+
+    await hass.services.async_call(
+        "homeassistant", SERVICE_WRITE_STARTUP_TRACE, {}, blocking=True
+    )
+
+    trace = json.loads(tmpdir.join("startup_trace.json").read())
+    assert {"import", "config", "setup"} <= {
+        event["name"] for event in trace["traceEvents"] if event["ph"] == "X"
+    }
+    assert {"name": "homeassistant"} in [
+        event["args"] for event in trace["traceEvents"] if event["ph"] == "M"
+    ]
+
+
 async def test_require_admin(hass, hass_read_only_user):
     """Test services requiring admin."""
     await async_setup_component(hass, "homeassistant", {})
@@ -332,6 +386,7 @@ async def test_require_admin(hass, hass_read_only_user):
         SERVICE_HOMEASSISTANT_STOP,
         SERVICE_CHECK_CONFIG,
         SERVICE_RELOAD_CORE_CONFIG,
+        SERVICE_PROFILE_LISTENERS,
     ):
         with pytest.raises(Unauthorized):
             await hass.services.async_call(
@@ -332,6 +332,90 @@ async def test_subscribe_topic(hass, mqtt_mock, calls, record_calls):
     assert len(calls) == 1
 
 
+async def test_receive_messages_in_batches(hass, mqtt_mock, calls, record_calls):
+    """Test messages from the paho thread are handed to the loop in batches."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    mqtt_client = mqtt_mock()
+
+    with patch("homeassistant.components.mqtt.MESSAGE_BATCH_INTERVAL", 5), patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as call_soon_threadsafe:
+        for idx in range(3):
+            mqtt_client._mqtt_on_message(
+                None, None, mqtt.Message("test-topic", str(idx).encode(), 0, False)
+            )
+        await hass.async_block_till_done()
+
+    assert call_soon_threadsafe.call_count == 1
+    assert len(calls) == 0
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert [call[0].payload for call in calls] == ["0", "1", "2"]
+    assert mqtt_client._messages_flush_handle is None
+    assert not mqtt_client._messages_flush_scheduled
+
+
+async def test_receive_messages_batch_size(hass, mqtt_mock, calls, record_calls):
+    """Test a full batch is handled right away and large batches are split."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    mqtt_client = mqtt_mock()
+
+    with patch("homeassistant.components.mqtt.MESSAGE_BATCH_SIZE", 2), patch(
+        "homeassistant.components.mqtt.MESSAGE_BATCH_INTERVAL", 5
+    ), patch.object(
+        mqtt_client, "_mqtt_handle_message", wraps=mqtt_client._mqtt_handle_message
+    ) as handle_message:
+        for idx in range(5):
+            mqtt_client._mqtt_on_message(
+                None, None, mqtt.Message("test-topic", str(idx).encode(), 0, False)
+            )
+
+        # The full batch replaces the timer, the messages are handled in
+        # batches of two without waiting for the batch interval
+        for _ in range(4):
+            await asyncio.sleep(0)
+        assert handle_message.call_count == 5
+
+    await hass.async_block_till_done()
+    assert [call[0].payload for call in calls] == ["0", "1", "2", "3", "4"]
+    assert mqtt_client._pending_messages == []
+    assert mqtt_client._messages_flush_handle is None
+    assert not mqtt_client._messages_flush_scheduled
+
+
+async def test_receive_messages_after_failing_callback(
+    hass, mqtt_mock, calls, record_calls, caplog
+):
+    """Test a failing callback does not drop the rest of the batch."""
+
+    @callback
+    def bad_handler(msg):
+        """Raise on the first message."""
+        if msg.payload == "0":
+            raise ValueError("Bad payload")
+
+    await mqtt.async_subscribe(hass, "test-topic", bad_handler)
+    await mqtt.async_subscribe(hass, "other-topic", record_calls)
+    mqtt_client = mqtt_mock()
+
+    with patch("homeassistant.components.mqtt.MESSAGE_BATCH_INTERVAL", 5):
+        mqtt_client._mqtt_on_message(
+            None, None, mqtt.Message("test-topic", b"0", 0, False)
+        )
+        for idx in range(1, 3):
+            mqtt_client._mqtt_on_message(
+                None, None, mqtt.Message("other-topic", str(idx).encode(), 0, False)
+            )
+        await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert [call[0].payload for call in calls] == ["1", "2"]
+    assert "Error handling message on test-topic" in caplog.text
+    assert not mqtt_client._messages_flush_scheduled
+
+
 async def test_subscribe_deprecated(hass, mqtt_mock):
     """Test the subscription of a topic using deprecated callback signature."""
     calls = []
@@ -0,0 +1,88 @@
+"""The tests for the MQTT topic trie."""
+import pytest
+
+from homeassistant.components.mqtt import topic_trie
+from homeassistant.components.mqtt.topic_trie import TopicTrie
+
+from tests.async_mock import patch
+
+
+@pytest.mark.parametrize(
+    "topic_filter,topic,matches",
+    [
+        ("a/b/c", "a/b/c", True),
+        ("a/b/c", "a/b", False),
+        ("a/b", "a/b/c", False),
+        ("a/+/c", "a/b/c", True),
+        ("a/+/c", "a/b/d", False),
+        ("a/+", "a/b/c", False),
+        ("+/+", "/b", True),
+        ("a/#", "a/b/c", True),
+        ("a/#", "a", True),
+        ("a/#", "b/a", False),
+        ("#", "a/b/c", True),
+        ("#", "$SYS/broker", False),
+        ("+/broker", "$SYS/broker", False),
+        ("$SYS/#", "$SYS/broker", True),
+        ("$SYS/+", "$SYS/broker", True),
+        ("a/+/#", "a/b", True),
+    ],
+)
+def test_match(topic_filter, topic, matches):
+    """Test matching topics against topic filters with wildcards."""
+    trie = TopicTrie()
+    trie.add(topic_filter, "item")
+
+    assert trie.match(topic) == (("item",) if matches else ())
+
+
+def test_match_keeps_order_items_were_added():
+    """Test all matching items are returned in the order they were added."""
+    trie = TopicTrie()
+    trie.add("a/b/c", "exact")
+    trie.add("#", "everything")
+    trie.add("a/+/c", "single")
+    trie.add("a/b/c", "exact again")
+    trie.add("x/y", "other")
+
+    assert trie.match("a/b/c") == ("exact", "everything", "single", "exact again")
+
+
+def test_remove():
+    """Test removing items and the levels no topic filter uses anymore."""
+    trie = TopicTrie()
+    first = object()
+    second = object()
+    trie.add("a/b/c", first)
+    trie.add("a/b/c", second)
+    assert trie.match("a/b/c") == (first, second)
+
+    trie.remove("a/b/c", first)
+    assert trie.match("a/b/c") == (second,)
+    assert trie.has_filter("a/b/c")
+
+    trie.remove("a/b/c", second)
+    assert trie.match("a/b/c") == ()
+    assert not trie.has_filter("a/b/c")
+    assert not trie.has_filter("a/b")
+    assert trie._root.children == {}  # pylint: disable=protected-access
+
+
+def test_match_cache():
+    """Test lookups are cached until the trie changes."""
+    trie = TopicTrie()
+    trie.add("a/+", "single")
+
+    with patch.object(trie, "_iter_match", wraps=trie._iter_match) as iter_match:
+        assert trie.match("a/b") == ("single",)
+        assert trie.match("a/b") == ("single",)
+        assert iter_match.call_count == 1
+
+        trie.add("a/b", "exact")
+        assert trie.match("a/b") == ("single", "exact")
+        assert iter_match.call_count == 2
+
+    with patch.object(topic_trie, "MAX_CACHED_TOPICS", 2):
+        trie.match("a/c")
+        trie.match("a/d")
+        assert len(trie._cache) == 1  # pylint: disable=protected-access
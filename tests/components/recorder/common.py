@@ -1,15 +1,16 @@
 """Common test utils for working with recorder."""
 
+import time
+
 from homeassistant.components import recorder
 from homeassistant.util import dt as dt_util
 
 from tests.common import fire_time_changed
 
-DB_COMMIT_INTERVAL = 50
-
 
 def wait_recording_done(hass):
     """Block till recording is done."""
+    hass.block_till_done()
     trigger_db_commit(hass)
     hass.block_till_done()
     hass.data[recorder.DATA_INSTANCE].block_till_done()
@@ -18,6 +19,9 @@ def wait_recording_done(hass):
 
 def trigger_db_commit(hass):
     """Force the recorder to commit."""
-    for _ in range(DB_COMMIT_INTERVAL):
-        # We only commit on time change
-        fire_time_changed(hass, dt_util.utcnow())
+    instance = hass.data[recorder.DATA_INSTANCE]
+    # Commits are scheduled commit_interval seconds after the first event.
+    # Tests may patch utcnow, the scheduled commit follows the real clock.
+    fire_time_changed(
+        hass, dt_util.utc_from_timestamp(time.time() + instance.commit_interval + 1)
+    )
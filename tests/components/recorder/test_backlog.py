@@ -0,0 +1,139 @@
+"""The tests for the recorder backlog statistics and overflow policies."""
+# pylint: disable=protected-access
+from datetime import timedelta
+
+from homeassistant.components.recorder import (
+    CONFIG_SCHEMA,
+    DOMAIN,
+    OVERFLOW_POLICY_COALESCE_STATES,
+    OVERFLOW_POLICY_DROP_ATTRIBUTES,
+    CoalescedStateTask,
+    Recorder,
+)
+from homeassistant.components.recorder.backlog import RecorderBacklog
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, State
+from homeassistant.util import dt as dt_util
+
+from tests.async_mock import patch
+
+
+def _make_recorder(hass, policy, high_water_mark=2):
+    """Create a recorder that is not started."""
+    return Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=7,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=10,
+        db_retry_wait=3,
+        entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
+        exclude_t=[],
+        db_integrity_check=False,
+        queue_high_water_mark=high_water_mark,
+        queue_overflow_policy=policy,
+    )
+
+
+def _state_changed(entity_id, state, attributes=None):
+    """Create a state changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": None,
+            "new_state": State(entity_id, state, attributes),
+        },
+    )
+
+
+def _drain(instance):
+    """Return all items in the recorder queue."""
+    items = []
+    while not instance.queue.empty():
+        items.append(instance.queue.get())
+    return items
+
+
+def test_backlog_statistics():
+    """Test the commit statistics."""
+    backlog = RecorderBacklog()
+
+    backlog.record_commit(10, 0.003)
+    backlog.record_commit(5, 0.2)
+    backlog.record_commit(0, 60)
+
+    info = backlog.as_dict(0)
+    assert info["backlog"] == 0
+    assert info["events_written"] == 15
+    assert info["events_per_second"] == 15
+    assert info["commit_latency"]["0.005"] == 1
+    assert info["commit_latency"]["0.25"] == 1
+    assert info["commit_latency"]["inf"] == 1
+    assert info["oldest_event_age"] == 0
+
+
+def test_backlog_oldest_event_age():
+    """Test the age of the oldest queued event."""
+    backlog = RecorderBacklog()
+    now = dt_util.utcnow()
+    backlog.last_dequeued_fired = now - timedelta(seconds=5)
+
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        assert backlog.oldest_event_age(0) == 0
+        assert backlog.oldest_event_age(3) == 5
+
+
+def test_queue_below_high_water_mark(hass):
+    """Test events are queued unchanged below the high-water mark."""
+    instance = _make_recorder(hass, OVERFLOW_POLICY_COALESCE_STATES)
+    event = _state_changed("sensor.power", "1", {"unit_of_measurement": "W"})
+
+    instance.event_listener(event)
+
+    assert _drain(instance) == [event]
+
+
+def test_queue_overflow_coalesces_states(hass):
+    """Test only the latest state of an entity is kept above the high-water mark."""
+    instance = _make_recorder(hass, OVERFLOW_POLICY_COALESCE_STATES)
+    other = Event("other_event")
+    instance.event_listener(other)
+    instance.event_listener(other)
+
+    events = [_state_changed("sensor.power", str(idx)) for idx in range(3)]
+    for event in events:
+        instance.event_listener(event)
+    instance.event_listener(_state_changed("sensor.energy", "1"))
+
+    queued = _drain(instance)
+    assert queued == [
+        other,
+        other,
+        CoalescedStateTask("sensor.power"),
+        CoalescedStateTask("sensor.energy"),
+    ]
+    assert instance._coalesced_states["sensor.power"] is events[2]
+    assert instance.backlog.coalesced_states == 2
+
+
+def test_queue_overflow_drops_attributes(hass):
+    """Test attributes are dropped above the high-water mark."""
+    instance = _make_recorder(hass, OVERFLOW_POLICY_DROP_ATTRIBUTES)
+    other = Event("other_event")
+    instance.event_listener(other)
+    instance.event_listener(other)
+
+    event = _state_changed("sensor.power", "1", {"unit_of_measurement": "W"})
+    instance.event_listener(event)
+
+    queued = _drain(instance)
+    assert len(queued) == 3
+    new_state = queued[2].data["new_state"]
+    assert new_state.state == "1"
+    assert new_state.attributes == {}
+    assert new_state.last_updated == event.data["new_state"].last_updated
+    assert queued[2].context == event.context
+    assert event.data["new_state"].attributes == {"unit_of_measurement": "W"}
+    assert instance.backlog.dropped_attributes == 1
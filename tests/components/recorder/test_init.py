@@ -4,24 +4,37 @@ from datetime import datetime, timedelta
 import unittest
 
 import pytest
+from sqlalchemy.exc import OperationalError
 
 from homeassistant.components.recorder import (
     CONFIG_SCHEMA,
     DOMAIN,
+    CoalescedStateTask,
     Recorder,
     run_information,
     run_information_from_instance,
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
-from homeassistant.core import Context, callback
+from homeassistant.const import (
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+    MATCH_ALL,
+    STATE_LOCKED,
+    STATE_UNLOCKED,
+)
+from homeassistant.core import Context, Event, State, callback
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 
-from .common import wait_recording_done
+from .common import trigger_db_commit, wait_recording_done
 
 from tests.async_mock import patch
 from tests.common import (
@@ -370,6 +383,40 @@ def test_auto_purge(hass_recorder):
     dt_util.set_default_time_zone(original_tz)
 
 
+def test_commit_scheduled_for_pending_events(hass_recorder):
+    """Test commits are scheduled after events instead of on time changes."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    wait_recording_done(hass)
+
+    assert EVENT_TIME_CHANGED not in hass.bus.listeners
+
+    with patch.object(
+        instance,
+        "_commit_event_session_or_retry",
+        wraps=instance._commit_event_session_or_retry,
+    ) as commit:
+        hass.states.set("test.one", "on")
+        hass.states.set("test.two", "on")
+        hass.block_till_done()
+        instance.block_till_done()
+        assert commit.call_count == 0
+
+        trigger_db_commit(hass)
+        hass.block_till_done()
+        instance.block_till_done()
+        assert commit.call_count == 1
+
+        # Nothing is pending, so no commit is scheduled
+        trigger_db_commit(hass)
+        hass.block_till_done()
+        instance.block_till_done()
+        assert commit.call_count == 1
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
 def test_saving_sets_old_state(hass_recorder):
     """Test saving sets old state."""
     hass = hass_recorder()
@@ -452,3 +499,198 @@ def test_run_information(hass_recorder):
 
 class CannotSerializeMe:
     """A class that the JSONEncoder cannot serialize."""
+
+
+def test_bulk_write_saves_states_and_events(hass_recorder):
+    """Test bulk write mode stores events and links states in the batch."""
+    hass = hass_recorder({"bulk_write": True})
+    instance = hass.data[DATA_INSTANCE]
+    assert instance.bulk_write
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.one", "off", {"attr": 1})
+    hass.bus.fire("bulk_event", {"data": "value"})
+    hass.states.set("test.two", "on", {})
+    hass.states.async_remove("test.two")
+    wait_recording_done(hass)
+    hass.states.set("test.one", "on", {"attr": 2})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert len(states) == 5
+        assert [state.entity_id for state in states] == [
+            "test.one",
+            "test.one",
+            "test.two",
+            "test.two",
+            "test.one",
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[2].state_id
+        assert states[3].state is None
+        assert states[4].old_state_id == states[1].state_id
+        assert states[4].to_native().attributes == {"attr": 2}
+
+        for state in states:
+            event = session.query(Events).filter_by(event_id=state.event_id).one()
+            assert event.event_type == "state_changed"
+            assert event.event_data == "{}"
+
+        events = list(session.query(Events).filter_by(event_type="bulk_event"))
+        assert len(events) == 1
+        assert events[0].to_native().data == {"data": "value"}
+
+    assert instance._pending_events == []
+    assert instance._pending_states == []
+
+
+def test_bulk_write_state_with_non_serializable_data(hass_recorder, caplog):
+    """Test bulk write mode skips data that cannot be serialized."""
+    hass = hass_recorder({"bulk_write": True})
+
+    hass.states.set("test.one", "on", {"fail": CannotSerializeMe()})
+    hass.states.set("test.two", "on", {})
+    hass.states.set("test.two", "off", {})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 2
+        assert states[0].entity_id == "test.two"
+        assert states[1].old_state_id == states[0].state_id
+
+    assert "State is not JSON serializable" in caplog.text
+
+
+def test_bulk_write_database_error_keeps_recording(hass_recorder, caplog):
+    """Test bulk write mode drops a row it cannot look up and keeps recording."""
+    hass = hass_recorder({"bulk_write": True})
+    instance = hass.data[DATA_INSTANCE]
+    wait_recording_done(hass)
+
+    with patch.object(
+        instance,
+        "_find_attributes_id",
+        side_effect=OperationalError("SELECT", {}, None),
+    ):
+        hass.states.set("test.one", "on", {"attr": 1})
+        wait_recording_done(hass)
+
+    hass.states.set("test.two", "on", {"attr": 2})
+    wait_recording_done(hass)
+
+    assert instance.is_alive()
+    assert "Error adding event" in caplog.text
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 1
+        assert states[0].entity_id == "test.two"
+
+
+def test_bulk_write_flushes_when_batch_is_full(hass_recorder):
+    """Test bulk write mode writes once the pending batch is full."""
+    hass = hass_recorder({"bulk_write": True})
+    wait_recording_done(hass)
+
+    with patch("homeassistant.components.recorder.BULK_WRITE_MAX_ROWS", 3):
+        for idx in range(3):
+            hass.states.set("test.one", str(idx))
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+
+    assert hass.data[DATA_INSTANCE]._pending_events == []
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 3
+
+
+async def test_websocket_recorder_info(hass, hass_ws_client):
+    """Test the recorder/info websocket command."""
+    await hass.async_add_executor_job(
+        init_recorder_component, hass, {"queue_high_water_mark": 100}
+    )
+    await hass.async_add_job(hass.data[DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, "type": "recorder/info"})
+    response = await client.receive_json()
+
+    assert response["success"]
+    assert response["result"]["backlog"] == 0
+    assert response["result"]["queue_high_water_mark"] == 100
+    assert response["result"]["queue_overflow_policy"] == "coalesce_states"
+    assert "commit_latency" in response["result"]
+    assert "events_per_second" in response["result"]
+    assert response["result"]["purge"] is None
+
+
+def test_saving_coalesced_state(hass_recorder):
+    """Test the latest state of a coalesced entity is written."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    new_state = State("test.one", "off", {"attr": 2})
+    event = Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "test.one", "old_state": None, "new_state": new_state},
+    )
+
+    instance._coalesced_states["test.one"] = event
+    instance.queue.put(CoalescedStateTask("test.one"))
+    wait_recording_done(hass)
+
+    assert instance._coalesced_states == {}
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 1
+        assert states[0].state == "off"
+        assert states[0].to_native().attributes == {"attr": 2}
+
+
+@pytest.mark.parametrize("bulk_write", [False, True])
+def test_saving_shared_attributes(hass_recorder, bulk_write):
+    """Test states with the same attributes share one attributes row."""
+    hass = hass_recorder({"bulk_write": bulk_write})
+    instance = hass.data[DATA_INSTANCE]
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.two", "on", {"attr": 1})
+    wait_recording_done(hass)
+    # Served from the id cache after the first commit
+    hass.states.set("test.one", "off", {"attr": 1})
+    hass.states.set("test.two", "off", {"attr": 2})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        states = list(session.query(States).order_by(States.state_id))
+        assert len(states) == 4
+        assert all(state.attributes is None for state in states)
+        assert (
+            states[0].attributes_id
+            == states[1].attributes_id
+            == states[2].attributes_id
+        )
+        assert states[3].attributes_id != states[0].attributes_id
+        assert states[2].to_native().attributes == {"attr": 1}
+        assert states[3].to_native().attributes == {"attr": 2}
+
+    assert len(instance._state_attributes_ids) == 2
+
+
+def test_saving_shared_attributes_after_cache_eviction(hass_recorder):
+    """Test attributes evicted from the id cache are looked up in the database."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    wait_recording_done(hass)
+    instance.clear_state_attributes_cache()
+    hass.states.set("test.one", "off", {"attr": 1})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 1
+        states = list(session.query(States))
+        assert states[0].attributes_id == states[1].attributes_id
@@ -4,8 +4,14 @@ import json
 import unittest
 
 from homeassistant.components import recorder
+from homeassistant.components.recorder import PURGE_BATCH_DELAY
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
@@ -13,7 +19,11 @@ from homeassistant.util import dt as dt_util
 from .common import wait_recording_done
 
 from tests.async_mock import patch
-from tests.common import get_test_home_assistant, init_recorder_component
+from tests.common import (
+    fire_time_changed,
+    get_test_home_assistant,
+    init_recorder_component,
+)
 
 
 class TestRecorderPurge(unittest.TestCase):
@@ -134,18 +144,25 @@ class TestRecorderPurge(unittest.TestCase):
             states = session.query(States)
             assert states.count() == 6
 
-            # run purge_old_data()
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
-            assert not finished
-            assert states.count() == 4
+            # run purge_old_data() in batches of 2 states
+            with patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2):
+                finished = purge_old_data(
+                    self.hass.data[DATA_INSTANCE], 4, repack=False
+                )
+                assert not finished
+                assert states.count() == 4
 
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
-            assert not finished
-            assert states.count() == 2
+                finished = purge_old_data(
+                    self.hass.data[DATA_INSTANCE], 4, repack=False
+                )
+                assert not finished
+                assert states.count() == 2
 
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
-            assert finished
-            assert states.count() == 2
+                finished = purge_old_data(
+                    self.hass.data[DATA_INSTANCE], 4, repack=False
+                )
+                assert finished
+                assert states.count() == 2
 
     def test_purge_old_events(self):
         """Test deleting old events."""
@@ -155,19 +172,124 @@ class TestRecorderPurge(unittest.TestCase):
             events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
             assert events.count() == 6
 
-            # run purge_old_data()
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
-            assert not finished
-            assert events.count() == 4
+            # run purge_old_data() in batches of 2 events
+            with patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2):
+                finished = purge_old_data(
+                    self.hass.data[DATA_INSTANCE], 4, repack=False
+                )
+                assert not finished
+                assert events.count() == 4
 
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
-            assert not finished
-            assert events.count() == 2
+                finished = purge_old_data(
+                    self.hass.data[DATA_INSTANCE], 4, repack=False
+                )
+                assert not finished
+                assert events.count() == 2
 
-            # we should only have 2 events left
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
-            assert finished
-            assert events.count() == 2
+                # we should only have 2 events left
+                finished = purge_old_data(
+                    self.hass.data[DATA_INSTANCE], 4, repack=False
+                )
+                assert finished
+                assert events.count() == 2
+
+    def test_purge_old_states_unlinks_newer_states(self):
+        """Test newer states no longer point to purged states."""
+        self._add_test_states()
+
+        with session_scope(hass=self.hass) as session:
+            states = list(session.query(States).order_by(States.state_id))
+            for state, old_state in zip(states[1:], states):
+                state.old_state_id = old_state.state_id
+
+        purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+
+        with session_scope(hass=self.hass) as session:
+            states = list(session.query(States).order_by(States.state_id))
+            assert len(states) == 2
+            assert states[0].old_state_id is None
+            assert states[1].old_state_id == states[0].state_id
+
+    def test_purge_progress(self):
+        """Test the progress of a purge that needs several batches."""
+        self._add_test_states()
+        self._add_test_events()
+        instance = self.hass.data[DATA_INSTANCE]
+
+        with patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2):
+            assert not purge_old_data(instance, 4, repack=False)
+            progress = instance.purge_progress.as_dict()
+            assert progress["batches"] == 1
+            assert progress["states_purged"] == 2
+            assert progress["events_purged"] == 2
+
+            assert not purge_old_data(instance, 4, repack=False)
+            assert instance.purge_progress.as_dict()["states_purged"] == 4
+
+            assert purge_old_data(instance, 4, repack=False)
+            assert instance.purge_progress is None
+
+    def test_purge_batches_are_delayed(self):
+        """Test the purge service pauses between batches."""
+        self._add_test_states()
+
+        with session_scope(hass=self.hass) as session:
+            states = session.query(States)
+
+            with patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2):
+                self.hass.services.call("recorder", "purge", {"keep_days": 4})
+                self.hass.block_till_done()
+                wait_recording_done(self.hass)
+                assert states.count() == 4
+
+                fire_time_changed(
+                    self.hass,
+                    dt_util.utcnow() + timedelta(seconds=PURGE_BATCH_DELAY + 1),
+                )
+                self.hass.block_till_done()
+                wait_recording_done(self.hass)
+                assert states.count() == 2
+
+    def test_purge_unused_state_attributes(self):
+        """Test shared attributes are removed once no state uses them."""
+        self.hass.states.set("test.one", "on", {"attr": 1})
+        self.hass.states.set("test.two", "on", {"attr": 2})
+        wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            assert session.query(StateAttributes).count() == 2
+            session.query(States).filter_by(entity_id="test.one").delete()
+
+        purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+
+        with session_scope(hass=self.hass) as session:
+            attributes = list(session.query(StateAttributes))
+            assert len(attributes) == 1
+            assert attributes[0].shared_attrs == '{"attr": 2}'
+
+        assert self.hass.data[DATA_INSTANCE]._state_attributes_ids == {}
+
+    def test_purge_unused_state_attributes_in_batches(self):
+        """Test unused shared attributes are removed in batches."""
+        for idx in range(3):
+            self.hass.states.set(f"test.entity_{idx}", "on", {"attr": idx})
+        wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            session.query(States).delete()
+
+        instance = self.hass.data[DATA_INSTANCE]
+
+        with patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2):
+            assert not purge_old_data(instance, 4, repack=False)
+
+            with session_scope(hass=self.hass) as session:
+                assert session.query(StateAttributes).count() == 1
+
+            assert purge_old_data(instance, 4, repack=False)
+
+        with session_scope(hass=self.hass) as session:
+            assert session.query(StateAttributes).count() == 0
 
     def test_purge_method(self):
         """Test purge method."""
@@ -233,6 +355,6 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.data[DATA_INSTANCE].block_till_done()
                 wait_recording_done(self.hass)
                 assert (
-                    mock_logger.debug.mock_calls[5][1][0]
+                    mock_logger.debug.mock_calls[6][1][0]
                     == "Vacuuming SQL DB to free space"
                 )
@@ -0,0 +1,23 @@
+"""The tests for the recorder backlog sensor."""
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.setup import async_setup_component
+
+from tests.common import init_recorder_component
+
+
+async def test_backlog_sensor(hass):
+    """Test the backlog sensor reports the recorder statistics."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await hass.async_add_job(hass.data[DATA_INSTANCE].block_till_done)
+
+    assert await async_setup_component(
+        hass, "sensor", {"sensor": {"platform": "recorder"}}
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.recorder_backlog")
+    assert state.state == "0"
+    assert state.attributes["unit_of_measurement"] == "events"
+    assert state.attributes["queue_high_water_mark"] == 40000
+    assert state.attributes["queue_overflow_policy"] == "coalesce_states"
+    assert "events_per_second" in state.attributes
@@ -0,0 +1,236 @@
+"""The tests for the recorder statistics."""
+# pylint: disable=protected-access
+from datetime import datetime, timedelta
+
+import pytest
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import (
+    States,
+    Statistics,
+    StatisticsShortTerm,
+)
+from homeassistant.components.recorder.statistics import (
+    PERIOD_5MINUTE,
+    PERIOD_HOUR,
+    StatisticsCompiler,
+    period_start,
+    statistics_during_period,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import State
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+
+from tests.async_mock import patch
+from tests.common import (
+    fire_time_changed,
+    get_test_home_assistant,
+    init_recorder_component,
+)
+
+START = datetime(2020, 10, 1, 12, 0, tzinfo=dt_util.UTC)
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def _rows(rows, table):
+    """Return the rows of a table as dicts without the entity_id."""
+    return [
+        {
+            "start": row.start,
+            "mean": row.mean,
+            "min": row.min,
+            "max": row.max,
+            "last": row.last,
+        }
+        for row in rows
+        if isinstance(row, table)
+    ]
+
+
+def test_period_start():
+    """Test the start of the period of a timestamp."""
+    assert period_start(
+        START + timedelta(minutes=7, seconds=3), timedelta(minutes=5)
+    ) == START + timedelta(minutes=5)
+    assert period_start(START + timedelta(minutes=59), timedelta(hours=1)) == START
+
+
+def test_compile_time_weighted_mean():
+    """Test the mean is weighted by the time a value was held."""
+    compiler = StatisticsCompiler()
+
+    assert compiler.add_state("sensor.test", State("sensor.test", "10"), START) == []
+    compiler.add_state(
+        "sensor.test", State("sensor.test", "20"), START + timedelta(minutes=4)
+    )
+    rows = compiler.add_state(
+        "sensor.test", State("sensor.test", "30"), START + timedelta(minutes=6)
+    )
+
+    assert _rows(rows, StatisticsShortTerm) == [
+        {"start": START, "mean": 12.0, "min": 10.0, "max": 20.0, "last": 20.0}
+    ]
+    assert _rows(rows, Statistics) == []
+
+
+def test_compile_carries_value_into_later_periods():
+    """Test a value is held in periods without state changes."""
+    compiler = StatisticsCompiler()
+    compiler.add_state("sensor.test", State("sensor.test", "5"), START)
+
+    assert compiler.compile(START + timedelta(minutes=4)) == []
+    rows = compiler.compile(START + timedelta(minutes=10, seconds=1))
+
+    assert _rows(rows, StatisticsShortTerm) == [
+        {"start": START, "mean": 5.0, "min": 5.0, "max": 5.0, "last": 5.0},
+        {
+            "start": START + timedelta(minutes=5),
+            "mean": 5.0,
+            "min": 5.0,
+            "max": 5.0,
+            "last": 5.0,
+        },
+    ]
+
+
+def test_compile_hourly_statistics():
+    """Test the hourly statistics are compiled from the five minute periods."""
+    compiler = StatisticsCompiler()
+    compiler.add_state("sensor.test", State("sensor.test", "0"), START)
+    rows = compiler.add_state(
+        "sensor.test", State("sensor.test", "60"), START + timedelta(minutes=30)
+    )
+    rows += compiler.compile(START + timedelta(minutes=55))
+
+    assert len(_rows(rows, StatisticsShortTerm)) == 11
+    assert _rows(rows, Statistics) == []
+
+    rows = compiler.compile(START + timedelta(hours=1))
+    assert _rows(rows, Statistics) == [
+        {"start": START, "mean": 30.0, "min": 0.0, "max": 60.0, "last": 60.0}
+    ]
+
+
+def test_compile_entity_that_is_no_longer_numeric():
+    """Test an entity stops being compiled when its state is not numeric."""
+    compiler = StatisticsCompiler()
+    compiler.add_state("sensor.test", State("sensor.test", "10"), START)
+    compiler.add_state(
+        "sensor.test", State("sensor.test", "unavailable"), START + timedelta(minutes=1)
+    )
+    compiler.add_state("sensor.other", State("sensor.other", "on"), START)
+
+    rows = compiler.compile(START + timedelta(minutes=20))
+    assert _rows(rows, StatisticsShortTerm) == [
+        {"start": START, "mean": 10.0, "min": 10.0, "max": 10.0, "last": 10.0}
+    ]
+
+    rows = compiler.compile(START + timedelta(hours=1))
+    assert _rows(rows, Statistics) == [
+        {"start": START, "mean": 10.0, "min": 10.0, "max": 10.0, "last": 10.0}
+    ]
+    assert compiler.compile(START + timedelta(hours=2)) == []
+
+
+def test_recording_statistics(hass_recorder):
+    """Test statistics are compiled from recorded states."""
+    hass = hass_recorder()
+    now = dt_util.utcnow()
+    start = period_start(now, timedelta(minutes=5))
+
+    hass.states.set("sensor.temperature", "20")
+    hass.states.set("sensor.humidity", "50")
+    hass.states.set("light.kitchen", "on")
+    wait_recording_done(hass)
+
+    fire_time_changed(hass, start + timedelta(hours=1))
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StatisticsShortTerm).count() > 0
+        assert session.query(Statistics).count() == 2
+
+    result = statistics_during_period(
+        hass, start, entity_ids=["sensor.temperature"], period=PERIOD_5MINUTE
+    )
+    assert list(result) == ["sensor.temperature"]
+    assert result["sensor.temperature"][0]["start"] == start
+    assert result["sensor.temperature"][-1]["last"] == 20.0
+
+    result = statistics_during_period(
+        hass, period_start(now, timedelta(hours=1)), period=PERIOD_HOUR
+    )
+    assert list(result) == ["sensor.humidity", "sensor.temperature"]
+    assert result["sensor.humidity"][0]["mean"] == pytest.approx(50.0)
+
+
+def test_statistics_error_keeps_recording(hass_recorder, caplog):
+    """Test a failure compiling statistics does not stop the recorder."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch.object(
+        instance.statistics, "add_state", side_effect=ValueError("Bad state")
+    ):
+        hass.states.set("sensor.temperature", "20")
+        wait_recording_done(hass)
+
+    hass.states.set("sensor.temperature", "21")
+    wait_recording_done(hass)
+
+    assert instance.is_alive()
+    assert "Error adding state to statistics" in caplog.text
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
+def test_purge_keeps_hourly_statistics(hass_recorder):
+    """Test purging removes five minute statistics and keeps hourly statistics."""
+    hass = hass_recorder()
+    long_ago = dt_util.utcnow() - timedelta(days=30)
+
+    with session_scope(hass=hass) as session:
+        for table in (Statistics, StatisticsShortTerm):
+            session.add(
+                table(
+                    entity_id="sensor.test",
+                    start=long_ago,
+                    mean=1,
+                    min=1,
+                    max=1,
+                    last=1,
+                )
+            )
+
+    hass.services.call("recorder", "purge", {"keep_days": 10})
+    hass.block_till_done()
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StatisticsShortTerm).count() == 0
+        assert session.query(Statistics).count() == 1
+
+
+@pytest.mark.parametrize("period", [PERIOD_5MINUTE, PERIOD_HOUR])
+def test_statistics_during_period_without_data(hass_recorder, period):
+    """Test querying statistics when none were compiled."""
+    hass = hass_recorder()
+    assert statistics_during_period(hass, dt_util.utcnow(), period=period) == {}
@@ -178,6 +178,16 @@ def test_basic_sanity_check(hass_recorder):
         util.basic_sanity_check(cursor)
 
 
+def test_basic_sanity_check_before_migration(hass_recorder):
+    """Test the basic sanity checks pass without tables added by migrations."""
+    hass = hass_recorder()
+
+    cursor = hass.data[DATA_INSTANCE].engine.raw_connection().cursor()
+    cursor.execute("DROP TABLE state_attributes;")
+
+    assert util.basic_sanity_check(cursor) is True
+
+
 def test_combined_checks(hass_recorder):
     """Run Checks on the open database."""
     hass = hass_recorder()
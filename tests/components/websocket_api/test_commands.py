@@ -8,7 +8,7 @@ from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH_REQUIRED,
 )
 from homeassistant.components.websocket_api.const import URL
-from homeassistant.core import Context, callback
+from homeassistant.core import Context, ListenerProfiler, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity
 from homeassistant.loader import async_get_integration
@@ -397,6 +397,118 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribing to the state changes of entities, domains and globs."""
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("switch.pump", "off")
+    hass.states.async_set("sensor.outside_temperature", "10")
+    hass.states.async_set("sensor.power", "100")
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["switch.pump"],
+            "domains": ["light"],
+            "globs": ["sensor.*_temperature"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert sorted(state["entity_id"] for state in msg["result"]) == [
+        "light.kitchen",
+        "sensor.outside_temperature",
+        "switch.pump",
+    ]
+
+    hass.states.async_set("sensor.power", "200")
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("sensor.power", "300")
+    hass.states.async_set("sensor.outside_temperature", "11")
+    hass.states.async_set("switch.pump", "on")
+
+    changed = []
+    for _ in range(3):
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == 5
+        assert msg["type"] == "event"
+        changed.append((msg["event"]["entity_id"], msg["event"]["new_state"]["state"]))
+
+    assert changed == [
+        ("light.kitchen", "off"),
+        ("sensor.outside_temperature", "11"),
+        ("switch.pump", "on"),
+    ]
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "unsubscribe_events", "subscription": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+
+async def test_subscribe_entities_compact(hass, websocket_client, hass_admin_user):
+    """Test compact state change messages of subscribed entities."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.permitted": True}}})
+    hass.states.async_set("light.permitted", "on", {"brightness": 100, "a": 1})
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_entities", "domains": "light", "compact": True}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert [state["entity_id"] for state in msg["result"]] == ["light.permitted"]
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.permitted", "on", {"brightness": 50})
+
+    msg = await websocket_client.receive_json()
+    changed = msg["event"]["changed"]
+    assert msg["event"]["entity_id"] == "light.permitted"
+    assert "state" not in changed
+    assert changed["attributes"] == {"brightness": 50}
+    assert changed["removed_attributes"] == ["a"]
+
+    hass.states.async_remove("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"entity_id": "light.permitted", "removed": True}
+
+
+async def test_subscribe_entities_domains_case(hass, websocket_client):
+    """Test the subscribed domains are matched case-insensitively."""
+    hass.states.async_set("light.kitchen", "on")
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_entities", "domains": ["Light"]}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert [state["entity_id"] for state in msg["result"]] == ["light.kitchen"]
+
+    hass.states.async_set("light.kitchen", "off")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["entity_id"] == "light.kitchen"
+    assert msg["event"]["new_state"]["state"] == "off"
+
+
+async def test_subscribe_entities_requires_filter(hass, websocket_client):
+    """Test subscribing to entities requires at least one filter."""
+    await websocket_client.send_json({"id": 5, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
@@ -806,3 +918,56 @@ async def test_test_condition(hass, websocket_client):
     assert msg["type"] == const.TYPE_RESULT
     assert msg["success"]
     assert msg["result"]["result"] is True
+
+
+async def test_listener_profile(hass, websocket_client):
+    """Test getting the listener profile."""
+    await websocket_client.send_json({"id": 5, "type": "listener_profile"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"] == {"enabled": False, "listeners": []}
+
+    hass.listener_profiler = ListenerProfiler()
+
+    @callback
+    def _listener(event):
+        pass
+
+    hass.bus.async_listen("test_event", _listener)
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json({"id": 6, "type": "listener_profile"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["enabled"] is True
+    assert [
+        stats["calls"]
+        for stats in msg["result"]["listeners"]
+        if stats["listener"].endswith("._listener")
+    ] == [1]
+
+
+async def test_listener_profile_requires_admin(hass, websocket_client, hass_admin_user):
+    """Test getting the listener profile requires an admin."""
+    hass_admin_user.groups = []
+
+    await websocket_client.send_json({"id": 5, "type": "listener_profile"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
+async def test_startup_timeline(hass, websocket_client):
+    """Test getting the startup timeline."""
+    await websocket_client.send_json({"id": 5, "type": "startup_timeline"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["finished"] is None
+    assert "setup" in msg["result"]["integrations"]["websocket_api"]
+    assert msg["result"]["critical_path"]
+    assert isinstance(msg["result"]["imports"], dict)
@@ -80,3 +80,55 @@ async def test_non_json_message(hass, websocket_client, caplog):
         f"Unable to serialize to JSON. Bad data found at $.result[0](state: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
         in caplog.text
     )
+
+
+async def test_batch_and_coalesce_messages(hass, hass_ws_client):
+    """Test queued messages are batched and coalesced once negotiated."""
+    orig_handler = http.WebSocketHandler
+    instance = None
+
+    def instantiate_handler(*args):
+        nonlocal instance
+        instance = orig_handler(*args)
+        return instance
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        websocket_client = await hass_ws_client()
+
+    # Without negotiating, every message is written on its own
+    instance._send_message({"id": 1, "type": "event", "event": "a"})
+    instance._send_message({"id": 1, "type": "event", "event": "b"})
+    assert (await websocket_client.receive_json())["event"] == "a"
+    assert (await websocket_client.receive_json())["event"] == "b"
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {
+                const.FEATURE_COALESCE_MESSAGES: 1,
+                const.FEATURE_COALESCE_STATES: 1,
+            },
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+
+    instance._send_message(
+        {"id": 1, "type": "event", "event": "a"}, coalesce_key=(1, "light.kitchen")
+    )
+    instance._send_message({"id": 2, "type": "event", "event": "other"})
+    instance._send_message(
+        {"id": 1, "type": "event", "event": "b"}, coalesce_key=(1, "light.kitchen")
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg == [
+        {"id": 1, "type": "event", "event": "b"},
+        {"id": 2, "type": "event", "event": "other"},
+    ]
+    assert not instance._coalesced
@@ -1,6 +1,9 @@
 """Test Websocket API messages module."""
 
+import json
+
 from homeassistant.components.websocket_api.messages import (
+    _cached_event_message as lru_event_cache,
     cached_event_message,
     message_to_json,
 )
@@ -33,17 +36,26 @@ async def test_cached_event_message(hass):
 
     assert msg0 != msg1
 
-    cache_info = cached_event_message.cache_info()
+    cache_info = lru_event_cache.cache_info()
     assert cache_info.hits == 2
     assert cache_info.misses == 2
     assert cache_info.currsize == 2
 
     cached_event_message(2, events[1])
-    cache_info = cached_event_message.cache_info()
+    cache_info = lru_event_cache.cache_info()
     assert cache_info.hits == 3
     assert cache_info.misses == 2
     assert cache_info.currsize == 2
 
+    # Other subscriptions reuse the serialized event with their own id
+    msg2 = cached_event_message(5, events[1])
+    cache_info = lru_event_cache.cache_info()
+    assert cache_info.hits == 4
+    assert cache_info.misses == 2
+
+    assert json.loads(msg2) == {**json.loads(msg1), "id": 5}
+    assert json.loads(msg1)["id"] == 2
+
 
 async def test_message_to_json(caplog):
     """Test we can serialize websocket messages."""
@@ -25,6 +25,7 @@ from homeassistant.exceptions import ServiceNotFound
 from homeassistant.helpers import event
 from homeassistant.setup import async_setup_component
 from homeassistant.util import location
+from homeassistant.util.yaml import loader as yaml_loader
 
 from tests.async_mock import MagicMock, Mock, patch
 from tests.ignore_uncaught_exceptions import IGNORE_UNCAUGHT_EXCEPTIONS
@@ -96,6 +97,14 @@ def verify_cleanup():
     assert not threads
 
 
+@pytest.fixture(autouse=True)
+def clear_parsed_yaml_cache():
+    """Clear the process-wide cache of parsed YAML files around each test."""
+    yaml_loader.clear_parsed_cache()
+    yield
+    yaml_loader.clear_parsed_cache()
+
+
 @pytest.fixture
 def hass_storage():
     """Fixture to mock storage."""
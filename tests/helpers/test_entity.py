@@ -6,9 +6,11 @@ import threading
 
 import pytest
 
+from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import ATTR_DEVICE_CLASS, STATE_UNAVAILABLE
 from homeassistant.core import Context
 from homeassistant.helpers import entity, entity_registry
+from homeassistant.helpers.entity_values import EntityValues
 
 from tests.async_mock import MagicMock, PropertyMock, patch
 from tests.common import (
@@ -657,6 +659,58 @@ async def test_capability_attrs(hass):
     assert state.attributes["always"] == "there"
 
 
+async def test_state_only_write_reuses_attributes(hass):
+    """Test attributes are shared between states when only the state changes."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+
+    with patch.object(
+        entity.Entity, "device_state_attributes", PropertyMock(return_value={"a": 1})
+    ), patch.object(entity.Entity, "state", PropertyMock(side_effect=["1", "2"])):
+        ent.async_write_ha_state()
+        first = hass.states.get("hello.world")
+        ent.async_write_ha_state()
+        second = hass.states.get("hello.world")
+
+    assert first.state == "1"
+    assert second.state == "2"
+    assert second.attributes is first.attributes
+
+    with patch.object(
+        entity.Entity, "device_state_attributes", PropertyMock(return_value={"a": 2})
+    ), patch.object(entity.Entity, "state", PropertyMock(return_value="2")):
+        ent.async_write_ha_state()
+
+    third = hass.states.get("hello.world")
+    assert third.attributes is not second.attributes
+    assert third.attributes["a"] == 2
+
+
+async def test_static_overrides_follow_registry_and_customize(hass):
+    """Test cached registry and customize overrides are refreshed on updates."""
+    registry = mock_registry(hass)
+    platform = MockEntityPlatform(hass)
+    ent = MockEntity(unique_id="qwer", name="Entity Name")
+    await platform.async_add_entities([ent])
+
+    state = hass.states.get(ent.entity_id)
+    assert state.attributes["friendly_name"] == "Entity Name"
+
+    registry.async_update_entity(ent.entity_id, name="Registry Name")
+    await hass.async_block_till_done()
+    state = hass.states.get(ent.entity_id)
+    assert state.attributes["friendly_name"] == "Registry Name"
+
+    hass.data[DATA_CUSTOMIZE] = EntityValues(
+        {ent.entity_id: {"friendly_name": "Customized Name", "hidden": True}}
+    )
+    ent.async_write_ha_state()
+    state = hass.states.get(ent.entity_id)
+    assert state.attributes["friendly_name"] == "Customized Name"
+    assert state.attributes["hidden"] is True
+
+
 async def test_warn_slow_write_state(hass, caplog):
     """Check that we log a warning if reading properties takes too long."""
     mock_entity = entity.Entity()
@@ -330,6 +330,34 @@ async def test_removing_config_entry_id(hass, registry, update_events):
     assert update_events[1]["entity_id"] == entry.entity_id
 
 
+async def test_entries_for_device_and_config_entry(hass, registry):
+    """Test looking up entries follows device and config entry updates."""
+    mock_config = MockConfigEntry(domain="light", entry_id="mock-id-1")
+    entry = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=mock_config, device_id="device-1"
+    )
+    registry.async_get_or_create("light", "hue", "1234")
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [entry]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry
+    ]
+
+    entry = registry.async_update_entity(entry.entity_id, new_entity_id="light.renamed")
+    entry = registry._async_update_entity(entry.entity_id, device_id="device-2")
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == []
+    assert entity_registry.async_entries_for_device(registry, "device-2") == [entry]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry
+    ]
+
+    registry.async_remove(entry.entity_id)
+
+    assert entity_registry.async_entries_for_device(registry, "device-2") == []
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == []
+
+
 async def test_migration(hass):
     """Test migration from old data to new."""
     mock_config = MockConfigEntry(domain="test-platform", entry_id="test-config-id")
@@ -14,6 +14,7 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TRACK_TIME_WHEEL,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
@@ -1294,6 +1295,143 @@ async def test_track_template_result_iterator(hass):
     assert filter_runs == ["", "sensor.new"]
 
 
+async def test_track_template_rate_limit(hass):
+    """Test re-renders of domain and all states templates are rate limited."""
+    template_domain = Template("{{ states.sensor | count }}", hass)
+    template_all = Template("{{ states | count }}", hass)
+    template_entity = Template("{{ states('sensor.one') }}", hass)
+
+    refresh_runs = {template_domain: [], template_all: [], template_entity: []}
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        for update in updates:
+            refresh_runs[update.template].append(update.result)
+
+    info = async_track_template_result(
+        hass,
+        [
+            TrackTemplate(
+                template_domain, None, domains_rate_limit=timedelta(seconds=1)
+            ),
+            TrackTemplate(
+                template_all, None, all_states_rate_limit=timedelta(seconds=10)
+            ),
+            TrackTemplate(template_entity, None, domains_rate_limit=timedelta(1)),
+        ],
+        refresh_listener,
+    )
+    info.async_refresh()
+    assert refresh_runs == {
+        template_domain: ["0"],
+        template_all: ["0"],
+        template_entity: ["unknown"],
+    }
+
+    hass.states.async_set("sensor.one", "on")
+    hass.states.async_set("sensor.two", "on")
+    hass.states.async_set("light.one", "on")
+    await hass.async_block_till_done()
+
+    # Only the template referencing sensor.one by id re-renders right away
+    assert refresh_runs == {
+        template_domain: ["0"],
+        template_all: ["0"],
+        template_entity: ["unknown", "on"],
+    }
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert refresh_runs[template_domain] == ["0", "2"]
+    assert refresh_runs[template_all] == ["0"]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert refresh_runs[template_domain] == ["0", "2"]
+    assert refresh_runs[template_all] == ["0", "3"]
+
+    # A forced refresh is never rate limited and cancels pending renders
+    hass.states.async_set("sensor.three", "on")
+    await hass.async_block_till_done()
+    info.async_refresh()
+    assert refresh_runs[template_domain] == ["0", "2", "3"]
+    assert refresh_runs[template_all] == ["0", "3", "4"]
+
+    info.async_remove()
+
+
+async def test_track_template_rate_limit_entity_referenced_by_id(hass):
+    """Test changes to entities referenced by id bypass the domain rate limit."""
+    template_refresh = Template(
+        "{{ states('sensor.one') }}-{{ states.sensor | count }}", hass
+    )
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        refresh_runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass,
+        [
+            TrackTemplate(
+                template_refresh, None, domains_rate_limit=timedelta(seconds=10)
+            )
+        ],
+        refresh_listener,
+    )
+    info.async_refresh()
+    assert refresh_runs == ["unknown-0"]
+
+    hass.states.async_set("sensor.one", "on")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["unknown-0", "on-1"]
+
+    hass.states.async_set("sensor.two", "on")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["unknown-0", "on-1"]
+
+    hass.states.async_set("sensor.one", "off")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["unknown-0", "on-1", "off-2"]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert refresh_runs == ["unknown-0", "on-1", "off-2"]
+
+    info.async_remove()
+
+
+async def test_track_template_rate_limit_override(hass):
+    """Test the rate_limit template function overrides the tracked rate limit."""
+    template_refresh = Template(
+        "{{ rate_limit(seconds=5) }}{{ states.sensor | count }}", hass
+    )
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        refresh_runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_refresh, None, domains_rate_limit=timedelta(1))],
+        refresh_listener,
+    )
+    info.async_refresh()
+    assert refresh_runs == ["0"]
+
+    hass.states.async_set("sensor.one", "on")
+    await hass.async_block_till_done()
+    assert refresh_runs == ["0"]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert refresh_runs == ["0", "1"]
+
+
 async def test_track_template_result_errors(hass, caplog):
     """Test tracking template with errors in the template."""
     template_syntax_error = Template("{{states.switch", hass)
@@ -1717,6 +1855,36 @@ async def test_track_time_interval(hass):
     assert len(specific_runs) == 2
 
 
+async def test_listener_profiling(hass):
+    """Test the listeners of the tracking helpers are profiled."""
+    hass.listener_profiler = ha.ListenerProfiler()
+
+    @ha.callback
+    def state_listener(event):
+        pass
+
+    @ha.callback
+    def interval_listener(now):
+        pass
+
+    utc_now = dt_util.utcnow()
+    async_track_state_change_event(hass, ["light.bowl"], state_listener)
+    async_track_time_interval(hass, interval_listener, timedelta(seconds=10))
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.bowl", "off")
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=13))
+    await hass.async_block_till_done()
+
+    calls = {
+        stats["listener"].rsplit(".", 1)[-1]: stats["calls"]
+        for stats in hass.listener_profiler.async_report()
+    }
+    assert calls["state_listener"] == 2
+    assert calls["interval_listener"] == 1
+    assert calls["_async_state_change_dispatcher"] == 2
+
+
 async def test_track_sunrise(hass, legacy_patchable_time):
     """Test track the sunrise."""
     latitude = 32.87336
@@ -1956,6 +2124,96 @@ async def test_async_track_time_change(hass):
     assert len(wildcard_runs) == 3
 
 
+async def test_time_patterns_share_timer(hass):
+    """Test time patterns due at the same second share one timer."""
+    minute_runs = []
+    second_runs = []
+
+    now = dt_util.utcnow()
+
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=time_that_will_not_match_right_away
+    ):
+        unsub_minute = async_track_utc_time_change(
+            hass, callback(lambda x: minute_runs.append(x)), second=0
+        )
+        unsub_second = async_track_utc_time_change(
+            hass, callback(lambda x: second_runs.append(x)), second="/30"
+        )
+
+    wheel = hass.data[TRACK_TIME_WHEEL]
+    assert len(wheel) == 1
+    _, actions = next(iter(wheel.values()))
+    assert len(actions) == 2
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(minute_runs) == 1
+    assert len(second_runs) == 1
+
+    # Next matches are 12:00:30 and 12:01:00
+    assert len(wheel) == 2
+    handles = [handle for handle, _ in wheel.values()]
+
+    unsub_second()
+    assert len(wheel) == 1
+
+    unsub_minute()
+    assert len(wheel) == 0
+    assert all(handle.cancelled() for handle in handles)
+
+
+async def test_time_pattern_unsub_in_same_second(hass):
+    """Test removing a time pattern from a callback due at the same second."""
+    first_runs = []
+    second_runs = []
+    unsubs = []
+
+    now = dt_util.utcnow()
+
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+
+    @callback
+    def first_action(now):
+        first_runs.append(now)
+        # Remove the second pattern and this one
+        for unsub in unsubs[::-1]:
+            unsub()
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=time_that_will_not_match_right_away
+    ):
+        unsubs.append(async_track_utc_time_change(hass, first_action, second=0))
+        unsubs.append(
+            async_track_utc_time_change(
+                hass, callback(lambda x: second_runs.append(x)), second=0
+            )
+        )
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(first_runs) == 1
+    assert len(second_runs) == 0
+    assert hass.data[TRACK_TIME_WHEEL] == {}
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 1, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(first_runs) == 1
+    assert len(second_runs) == 0
+
+
 async def test_periodic_task_minute(hass):
     """Test periodic tasks per minute."""
     specific_runs = []
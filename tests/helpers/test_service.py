@@ -410,6 +410,43 @@ async def test_call_with_sync_func(hass, mock_entities):
     assert test_service_mock.call_count == 1
 
 
+async def test_call_resolves_targets_directly(hass, mock_entities):
+    """Test targeted entities are looked up instead of scanning platforms."""
+
+    class NoScanDict(OrderedDict):
+        """Dict that fails when all entities are walked."""
+
+        def values(self):
+            raise AssertionError("entities should not be scanned")
+
+    test_service_mock = AsyncMock(return_value=None)
+    await service.entity_service_call(
+        hass,
+        [Mock(entities=NoScanDict(mock_entities))],
+        test_service_mock,
+        ha.ServiceCall("test_domain", "test_service", {"entity_id": "light.kitchen"}),
+    )
+    assert [call[0][0] for call in test_service_mock.call_args_list] == [
+        mock_entities["light.kitchen"]
+    ]
+
+
+async def test_targeted_entities_keep_platform_order(hass, mock_entities):
+    """Test several targeted entities are returned in platform order."""
+    platform = Mock(entities=mock_entities)
+
+    assert service._async_get_platform_entities(
+        platform, {"light.bathroom", "light.kitchen", "light.bedroom"}
+    ) == [
+        mock_entities["light.kitchen"],
+        mock_entities["light.bedroom"],
+        mock_entities["light.bathroom"],
+    ]
+    assert service._async_get_platform_entities(
+        platform, {"light.bedroom", "light.unknown"}
+    ) == [mock_entities["light.bedroom"]]
+
+
 async def test_call_with_sync_attr(hass, mock_entities):
     """Test invoking sync service calls."""
     mock_method = mock_entities["light.kitchen"].sync_method = Mock(return_value=None)
@@ -1,5 +1,6 @@
 """Test Home Assistant template helper methods."""
 from datetime import datetime
+import gc
 import math
 import random
 
@@ -2343,35 +2344,60 @@ def test_urlencode(hass):
     assert tpl.async_render() == "the%20quick%20brown%20fox%20%3D%20true"
 
 
-async def test_cache_garbage_collection():
-    """Test caching a template."""
+async def test_cache_garbage_collection(hass):
+    """Test templates with the same source share the bound template.
+
+    A jinja2 template references itself through its globals, so the cache
+    entry is only released once the cyclic garbage collector has run.
+    """
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
-    tpl = template.Template(
-        (template_string),
-    )
-    tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    tpl = template.Template(template_string, hass)
+    tpl2 = template.Template(template_string, hass)
+    assert tpl.async_render() == tpl2.async_render()
 
-    tpl2 = template.Template(
-        (template_string),
-    )
-    tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    env = hass.data[template._ENVIRONMENT]  # pylint: disable=protected-access
+    assert tpl._compiled is tpl2._compiled  # pylint: disable=protected-access
+    assert env.template_cache.get(template_string) is tpl._compiled
 
     del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    assert env.template_cache.get(template_string)
     del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    gc.collect()
+    assert not env.template_cache.get(template_string)
+
+
+async def test_compiled_code_cache(hass):
+    """Test compiled code is shared and the cache is bounded."""
+    template_string = "{{ 'compiled' ~ ' code' }}"
+    tpl = template.Template(template_string)
+    tpl.ensure_valid()
+    tpl2 = template.Template(template_string, hass)
+    tpl2.ensure_valid()
+    tpl3 = template.Template(template_string, hass)
+    tpl3.ensure_valid()
+
+    # pylint: disable=protected-access
+    assert tpl2._compiled_code is tpl3._compiled_code
+    assert tpl._compiled_code is not tpl2._compiled_code
+    assert template._COMPILED_CODE_CACHE[(template_string, True)] is (
+        tpl2._compiled_code
+    )
+
+    with patch.object(template, "COMPILED_CODE_CACHE_SIZE", 1):
+        template.Template("{{ 'evict' }}", hass).ensure_valid()
+
+    assert (template_string, True) not in template._COMPILED_CODE_CACHE
+    assert tpl3.async_render() == "compiled code"
+
+
+def test_static_template_not_compiled():
+    """Test static templates skip jinja."""
+    tpl = template.Template("not a {template")
+    tpl.ensure_valid()
+    assert tpl._compiled_code is None  # pylint: disable=protected-access
+    assert tpl.async_render() == "not a {template"
 
 
 def test_is_template_string():
@@ -9,6 +9,7 @@ import pytest
 
 from homeassistant import bootstrap, core, runner
 import homeassistant.config as config_util
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
 
@@ -82,6 +83,21 @@ async def test_empty_setup(hass):
         assert domain in hass.config.components, domain
 
 
+@pytest.mark.parametrize("prewarm_platforms", [True, False])
+async def test_prewarm_platforms_option(hass, prewarm_platforms):
+    """Test platforms are only pre-warmed when enabled."""
+    hass.config.prewarm_platforms = prewarm_platforms
+
+    with patch(
+        "homeassistant.loader.async_prewarm_platforms", return_value=mock_coro()
+    ) as mock_prewarm:
+        await bootstrap.async_from_config_dict({}, hass)
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done()
+
+    assert len(mock_prewarm.mock_calls) == int(prewarm_platforms)
+
+
 async def test_core_failure_loads_safe_mode(hass, caplog):
     """Test failing core setup aborts further setup."""
     with patch(
@@ -33,7 +33,11 @@ from homeassistant.const import (
     __version__,
 )
 import homeassistant.core as ha
-from homeassistant.exceptions import InvalidEntityFormatError, InvalidStateError
+from homeassistant.exceptions import (
+    HomeAssistantError,
+    InvalidEntityFormatError,
+    InvalidStateError,
+)
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -1004,8 +1008,8 @@ def test_create_timer(mock_monotonic, loop):
     ):
         ha._async_create_timer(hass)
 
-    assert len(funcs) == 2
-    fire_time_event, stop_timer = funcs
+    assert len(funcs) == 3
+    fire_time_event, _, stop_timer = funcs
 
     assert len(hass.loop.call_later.mock_calls) == 1
     delay, callback, target = hass.loop.call_later.mock_calls[0][1]
@@ -1079,8 +1083,8 @@ def test_timer_out_of_sync(mock_monotonic, loop):
 
         assert event_context_0 == event_context_1
 
-        assert len(funcs) == 2
-        fire_time_event, _ = funcs
+        assert len(funcs) == 3
+        fire_time_event, _, _ = funcs
 
     assert len(hass.loop.call_later.mock_calls) == 2
 
@@ -1090,6 +1094,80 @@ def test_timer_out_of_sync(mock_monotonic, loop):
     assert abs(target - 14.2) < 0.001
 
 
+@patch("homeassistant.core.monotonic")
+def test_timer_only_ticks_with_listeners(mock_monotonic, loop):
+    """Test the timer stops without time changed listeners and resumes."""
+    hass = MagicMock()
+    hass.bus.async_has_listeners.return_value = False
+    mock_monotonic.side_effect = 10.2, 11.2, 20.2
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 5, 0),
+    ):
+        ha._async_create_timer(hass)
+
+    assert len(hass.loop.call_later.mock_calls) == 0
+    event_type, start_timer = hass.bus.async_on_first_listener.mock_calls[0][1]
+    assert event_type == EVENT_TIME_CHANGED
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 5, 0),
+    ):
+        start_timer()
+        start_timer()
+
+    assert len(hass.loop.call_later.mock_calls) == 1
+    _, callback, target = hass.loop.call_later.mock_calls[0][1]
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 6, 0),
+    ):
+        callback(target)
+
+    assert len(hass.bus.async_fire.mock_calls) == 1
+    assert len(hass.loop.call_later.mock_calls) == 1
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 15, 0),
+    ):
+        start_timer()
+
+    assert len(hass.loop.call_later.mock_calls) == 2
+
+
+async def test_time_changed_not_sent_to_match_all(hass):
+    """Test time changed events only go to their own listeners."""
+    all_events = []
+    time_events = []
+
+    @ha.callback
+    def capture_all(event):
+        all_events.append(event)
+
+    @ha.callback
+    def capture_time(event):
+        time_events.append(event)
+
+    hass.bus.async_listen(MATCH_ALL, capture_all)
+    assert not hass.bus.async_has_listeners(EVENT_TIME_CHANGED)
+
+    unsub = hass.bus.async_listen(EVENT_TIME_CHANGED, capture_time)
+    assert hass.bus.async_has_listeners(EVENT_TIME_CHANGED)
+
+    hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: dt_util.utcnow()})
+    await hass.async_block_till_done()
+
+    assert len(all_events) == 0
+    assert len(time_events) == 1
+
+    unsub()
+    assert not hass.bus.async_has_listeners(EVENT_TIME_CHANGED)
+
+
 async def test_hass_start_starts_the_timer(loop):
     """Test when hass starts, it starts the timer."""
     hass = ha.HomeAssistant()
@@ -1492,3 +1570,219 @@ async def test_async_entity_ids_count(hass):
 
     assert hass.states.async_entity_ids_count() == 5
     assert hass.states.async_entity_ids_count("light") == 3
+
+
+async def test_domain_index_follows_set_and_remove(hass):
+    """Test domain filtered lookups follow added and removed states."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.frog", "on")
+    hass.states.async_set("switch.link", "on")
+    hass.states.async_set("light.bowl", "off")
+
+    assert hass.states.async_entity_ids("light") == ["light.bowl", "light.frog"]
+    assert hass.states.async_all("light")[0].state == "off"
+    assert hass.states.async_entity_ids_count(["light", "switch"]) == 3
+
+    hass.states.async_remove("switch.link")
+    hass.states.async_remove("light.frog")
+
+    assert hass.states.async_entity_ids("switch") == []
+    assert hass.states.async_entity_ids_count("switch") == 0
+    assert [state.entity_id for state in hass.states.async_all("LIGHT")] == [
+        "light.bowl"
+    ]
+
+
+async def test_domain_filter_repeated_domains(hass):
+    """Test a domain list with repeated domains returns each entity once."""
+    hass.states.async_set("switch.link", "on")
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.frog", "on")
+
+    assert hass.states.async_entity_ids(["light", "switch", "LIGHT"]) == [
+        "light.bowl",
+        "light.frog",
+        "switch.link",
+    ]
+    assert hass.states.async_entity_ids_count(["light", "Light", "switch"]) == 3
+    assert [
+        state.entity_id
+        for state in hass.states.async_all(("switch", "light", "switch"))
+    ] == ["switch.link", "light.bowl", "light.frog"]
+
+
+async def test_event_filter(hass):
+    """Test listeners are only scheduled when their event filter passes."""
+    calls = []
+    match_all_calls = []
+
+    @ha.callback
+    def _filter(event):
+        return event.data.get("pass", False)
+
+    @ha.callback
+    def _listener(event):
+        calls.append(event)
+
+    @ha.callback
+    def _match_all_listener(event):
+        match_all_calls.append(event)
+
+    unsub = hass.bus.async_listen("test_event", _listener, event_filter=_filter)
+    hass.bus.async_listen(MATCH_ALL, _match_all_listener, event_filter=_filter)
+
+    hass.bus.async_fire("test_event", {"pass": False})
+    hass.bus.async_fire("test_event", {"pass": True})
+    hass.bus.async_fire("other_event", {"pass": True})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert calls[0].data == {"pass": True}
+    assert len(match_all_calls) == 2
+
+    unsub()
+    hass.bus.async_fire("test_event", {"pass": True})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert len(match_all_calls) == 3
+
+
+async def test_event_filter_must_be_callback(hass):
+    """Test an event filter that is not a callback is rejected."""
+
+    def _filter(event):
+        return True
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen("test_event", lambda event: None, event_filter=_filter)
+
+
+async def test_event_filter_exception(hass, caplog):
+    """Test an exception in an event filter does not stop other listeners."""
+    calls = []
+
+    @ha.callback
+    def _bad_filter(event):
+        raise ValueError
+
+    @ha.callback
+    def _listener(event):
+        calls.append(event)
+
+    hass.bus.async_listen("test_event", _listener, event_filter=_bad_filter)
+    hass.bus.async_listen("test_event", _listener)
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert "Error in event filter" in caplog.text
+
+
+async def test_eventbus_on_first_listener(hass):
+    """Test actions run when an event type gets its first listener."""
+    calls = []
+    remove_action = hass.bus.async_on_first_listener(
+        "test_event", lambda: calls.append(1)
+    )
+
+    unsub_first = hass.bus.async_listen("test_event", lambda event: None)
+    assert len(calls) == 1
+
+    unsub_second = hass.bus.async_listen("test_event", lambda event: None)
+    hass.bus.async_listen("other_event", lambda event: None)
+    assert len(calls) == 1
+
+    unsub_first()
+    unsub_second()
+    unsub = hass.bus.async_listen("test_event", lambda event: None)
+    assert len(calls) == 2
+
+    remove_action()
+    unsub()
+    hass.bus.async_listen("test_event", lambda event: None)
+    assert len(calls) == 2
+
+
+async def test_listener_profiler(hass):
+    """Test the listener profiler records calls of bus listeners."""
+    hass.listener_profiler = ha.ListenerProfiler()
+
+    @ha.callback
+    def _callback_listener(event):
+        pass
+
+    async def _coroutine_listener(event):
+        pass
+
+    def _executor_listener(event):
+        pass
+
+    for listener in (_callback_listener, _coroutine_listener, _executor_listener):
+        hass.bus.async_listen("test_event", listener)
+
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    report = {
+        stats["listener"].rsplit(".", 1)[-1]: stats
+        for stats in hass.listener_profiler.async_report()
+    }
+    assert set(report) == {
+        "_callback_listener",
+        "_coroutine_listener",
+        "_executor_listener",
+    }
+    for stats in report.values():
+        assert stats["calls"] == 2
+        assert stats["integration"] is None
+        assert stats["max_time"] <= stats["total_time"]
+    assert report["_callback_listener"]["listener"] == (
+        "tests.test_core.test_listener_profiler.<locals>._callback_listener"
+    )
+
+
+async def test_listener_profiler_integration(hass):
+    """Test listeners are attributed to the integration that registered them."""
+    profiler = ha.ListenerProfiler()
+
+    @ha.callback
+    def _listener(event):
+        pass
+
+    with patch(
+        "homeassistant.helpers.frame.get_integration_frame",
+        return_value=(Mock(), "hue", "homeassistant/components/"),
+    ):
+        profiler.async_register(_listener)
+
+    profiler.async_wrap(_listener)(ha.Event("test_event"))
+    assert profiler.async_report()[0]["integration"] == "hue"
+
+
+async def test_listener_profiler_disabled(hass):
+    """Test listeners run unwrapped when profiling is disabled."""
+    calls = []
+
+    @ha.callback
+    def _listener(event):
+        calls.append(event)
+
+    hass.bus.async_listen("test_event", _listener)
+    with patch.object(ha.ListenerProfiler, "async_wrap") as mock_wrap:
+        hass.bus.async_fire("test_event")
+        await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert not mock_wrap.called
+
+
+async def test_state_shares_read_only_attributes(hass):
+    """Test a state reuses read-only attributes instead of wrapping them again."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    attributes = hass.states.get("light.bowl").attributes
+
+    hass.states.async_set("light.bowl", "off", attributes)
+    assert hass.states.get("light.bowl").attributes is attributes
@@ -1,8 +1,11 @@
 """Test to verify that we can load components."""
+import os
+
 import pytest
 
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+from homeassistant.exceptions import HomeAssistantError
 import homeassistant.loader as loader
 
 from tests.async_mock import ANY, patch
@@ -375,3 +378,110 @@ async def test_get_custom_components_safe_mode(hass):
     """Test that we get empty custom components in safe mode."""
     hass.config.safe_mode = True
     assert await loader.async_get_custom_components(hass) == {}
+
+
+async def test_manifest_index(hass, hass_storage):
+    """Test built-in integrations are resolved from a stored manifest index."""
+    integration = await loader.async_get_integration(hass, "hue")
+    assert integration.pkg_path == "homeassistant.components.hue"
+    assert integration.file_path == loader.pathlib.Path(hue.__file__).parent
+    await hass.async_block_till_done()
+
+    stored = hass_storage[loader.MANIFEST_INDEX_STORAGE_KEY]["data"]
+    assert stored["manifests"]["hue"]["manifest"]["domain"] == "hue"
+    assert "is_built_in" not in stored["manifests"]["hue"]["manifest"]
+
+    # A stored index with a matching key is used without reading manifests
+    stored["manifests"]["hue"]["manifest"]["name"] = "Stored Hue"
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+
+    with patch("homeassistant.loader._build_manifest_index") as mock_build:
+        integration = await loader.async_get_integration(hass, "hue")
+
+    assert not mock_build.called
+    assert integration.name == "Stored Hue"
+
+    # A stored index with an outdated key is rebuilt
+    stored["key"] = "outdated"
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+
+    integration = await loader.async_get_integration(hass, "hue")
+    assert integration.name == "Philips Hue"
+
+
+@pytest.mark.parametrize(
+    "load_kwargs",
+    [
+        {"side_effect": HomeAssistantError("Corrupt")},
+        {"return_value": {"manifests": {}}},
+        {"return_value": ["not", "an", "index"]},
+    ],
+)
+async def test_manifest_index_invalid_store(hass, load_kwargs):
+    """Test an unreadable or malformed stored index is rebuilt."""
+    with patch("homeassistant.helpers.storage.Store.async_load", **load_kwargs):
+        integration = await loader.async_get_integration(hass, "hue")
+
+    assert integration.name == "Philips Hue"
+    assert loader.DATA_MANIFEST_INDEX in hass.data
+    await hass.async_block_till_done()
+
+
+async def test_manifest_index_build_error(hass):
+    """Test a failing index build does not block other callers."""
+    with patch(
+        "homeassistant.loader._build_manifest_index", side_effect=OSError
+    ), pytest.raises(OSError):
+        await loader.async_get_manifest_index(hass)
+
+    assert loader.DATA_MANIFEST_INDEX not in hass.data
+    index = await loader.async_get_manifest_index(hass)
+    assert index["hue"]["manifest"]["domain"] == "hue"
+    await hass.async_block_till_done()
+
+
+def test_manifest_index_key_follows_manifests(tmp_path):
+    """Test the index key changes when a manifest is modified."""
+    manifest = tmp_path / "test" / "manifest.json"
+    manifest.parent.mkdir()
+    manifest.write_text('{"domain": "test"}')
+    (tmp_path / "__pycache__").mkdir()
+
+    key = loader._get_manifest_index_key([str(tmp_path)])
+    assert loader._get_manifest_index_key([str(tmp_path)]) == key
+
+    stat = manifest.stat()
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert loader._get_manifest_index_key([str(tmp_path)]) != key
+
+
+async def test_import_times(hass):
+    """Test the time it takes to import integration modules is recorded."""
+    integration = await loader.async_get_integration(hass, "hue")
+    assert integration.get_component() is hue
+    assert integration.get_platform("light") is hue_light
+
+    import_times = loader.get_import_times(hass)
+    assert set(import_times) == {
+        "homeassistant.components.hue",
+        "homeassistant.components.hue.light",
+    }
+    assert all(duration >= 0 for duration in import_times.values())
+
+
+async def test_prewarm_platforms(hass):
+    """Test platforms of loaded integrations are imported in the background."""
+    integration = await loader.async_get_integration(hass, "hue")
+    assert integration.has_platform("device_trigger")
+    assert not integration.has_platform("device_action")
+
+    hass.config.components.add("hue")
+    await loader.async_prewarm_platforms(hass)
+
+    components = hass.data[loader.DATA_COMPONENTS]
+    assert "hue.config_flow" in components
+    assert "hue.device_trigger" in components
+    assert "hue.device_action" not in components
+    assert "hue.device_condition" not in components
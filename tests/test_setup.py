@@ -599,3 +599,38 @@ async def test_integration_disabled(hass, caplog):
     result = await setup.async_setup_component(hass, "test_component1", {})
     assert not result
     assert disabled_reason in caplog.text
+
+
+async def test_setup_timeline(hass):
+    """Test the phases of setting up integrations are recorded."""
+    mock_integration(hass, MockModule("other"))
+    mock_integration(hass, MockModule("dep"))
+    mock_integration(hass, MockModule("comp", dependencies=["dep"]))
+
+    assert await setup.async_setup_component(hass, "other", {})
+    assert await setup.async_setup_component(hass, "comp", {})
+
+    timeline = setup.async_get_setup_timeline(hass)
+    integrations = timeline.async_integrations()
+    assert set(integrations["dep"]) == {"import", "config", "setup"}
+    assert set(integrations["comp"]) == {"dependencies", "import", "config", "setup"}
+
+    assert [item["domain"] for item in timeline.async_critical_path()] == [
+        "dep",
+        "comp",
+    ]
+
+    trace = timeline.async_chrome_trace()["traceEvents"]
+    threads = {
+        event["args"]["name"]: event["tid"] for event in trace if event["ph"] == "M"
+    }
+    assert {
+        (event["name"], tuple(event["args"]["waits"]))
+        for event in trace
+        if event["ph"] == "X" and event["tid"] == threads["comp"] and "args" in event
+    } == {("dependencies", ("dep",))}
+
+    timeline.async_finish()
+    mock_integration(hass, MockModule("late"))
+    assert await setup.async_setup_component(hass, "late", {})
+    assert "late" not in timeline.async_integrations()
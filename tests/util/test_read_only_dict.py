@@ -0,0 +1,72 @@
+"""Test read only dictionary."""
+import copy
+import json
+import pickle
+
+import pytest
+
+from homeassistant.util.read_only_dict import ReadOnlyDict
+
+
+def test_read_only_dict():
+    """Test read only dictionary."""
+    data = ReadOnlyDict({"hello": "world"})
+
+    with pytest.raises(RuntimeError):
+        data["hello"] = "universe"
+
+    with pytest.raises(RuntimeError):
+        data["other_key"] = "universe"
+
+    with pytest.raises(RuntimeError):
+        data.pop("hello")
+
+    with pytest.raises(RuntimeError):
+        data.popitem()
+
+    with pytest.raises(RuntimeError):
+        data.clear()
+
+    with pytest.raises(RuntimeError):
+        data.update({"yo": "yo"})
+
+    with pytest.raises(RuntimeError):
+        data.setdefault("yo", "yo")
+
+    assert isinstance(data, dict)
+    assert dict(data) == {"hello": "world"}
+    assert data == {"hello": "world"}
+
+
+def test_read_only_dict_hash():
+    """Test equal read only dictionaries hash the same."""
+    assert hash(ReadOnlyDict({"a": 1, "b": 2})) == hash(ReadOnlyDict({"b": 2, "a": 1}))
+    assert hash(ReadOnlyDict({"a": [1]})) == hash(ReadOnlyDict({"a": [1]}))
+
+
+def test_read_only_dict_serialize():
+    """Test the content is serialized once per dumps function."""
+    data = ReadOnlyDict({"hello": "world"})
+    calls = []
+
+    def dumps(obj):
+        calls.append(obj)
+        return json.dumps(obj)
+
+    assert data.serialize(dumps) == '{"hello": "world"}'
+    assert data.serialize(dumps) is data.serialize(dumps)
+    assert len(calls) == 1
+    assert data.serialize(json.dumps) == '{"hello": "world"}'
+
+
+def test_read_only_dict_copy():
+    """Test read only dictionaries can be copied and pickled."""
+    data = ReadOnlyDict({"hello": ["world"]})
+
+    for copied in (
+        copy.copy(data),
+        copy.deepcopy(data),
+        pickle.loads(pickle.dumps(data)),
+    ):
+        assert isinstance(copied, ReadOnlyDict)
+        assert copied == data
@@ -2,6 +2,7 @@
 import io
 import logging
 import os
+import time
 import unittest
 
 import pytest
@@ -461,3 +462,107 @@ def test_duplicate_key(caplog):
     with patch_yaml_files(files):
         load_yaml_config_file(YAML_CONFIG_FILE)
     assert "contains duplicate key" in caplog.text
+
+
+def _write_settled(path, text):
+    """Write a file with an mtime old enough for its parsed content to be cached."""
+    path.write_text(text)
+    mtime_ns = time.time_ns() - 10 * 10 ** 9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_load_yaml_parsed_cache(tmp_path):
+    """Test parsed files are cached while secrets are resolved on every load."""
+    yaml.clear_secret_cache()
+    yaml_loader.clear_parsed_cache()
+    secrets_path = tmp_path / yaml.SECRET_YAML
+    secrets_path.write_text("http_pw: pwhttp\n")
+    config_path = tmp_path / YAML_CONFIG_FILE
+    _write_settled(
+        config_path, "http:\n  api_password: !secret http_pw\n  ports: [80]\n"
+    )
+
+    with patch.object(
+        yaml_loader, "FastSafeLoader", wraps=yaml_loader.FastSafeLoader
+    ) as mock_loader:
+        data = yaml.load_yaml(str(config_path))
+        assert mock_loader.call_count == 2
+
+        data["http"]["ports"].append(443)
+        secrets_path.write_text("http_pw: changed\n")
+        yaml.clear_secret_cache()
+
+        cached = yaml.load_yaml(str(config_path))
+        # Only the changed secrets file is parsed again
+        assert mock_loader.call_count == 3
+
+    assert cached == {"http": {"api_password": "changed", "ports": [80]}}
+    assert cached["http"].__config_file__ == str(config_path)
+    assert cached["http"]["ports"].__line__ == 2
+
+    config_path.write_text("http:\n  server_port: 8124\n")
+    assert yaml.load_yaml(str(config_path)) == {"http": {"server_port": 8124}}
+
+
+def test_load_yaml_recently_modified_not_cached(tmp_path):
+    """Test files modified within the mtime granularity are parsed again."""
+    yaml_loader.clear_parsed_cache()
+    config_path = tmp_path / YAML_CONFIG_FILE
+    mtime_ns = time.time_ns()
+    config_path.write_text("value: 1\n")
+    os.utime(config_path, ns=(mtime_ns, mtime_ns))
+    assert yaml.load_yaml(str(config_path)) == {"value": 1}
+
+    # Rewritten to the same size within the same mtime tick
+    config_path.write_text("value: 2\n")
+    os.utime(config_path, ns=(mtime_ns, mtime_ns))
+    assert yaml.load_yaml(str(config_path)) == {"value": 2}
+
+
+def test_load_yaml_include_not_cached(tmp_path):
+    """Test files including other files are parsed again."""
+    yaml_loader.clear_parsed_cache()
+    (tmp_path / "included.yaml").write_text("value: 1\n")
+    config_path = tmp_path / YAML_CONFIG_FILE
+    config_path.write_text("included: !include included.yaml\n")
+
+    assert yaml.load_yaml(str(config_path)) == {"included": {"value": 1}}
+
+    (tmp_path / "included.yaml").write_text("value: 22\n")
+    assert yaml.load_yaml(str(config_path)) == {"included": {"value": 22}}
+
+
+def test_load_yaml_secret_key(tmp_path):
+    """Test a secret used as a mapping key is resolved."""
+    yaml.clear_secret_cache()
+    yaml_loader.clear_parsed_cache()
+    (tmp_path / yaml.SECRET_YAML).write_text("user: paulus\n")
+    config_path = tmp_path / YAML_CONFIG_FILE
+    config_path.write_text("users:\n  !secret user : admin\n")
+
+    assert yaml.load_yaml(str(config_path)) == {"users": {"paulus": "admin"}}
+    assert yaml.load_yaml(str(config_path)) == {"users": {"paulus": "admin"}}
+
+
+def test_prune_parsed_cache(tmp_path):
+    """Test files not loaded since the last prune are dropped from the cache."""
+    yaml_loader.clear_parsed_cache()
+    used_path = tmp_path / "used.yaml"
+    _write_settled(used_path, "value: 1\n")
+    unused_path = tmp_path / "unused.yaml"
+    _write_settled(unused_path, "value: 2\n")
+
+    yaml.load_yaml(str(used_path))
+    yaml.load_yaml(str(unused_path))
+    yaml.prune_parsed_cache()
+
+    with patch.object(
+        yaml_loader, "FastSafeLoader", wraps=yaml_loader.FastSafeLoader
+    ) as mock_loader:
+        yaml.load_yaml(str(used_path))
+        yaml.prune_parsed_cache()
+        assert mock_loader.call_count == 0
+
+        yaml.load_yaml(str(used_path))
+        yaml.load_yaml(str(unused_path))
+        assert mock_loader.call_count == 1